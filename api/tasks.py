@@ -892,7 +892,7 @@ async def get_task_output(
     tmux = TmuxService()
 
     try:
-        output = tmux.capture_output(task_id, lines=lines)
+        output = await tmux.capture_output_async(task_id, lines=lines)
     except SessionNotFoundError:
         raise HTTPException(
             status_code=500,
@@ -1,40 +1,146 @@
 """Configuration settings for Claude Session Orchestrator."""
 
+import re
 import tomllib
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+try:
+    import re2  # Optional: pip install google-re2
+except ImportError:
+    re2 = None
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """Server configuration."""
     host: str = "127.0.0.1"
     port: int = 8000
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DatabaseConfig:
     """Database configuration."""
     url: str = "sqlite:///orchestrator.db"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TmuxConfig:
     """Tmux session configuration."""
     session_prefix: str = "claude"
     poll_interval: float = 1.0
+    control_client: bool = False  # Send tmux commands over one persistent `tmux -C` client
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StatusPollingConfig:
     """Status polling configuration."""
     enabled: bool = True
     interval: float = 5.0  # Poll every 5 seconds
     frozen_threshold: float = 300.0  # Warn if busy > 5 minutes
+    control_mode: bool = False  # Stream pane output via `tmux -C` and skip quiet panes
+    threaded: bool = False  # Run the poller on its own event loop in a worker thread
+
+
+# A backslash-escaped non-word character, e.g. the \? in "Allow\?"
+_ESCAPED_CHAR = re.compile(r"\\(\W)")
+_METACHAR = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def _as_literal(pattern: str) -> str | None:
+    """Return the text a pattern matches if it is a plain literal, else None."""
+    if _METACHAR.search(_ESCAPED_CHAR.sub("", pattern)):
+        return None
+    return _ESCAPED_CHAR.sub(r"\1", pattern)
+
+
+class LiteralMatcher:
+    """Substring matcher for patterns that are all plain text.
+
+    Has the search() of a compiled pattern, but uses str's substring
+    search instead of the regex engine.
+    """
+
+    __slots__ = ("literals",)
+
+    def __init__(self, literals: tuple[str, ...]):
+        self.literals = literals
+
+    def search(self, text: str) -> str | None:
+        """Return the first literal found in text, or None."""
+        for literal in self.literals:
+            if literal in text:
+                return literal
+        return None
+
+
+class PatternSet:
+    """Matcher for patterns that can't be joined into one alternation.
+
+    Has the search() of a compiled pattern, but tries each pattern in turn.
+    """
+
+    __slots__ = ("patterns",)
 
+    def __init__(self, patterns: tuple[re.Pattern, ...]):
+        self.patterns = patterns
 
-@dataclass
+    def search(self, text: str) -> re.Match | None:
+        """Return the first pattern's match in text, or None."""
+        for pattern in self.patterns:
+            match = pattern.search(text)
+            if match:
+                return match
+        return None
+
+
+# A numbered backreference, e.g. the \1 in "(a)\1"
+_BACKREF = re.compile(r"\\[1-9]")
+
+
+def combine_patterns(
+    patterns: list[str] | tuple[str, ...],
+) -> re.Pattern | LiteralMatcher | PatternSet | None:
+    """Compile regex patterns into a single alternation.
+
+    Patterns that are all plain text (like the default waiting prompts)
+    become a LiteralMatcher. Otherwise RE2 is used when google-re2 is
+    installed: it matches in linear time, so a pathological pane can't
+    make a status pattern backtrack. Patterns RE2 doesn't support
+    (backreferences, lookaround) fall back to re.
+
+    Patterns that only work on their own (inline global flags such as
+    (?i), which must start the expression, or numbered backreferences,
+    which would count the other patterns' groups) become a PatternSet.
+
+    Raises:
+        re.error: If a pattern is invalid on its own.
+    """
+    if not patterns:
+        return None
+    literals = [_as_literal(pattern) for pattern in patterns]
+    if None not in literals:
+        return LiteralMatcher(tuple(literals))
+    compiled = tuple(re.compile(pattern) for pattern in patterns)
+    if not any(_BACKREF.search(pattern) for pattern in patterns):
+        combined = "|".join(f"(?:{pattern})" for pattern in patterns)
+        if re2 is not None:
+            try:
+                return re2.compile(combined)
+            except re2.error:
+                pass
+        try:
+            return re.compile(combined)
+        except re.error:
+            pass
+    return PatternSet(compiled)
+
+
+# Not slotted: the compiled patterns are cached in the instance __dict__
+@dataclass(frozen=True)
 class StatusPatterns:
     """Status detection patterns."""
     idle: list[str] = field(default_factory=lambda: [
@@ -50,14 +156,29 @@ class StatusPatterns:
         r"Continue\?",
     ])
 
+    @cached_property
+    def mapping(self) -> MappingProxyType:
+        """Read-only {"idle": ..., "waiting": ...} view (the legacy STATUS_PATTERNS)."""
+        return MappingProxyType({"idle": tuple(self.idle), "waiting": tuple(self.waiting)})
 
-@dataclass
+    @cached_property
+    def idle_combined(self) -> re.Pattern | LiteralMatcher | PatternSet | None:
+        """All idle patterns as one matcher (see combine_patterns), or None if there are none."""
+        return combine_patterns(self.idle)
+
+    @cached_property
+    def waiting_combined(self) -> re.Pattern | LiteralMatcher | PatternSet | None:
+        """All waiting patterns as one matcher (see combine_patterns), or None if there are none."""
+        return combine_patterns(self.waiting)
+
+
+@dataclass(frozen=True, slots=True)
 class NotificationsConfig:
     """Desktop notifications configuration."""
     enabled: bool = True
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LoggingConfig:
     """Logging configuration."""
     level: str = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -66,14 +187,14 @@ class LoggingConfig:
     log_api_requests: bool = True  # Log API endpoint calls
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MonitoringConfig:
     """Claude session monitoring configuration."""
     use_json_mode: bool = False  # Use JSON event parsing (new) vs hooks (old)
     poll_interval: float = 1.0  # Seconds between monitoring cycles
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     """Main configuration container."""
     server: ServerConfig = field(default_factory=ServerConfig)
@@ -119,8 +240,18 @@ def load_config(config_path: Path | str, project_root: Path | str) -> Config:
         tomllib.TOMLDecodeError: If config file is invalid TOML.
     """
     config_path = Path(config_path)
-    project_root = Path(project_root)
+    stat = config_path.stat()
+    # Reparse only when the file changes; Config is frozen, so it can be shared
+    return _load_config_cached(config_path, stat.st_mtime_ns, stat.st_size, Path(project_root))
+
 
+@lru_cache(maxsize=16)
+def _load_config_cached(config_path: Path, mtime_ns: int, size: int, project_root: Path) -> Config:
+    """Parse a config file, cached by path, modification time and size.
+
+    The size also catches most edits made within the filesystem's timestamp
+    granularity.
+    """
     with open(config_path, "rb") as f:
         data = tomllib.load(f)
 
@@ -136,6 +267,7 @@ def load_config(config_path: Path | str, project_root: Path | str) -> Config:
         tmux=TmuxConfig(
             session_prefix=_get_nested(data, "tmux", "session_prefix", default="claude"),
             poll_interval=float(_get_nested(data, "tmux", "poll_interval", default=1.0)),
+            control_client=bool(_get_nested(data, "tmux", "control_client", default=False)),
         ),
         notifications=NotificationsConfig(
             enabled=_get_nested(data, "notifications", "enabled", default=True),
@@ -144,6 +276,8 @@ def load_config(config_path: Path | str, project_root: Path | str) -> Config:
             enabled=_get_nested(data, "status_polling", "enabled", default=True),
             interval=float(_get_nested(data, "status_polling", "interval", default=5.0)),
             frozen_threshold=float(_get_nested(data, "status_polling", "frozen_threshold", default=300.0)),
+            control_mode=bool(_get_nested(data, "status_polling", "control_mode", default=False)),
+            threaded=bool(_get_nested(data, "status_polling", "threaded", default=False)),
         ),
         logging=LoggingConfig(
             level=_get_nested(data, "logging", "level", default="INFO"),
@@ -211,20 +345,21 @@ def set_config(config: Config) -> None:
 
 # Legacy exports for backwards compatibility during migration
 # These will raise RuntimeError if accessed before config is set
+_LEGACY_ATTRS = {
+    "PROJECT_ROOT": lambda c: c.project_root,
+    "SESSION_PREFIX": lambda c: c.tmux.session_prefix,
+    "POLL_INTERVAL": lambda c: c.tmux.poll_interval,
+    "DATABASE_URL": lambda c: c.database.url,
+    "HOST": lambda c: c.server.host,
+    "PORT": lambda c: c.server.port,
+    "EDITOR": lambda c: c.editor,
+    "DOCUMENT_PATTERNS": lambda c: c.document_patterns,
+    "STATUS_PATTERNS": lambda c: c.status_patterns.mapping,
+}
+
+
 def __getattr__(name: str) -> Any:
     """Provide backwards-compatible access to config values."""
-    legacy_map = {
-        "PROJECT_ROOT": lambda c: c.project_root,
-        "SESSION_PREFIX": lambda c: c.tmux.session_prefix,
-        "POLL_INTERVAL": lambda c: c.tmux.poll_interval,
-        "DATABASE_URL": lambda c: c.database.url,
-        "HOST": lambda c: c.server.host,
-        "PORT": lambda c: c.server.port,
-        "EDITOR": lambda c: c.editor,
-        "DOCUMENT_PATTERNS": lambda c: c.document_patterns,
-        "STATUS_PATTERNS": lambda c: {"idle": c.status_patterns.idle, "waiting": c.status_patterns.waiting},
-    }
-
-    if name in legacy_map:
-        return legacy_map[name](get_config())
+    if name in _LEGACY_ATTRS:
+        return _LEGACY_ATTRS[name](get_config())
     raise AttributeError(f"module 'config' has no attribute {name!r}")
@@ -1,6 +1,11 @@
 """Database setup and session management."""
 
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.pool import StaticPool
 
 from config import get_config
 
@@ -8,12 +13,60 @@ from config import get_config
 _engine = None
 
 
+def _pool_options(url: str) -> dict:
+    """Get connection pool options for a database URL.
+
+    The engine is shared by API handlers and the background status poller,
+    so keep warm connections around: LIFO checkout reuses the most recently
+    used connection and lets surplus ones idle out, pre-ping transparently
+    replaces dead connections.
+
+    In-memory SQLite shares one connection across threads instead: each
+    connection is a separate database, so the default per-thread pool would
+    give the poller's worker threads empty databases of their own. It is
+    never recycled for the same reason.
+    """
+    parsed = make_url(url)
+    in_memory = parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+    if in_memory:
+        return {
+            "pool_pre_ping": True,
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
+    return {
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 5,
+        "pool_use_lifo": True,
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for many small commits.
+
+    WAL lets API readers proceed while the poller writes, and
+    synchronous=NORMAL drops the per-commit fsync (a crash can lose the
+    last few status updates, which the next poll re-detects anyway).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
 def get_engine():
     """Get or create the database engine."""
     global _engine
     if _engine is None:
         config = get_config()
-        _engine = create_engine(config.database.url, echo=False)
+        _engine = create_engine(config.database.url, echo=False, **_pool_options(config.database.url))
+        if _engine.dialect.name == "sqlite":
+            event.listen(_engine, "connect", _set_sqlite_pragmas)
     return _engine
 
 
@@ -28,3 +81,7 @@ def get_db():
     engine = get_engine()
     with Session(engine) as session:
         yield session
+
+
+# get_db for use outside FastAPI: `with db_session() as session: ...`
+db_session = contextmanager(get_db)
@@ -67,6 +67,11 @@ async def lifespan(app: FastAPI):
 
     create_db_and_tables()
 
+    if config.tmux.control_client:
+        from services.tmux import enable_command_client
+        enable_command_client()
+        logger.info("Sending tmux commands over a persistent control-mode client")
+
     # Start monitoring service based on configuration
     monitor = None
     poller = None
@@ -88,7 +93,6 @@ async def lifespan(app: FastAPI):
         json_parser = JsonEventParser()
 
         # Create and start JSON monitor
-        from services.json_monitor import JsonMonitor
         monitor = JsonMonitor(
             db=db,
             tmux=tmux,
@@ -106,7 +110,9 @@ async def lifespan(app: FastAPI):
             from services.status_poller import get_status_poller
             poller = get_status_poller(
                 interval=config.status_polling.interval,
-                frozen_threshold=config.status_polling.frozen_threshold
+                frozen_threshold=config.status_polling.frozen_threshold,
+                control_mode=config.status_polling.control_mode,
+                threaded=config.status_polling.threaded,
             )
             poller.start()
             logger.info(f"Status poller started in hybrid mode (interval: {config.status_polling.interval}s, frozen_threshold: {config.status_polling.frozen_threshold}s)")
@@ -124,6 +130,16 @@ async def lifespan(app: FastAPI):
         await poller.stop()
         stats = poller.get_stats()
         logger.info(f"Status poller stopped. Corrections made: {stats['correction_count']}")
+    # Stop ttyd instances so they aren't orphaned. uvicorn already turns
+    # SIGTERM/SIGINT into this shutdown, so no extra signal handler is needed
+    import asyncio
+    from services.ttyd import TtydService
+    stopped = await asyncio.to_thread(TtydService().cleanup_all)
+    if stopped:
+        logger.info(f"Stopped {stopped} ttyd instances")
+    if config.tmux.control_client:
+        from services.tmux import disable_command_client
+        disable_command_client()
     logger.info("Chorus shutdown complete")
 
 
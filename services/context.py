@@ -4,7 +4,9 @@ Context files are stored in /tmp/chorus/task-{id}/ to keep the working directory
 The context is injected via Claude's --append-system-prompt flag at startup.
 """
 
+import os
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -37,6 +39,17 @@ def build_task_context(task: Task, user_prompt: Optional[str] = None) -> str:
     Returns:
         Formatted context string.
     """
+    return _build_context(task.id, task.title, task.description, user_prompt)
+
+
+@lru_cache(maxsize=128)
+def _build_context(
+    task_id: Optional[int],
+    title: str,
+    description: Optional[str],
+    user_prompt: Optional[str],
+) -> str:
+    """Assemble the context string, cached on the task fields it uses."""
     sections = []
 
     # Priority emphasis
@@ -44,14 +57,14 @@ def build_task_context(task: Task, user_prompt: Optional[str] = None) -> str:
     sections.append("")
 
     # Task header
-    sections.append(f"# Current Task: {task.title}")
-    sections.append(f"Task ID: {task.id}")
+    sections.append(f"# Current Task: {title}")
+    sections.append(f"Task ID: {task_id}")
     sections.append("")  # Blank line
 
     # Task description
-    if task.description:
+    if description:
         sections.append("## Description")
-        sections.append(task.description)
+        sections.append(description)
         sections.append("")
 
     # User prompt / additional instructions
@@ -84,7 +97,12 @@ def write_task_context(
 
     context_file = get_context_file(task.id)
     context_content = build_task_context(task, user_prompt)
-    context_file.write_text(context_content)
+    # One open() and one write() of the encoded text
+    fd = os.open(context_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, context_content.encode())
+    finally:
+        os.close(fd)
 
     return context_file
 
@@ -98,8 +116,14 @@ def cleanup_task_context(task_id: int) -> None:
         task_id: The task ID to clean up.
     """
     context_dir = get_context_dir(task_id)
-    if context_dir.exists():
-        shutil.rmtree(context_dir)
+    try:
+        # The directory normally holds just the context file
+        os.unlink(get_context_file(task_id))
+        os.rmdir(context_dir)
+    except OSError:
+        # Already gone, or holds more files
+        if context_dir.exists():
+            shutil.rmtree(context_dir)
 
 
 def context_exists(task_id: int) -> bool:
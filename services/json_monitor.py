@@ -254,15 +254,16 @@ class JsonMonitor:
                     # Stop monitoring this task
                     break
 
-                # Capture JSON events from tmux
-                output = self.tmux.capture_json_events(task_id)
+                # Capture JSON events written since the last poll
+                output = self.tmux.capture_json_events(task_id, since_last=True)
 
                 if output:
                     # Parse events
                     events = self.json_parser.parse_output(output)
 
-                    # Process ALL events each time - let log buffer handle deduplication
-                    # (the 10K char buffer naturally handles old events)
+                    # Normally only new events; once the pane's history is full
+                    # this is everything again and the log buffer handles
+                    # deduplication (the 10K char buffer naturally handles old events)
                     if events:
                         logger.debug(f"Task {task_id}: Processing {len(events)} events")
 
@@ -36,6 +36,11 @@ def log_subprocess_call(
         result: CompletedProcess result (if command completed).
         error: Exception that was raised (if command failed).
     """
+    if error is None and (result is None or result.returncode == 0):
+        # Only debug messages to emit: skip formatting when they'd be dropped
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
     try:
         config = get_config()
         if not config.logging.log_subprocess:
@@ -11,6 +11,7 @@ Sends desktop notifications for important task events like:
 import logging
 import subprocess
 import platform
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 from enum import Enum
 
@@ -36,6 +37,9 @@ class NotifierService:
         """
         self.enabled = enabled
         self.platform = platform.system()
+        # Notification helpers block on a subprocess roundtrip; run them off
+        # the caller's thread so task orchestration never waits on them
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notifier")
 
     def send(
         self,
@@ -73,6 +77,33 @@ class NotifierService:
             logger.error(f"Failed to send notification: {e}")
             return False
 
+    def send_async(
+        self,
+        title: str,
+        message: str,
+        level: NotificationLevel = NotificationLevel.INFO,
+        sound: bool = False,
+    ) -> Future:
+        """Send a desktop notification in the background.
+
+        Args:
+            title: Notification title
+            message: Notification body
+            level: Urgency level (info, success, warning, error)
+            sound: Whether to play a sound
+
+        Returns:
+            Future resolving to the result of send()
+        """
+        return self._pool.submit(self.send, title, message, level, sound)
+
+    def close(self) -> None:
+        """Shut down the background notification pool.
+
+        Waits for already-submitted notifications to finish.
+        """
+        self._pool.shutdown(wait=True)
+
     def _send_macos(self, title: str, message: str, sound: bool) -> bool:
         """Send notification on macOS using osascript."""
         # Use AppleScript to show notification
@@ -159,57 +190,58 @@ class NotifierService:
             return False
 
     # Convenience methods for common notifications
+    # These return immediately with a Future from send_async()
 
-    def task_started(self, task_id: int, title: str) -> bool:
+    def task_started(self, task_id: int, title: str) -> Future:
         """Notify that a task has started."""
-        return self.send(
+        return self.send_async(
             title="Task Started",
             message=f"Task #{task_id}: {title}",
             level=NotificationLevel.INFO,
         )
 
-    def task_completed(self, task_id: int, title: str) -> bool:
+    def task_completed(self, task_id: int, title: str) -> Future:
         """Notify that a task has completed."""
-        return self.send(
+        return self.send_async(
             title="Task Completed",
             message=f"Task #{task_id}: {title}",
             level=NotificationLevel.SUCCESS,
             sound=True,
         )
 
-    def task_failed(self, task_id: int, title: str, reason: Optional[str] = None) -> bool:
+    def task_failed(self, task_id: int, title: str, reason: Optional[str] = None) -> Future:
         """Notify that a task has failed."""
         message = f"Task #{task_id}: {title}"
         if reason:
             message += f"\nReason: {reason}"
 
-        return self.send(
+        return self.send_async(
             title="Task Failed",
             message=message,
             level=NotificationLevel.ERROR,
             sound=True,
         )
 
-    def claude_idle(self, task_id: int, title: str) -> bool:
+    def claude_idle(self, task_id: int, title: str) -> Future:
         """Notify that Claude is idle and waiting for input."""
-        return self.send(
+        return self.send_async(
             title="Claude is Idle",
             message=f"Task #{task_id}: {title} is ready for input",
             level=NotificationLevel.INFO,
         )
 
-    def permission_requested(self, task_id: int, title: str) -> bool:
+    def permission_requested(self, task_id: int, title: str) -> Future:
         """Notify that Claude is requesting permission."""
-        return self.send(
+        return self.send_async(
             title="Permission Required",
             message=f"Task #{task_id}: {title} needs approval",
             level=NotificationLevel.WARNING,
             sound=True,
         )
 
-    def claude_crashed(self, task_id: int, title: str) -> bool:
+    def claude_crashed(self, task_id: int, title: str) -> Future:
         """Notify that Claude has crashed or stopped unexpectedly."""
-        return self.send(
+        return self.send_async(
             title="Claude Stopped",
             message=f"Task #{task_id}: {title} - Claude has stopped",
             level=NotificationLevel.ERROR,
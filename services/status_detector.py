@@ -4,12 +4,12 @@ Detects Claude's actual status by analyzing terminal output patterns,
 rather than inferring from user actions or relying solely on hooks.
 """
 
-import re
+import time
 from typing import Optional
 
 from config import get_config
 from models import ClaudeStatus
-from services.tmux import TmuxService, SessionNotFoundError
+from services.tmux import PaneSignature, TmuxService, SessionNotFoundError
 
 
 class StatusDetector:
@@ -23,32 +23,117 @@ class StatusDetector:
     This is more reliable than inferring status from user actions.
     """
 
-    def __init__(self, tmux: Optional[TmuxService] = None):
+    def __init__(self, tmux: Optional[TmuxService] = None, capture_lines: int = 40):
         """Initialize the status detector.
 
         Args:
             tmux: TmuxService instance (creates new one if not provided)
+            capture_lines: Default number of terminal lines to capture. Only
+                the tail is matched, so a screenful is plenty.
         """
         self.tmux = tmux or TmuxService()
-        config = get_config()
-        self.idle_patterns = config.status_patterns.idle
-        self.waiting_patterns = config.status_patterns.waiting
-
-    def detect_status(self, task_id: int, lines: int = 50) -> Optional[ClaudeStatus]:
+        self.capture_lines = capture_lines
+        patterns = get_config().status_patterns
+        self.idle_patterns = patterns.idle
+        self.waiting_patterns = patterns.waiting
+        # Compiled once per config and shared by every detector built from it
+        self._idle_re = patterns.idle_combined
+        self._waiting_re = patterns.waiting_combined
+        # task_id -> (hash of last lines, detected status); bounded by live tasks
+        self._status_cache: dict[int, tuple[int, ClaudeStatus]] = {}
+        # task_id -> (pane signature, wall-clock second it was captured)
+        self._pane_cache: dict[int, tuple[PaneSignature, int]] = {}
+
+    def detect_status(self, task_id: int, lines: Optional[int] = None) -> Optional[ClaudeStatus]:
         """Detect Claude's current status from terminal output.
 
         Args:
             task_id: The task ID to check
-            lines: Number of terminal lines to analyze
+            lines: Number of terminal lines to analyze (default: capture_lines)
 
         Returns:
             Detected ClaudeStatus, or None if session doesn't exist
         """
+        if lines is None:
+            lines = self.capture_lines
         try:
             output = self.tmux.capture_output(task_id, lines=lines)
         except SessionNotFoundError:
+            self._forget(task_id)
             return None
 
+        return self.detect_status_from_text(output, task_id=task_id)
+
+    def detect_statuses(
+        self, task_ids: list[int], lines: Optional[int] = None
+    ) -> dict[int, Optional[ClaudeStatus]]:
+        """Detect Claude's status for several tasks with one tmux capture.
+
+        Panes whose signature (activity time, history size, cursor) hasn't
+        changed since their last capture keep their previous status and
+        aren't captured again.
+
+        Args:
+            task_ids: The task IDs to check
+            lines: Number of terminal lines to analyze (default: capture_lines)
+
+        Returns:
+            Dict of task ID -> detected ClaudeStatus, or None if the session
+            doesn't exist
+        """
+        if lines is None:
+            lines = self.capture_lines
+        signatures = self.tmux.pane_signatures(task_ids)
+
+        statuses: dict[int, Optional[ClaudeStatus]] = {}
+        to_capture = []
+        for task_id in task_ids:
+            signature = signatures.get(task_id)
+            if signature is None:
+                self._forget(task_id)
+                statuses[task_id] = None
+                continue
+
+            # Pane hasn't changed since it was last captured: reuse the result
+            seen = self._pane_cache.get(task_id)
+            cached = self._status_cache.get(task_id)
+            if (
+                seen is not None and cached is not None
+                and seen[0] == signature and signature.activity < seen[1]
+            ):
+                statuses[task_id] = cached[1]
+            else:
+                to_capture.append(task_id)
+
+        if not to_capture:
+            return statuses
+
+        captured_at = int(time.time())
+        outputs = self.tmux.capture_outputs(to_capture, lines=lines, existing=set(to_capture))
+        for task_id in to_capture:
+            if task_id not in outputs:
+                self._forget(task_id)
+                statuses[task_id] = None
+            else:
+                statuses[task_id] = self.detect_status_from_text(outputs[task_id], task_id=task_id)
+                self._pane_cache[task_id] = (signatures[task_id], captured_at)
+        return statuses
+
+    def _forget(self, task_id: int) -> None:
+        """Drop cached results for a task whose session is gone."""
+        self._status_cache.pop(task_id, None)
+        self._pane_cache.pop(task_id, None)
+
+    def detect_status_from_text(self, output: str, task_id: Optional[int] = None) -> ClaudeStatus:
+        """Detect Claude's status from already-captured terminal output.
+
+        Args:
+            output: Captured terminal output
+            task_id: Optional task ID, used to cache results between polls
+
+        Returns:
+            Detected ClaudeStatus
+        """
         if not output:
             return ClaudeStatus.stopped
 
@@ -56,15 +141,36 @@ class StatusDetector:
         # (prompts and permission requests appear at the end)
         last_lines = "\n".join(output.split("\n")[-10:])
 
+        if task_id is None:
+            return self._match_status(last_lines)
+
+        # Terminal tail is often unchanged between polls (Claude mid-think),
+        # so reuse the previous result instead of re-running every pattern
+        tail_hash = hash(last_lines)
+        cached = self._status_cache.get(task_id)
+        if cached is not None and cached[0] == tail_hash:
+            return cached[1]
+
+        status = self._match_status(last_lines)
+        self._status_cache[task_id] = (tail_hash, status)
+        return status
+
+    def _match_status(self, last_lines: str) -> ClaudeStatus:
+        """Match status patterns against the tail of the terminal output.
+
+        Args:
+            last_lines: Last few lines of terminal output
+
+        Returns:
+            Detected ClaudeStatus (waiting, idle or busy)
+        """
         # Check for waiting status first (permission prompts)
-        for pattern in self.waiting_patterns:
-            if re.search(pattern, last_lines):
-                return ClaudeStatus.waiting
+        if self._waiting_re is not None and self._waiting_re.search(last_lines):
+            return ClaudeStatus.waiting
 
         # Check for idle status (prompt visible)
-        for pattern in self.idle_patterns:
-            if re.search(pattern, last_lines):
-                return ClaudeStatus.idle
+        if self._idle_re is not None and self._idle_re.search(last_lines):
+            return ClaudeStatus.idle
 
         # If no patterns match, Claude is busy (processing)
         return ClaudeStatus.busy
@@ -85,3 +191,22 @@ class StatusDetector:
             return bool(output and (">" in output or "claude" in output.lower()))
         except SessionNotFoundError:
             return False
+
+
+# Shared detector instance
+_detector: Optional[StatusDetector] = None
+
+
+def get_status_detector() -> StatusDetector:
+    """Get or create the shared status detector.
+
+    Sharing one instance means its compiled patterns and per-task caches
+    are reused by every caller.
+
+    Returns:
+        StatusDetector instance
+    """
+    global _detector
+    if _detector is None:
+        _detector = StatusDetector()
+    return _detector
@@ -10,17 +10,34 @@ This service works in hybrid mode with hooks:
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+import threading
+import time
 from typing import Optional
 
-from sqlmodel import Session, select
+from sqlalchemy import bindparam, event, inspect
+from sqlalchemy.orm import Session
+from sqlmodel import select, update
 
 from database import get_engine
 from models import Task, TaskStatus, ClaudeStatus
-from services.status_detector import StatusDetector
+from services.status_detector import get_status_detector
+from services.tmux import TmuxControl
 
 logger = logging.getLogger(__name__)
 
+# Task statuses the poller watches
+_ACTIVE_STATUSES = (TaskStatus.running, TaskStatus.waiting)
+
+# (current task status, detected Claude status) -> new task status, applied
+# when the poller corrects Claude's status. Pairs not listed keep the task
+# status as is (e.g. a running task whose Claude turns busy stays running).
+_TASK_STATUS_TRANSITIONS: dict[tuple[TaskStatus, ClaudeStatus], TaskStatus] = {
+    # Claude is asking for permission
+    (TaskStatus.running, ClaudeStatus.waiting): TaskStatus.waiting,
+    # Claude finished responding to permission
+    (TaskStatus.waiting, ClaudeStatus.idle): TaskStatus.running,
+}
+
 
 class StatusPoller:
     """Background service that polls Claude status for running tasks.
@@ -42,7 +59,35 @@ class StatusPoller:
     # How long Claude can be busy before we consider it potentially frozen
     FROZEN_THRESHOLD_SECONDS = 300  # 5 minutes
 
-    def __init__(self, interval: float = 5.0, engine=None, frozen_threshold: float = 300.0):
+    # In control mode, re-capture every pane (quiet or not) once per this many ticks
+    CONTROL_SWEEP_TICKS = 12
+
+    # Rescan the whole table at least once per this many ticks, for tasks that
+    # became active without marking the poller dirty (e.g. raw SQL, another process)
+    FULL_SCAN_TICKS = 12
+
+    # Tasks that might need status updates. Built once and only selects the
+    # columns the poll reads, so no full Task rows are hydrated per tick.
+    _ACTIVE_TASKS_STMT = select(
+        Task.id, Task.tmux_session, Task.claude_status, Task.status
+    ).where(Task.status.in_(_ACTIVE_STATUSES))
+    # Between full scans, only re-read the tasks the last scan found active
+    _CACHED_TASKS_STMT = _ACTIVE_TASKS_STMT.where(
+        Task.id.in_(bindparam("ids", expanding=True))
+    )
+
+    # Databases with row locks, where writes first claim rows with
+    # SELECT ... FOR UPDATE SKIP LOCKED (SQLite locks the whole database)
+    _ROW_LOCKING_DIALECTS = frozenset({"postgresql", "mysql", "mariadb", "oracle"})
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        engine=None,
+        frozen_threshold: float = 300.0,
+        control_mode: bool = False,
+        threaded: bool = False,
+    ):
         """Initialize the status poller.
 
         Args:
@@ -51,108 +96,261 @@ class StatusPoller:
                      hooks provide fast updates and polling is a safety net.
             engine: Optional database engine (for testing)
             frozen_threshold: Seconds before considering Claude frozen (default: 300)
+            control_mode: Stream pane output through tmux control-mode clients
+                         and only re-capture panes that produced output
+            threaded: Run the polling loop on its own event loop in a worker
+                     thread, so poll bursts don't delay API handlers
         """
         self.interval = interval
-        self.detector = StatusDetector()
-        self.engine = engine  # If None, will use get_engine()
+        self.detector = get_status_detector()
+        self.engine = engine if engine is not None else get_engine()
         self.frozen_threshold = frozen_threshold
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None  # Set to end the current wait early
         self._correction_count = 0  # Track how often poller corrects hook status
         self._frozen_warnings = 0  # Track frozen detections
         self._orphan_cleanups = 0  # Track orphaned session cleanups
-        self._last_busy_check: dict[int, datetime] = {}  # Track when tasks became busy
+        self._last_busy_check: dict[int, float] = {}  # Monotonic time tasks became busy
+        # Idle fast path: when the last scan found no active tasks, skip the
+        # database until something marks the poller dirty again (or the next
+        # periodic full scan); otherwise only those tasks are re-read.
+        self._active_task_ids: set = set()
+        self._dirty = True
+        self._ticks_since_scan = 0
+        # Control mode: sessions that produced output since the last tick
+        self._control: Optional[TmuxControl] = (
+            TmuxControl(on_output=self._on_pane_output, on_exit=self._on_pane_exit)
+            if control_mode else None
+        )
+        self._pane_activity: set[str] = set()
+        self._tick = 0
+        # Threaded mode: the worker thread and the event loop it runs
+        self.threaded = threaded
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def mark_dirty(self) -> None:
+        """Force the next poll to rescan the database for active tasks."""
+        self._dirty = True
 
     async def _poll_once(self) -> None:
         """Poll status for all running tasks once."""
+        self._ticks_since_scan += 1
+        full_scan = self._dirty or self._ticks_since_scan >= self.FULL_SCAN_TICKS
+        # Nothing running and nothing changed since the last empty scan
+        if not full_scan and not self._active_task_ids:
+            return
+
+        if full_scan:
+            self._dirty = False
+            self._ticks_since_scan = 0
         try:
-            engine = self.engine if self.engine is not None else get_engine()
-            with Session(engine) as db:
-                # Get all tasks that might need status updates
-                statement = select(Task).where(
-                    Task.status.in_([TaskStatus.running, TaskStatus.waiting])
-                )
-                tasks = db.exec(statement).all()
-
-                for task in tasks:
-                    # Skip if no tmux session
-                    if not task.tmux_session:
-                        continue
-
-                    # Detect actual status from terminal
-                    detected_status = self.detector.detect_status(task.id)
-
-                    # Handle tmux session killed/crashed
-                    if detected_status is None:
-                        # Session doesn't exist anymore - mark as stopped
-                        if task.claude_status != ClaudeStatus.stopped:
-                            self._orphan_cleanups += 1
-                            logger.warning(
+            # The database calls block, so like detection they run in a worker
+            # thread and the event loop stays free for API handlers
+            tasks = await asyncio.to_thread(
+                self._load_active_tasks, None if full_scan else self._active_task_ids
+            )
+            self._active_task_ids = {task.id for task in tasks}
+            if self._control is not None:
+                tasks = await self._tasks_with_activity(tasks)
+            if not tasks:
+                return
+
+            # Detect actual status from terminal, capturing all panes in one tmux call.
+            # The capture blocks on a tmux subprocess, so run it in a worker
+            # thread to keep the event loop (and API handlers) responsive.
+            detected = await asyncio.to_thread(
+                self.detector.detect_statuses, [task.id for task in tasks]
+            )
+
+            # Collect changes and apply them as one UPDATE per target state
+            # instead of flushing every task row individually
+            updates: dict[tuple[ClaudeStatus, TaskStatus], list] = {}
+            orphan_ids = []
+            frozen_ids = []
+            corrections = 0
+            now = time.monotonic()
+            # Per-task details are debug-only; one summary line is logged per tick
+            debug = logger.isEnabledFor(logging.DEBUG)
+
+            for task in tasks:
+                detected_status = detected.get(task.id)
+
+                # Handle tmux session killed/crashed
+                if detected_status is None:
+                    # Session doesn't exist anymore - mark as stopped
+                    if task.claude_status != ClaudeStatus.stopped:
+                        self._orphan_cleanups += 1
+                        if debug:
+                            logger.debug(
                                 f"Task {task.id}: Tmux session '{task.tmux_session}' "
                                 f"not found - marking Claude as stopped "
                                 f"(cleanup #{self._orphan_cleanups})"
                             )
-                            task.claude_status = ClaudeStatus.stopped
-                            task.claude_session_id = None  # Clear session mapping
-                            db.add(task)
-                        continue
-
-                    # Track when tasks become busy for frozen detection
-                    now = datetime.now(timezone.utc)
-                    if detected_status == ClaudeStatus.busy:
-                        if task.id not in self._last_busy_check:
-                            # Task just became busy
-                            self._last_busy_check[task.id] = now
-                        else:
-                            # Task has been busy - check if frozen
-                            busy_duration = (now - self._last_busy_check[task.id]).total_seconds()
-                            if busy_duration > self.frozen_threshold:
-                                self._frozen_warnings += 1
-                                logger.error(
+                        orphan_ids.append(task.id)
+                    continue
+
+                # Track when tasks become busy for frozen detection
+                if detected_status == ClaudeStatus.busy:
+                    if task.id not in self._last_busy_check:
+                        # Task just became busy
+                        self._last_busy_check[task.id] = now
+                    else:
+                        # Task has been busy - check if frozen
+                        busy_duration = now - self._last_busy_check[task.id]
+                        if busy_duration > self.frozen_threshold:
+                            self._frozen_warnings += 1
+                            frozen_ids.append(task.id)
+                            if debug:
+                                logger.debug(
                                     f"Task {task.id}: Claude appears frozen! "
                                     f"Busy for {busy_duration:.0f}s (threshold: {self.frozen_threshold}s) "
                                     f"(frozen warning #{self._frozen_warnings})"
                                 )
-                                # Note: We don't change status automatically - just warn
-                                # The user may need to manually restart Claude
-                    else:
-                        # Task is not busy - clear tracking
-                        self._last_busy_check.pop(task.id, None)
-
-                    # Update if status changed (poller correcting hook-based status)
-                    if detected_status != task.claude_status:
-                        self._correction_count += 1
-                        logger.warning(
+                            # Note: We don't change status automatically - just warn
+                            # The user may need to manually restart Claude
+                else:
+                    # Task is not busy - clear tracking
+                    self._last_busy_check.pop(task.id, None)
+
+                # Update if status changed (poller correcting hook-based status)
+                if detected_status != task.claude_status:
+                    self._correction_count += 1
+                    corrections += 1
+                    if debug:
+                        logger.debug(
                             f"Task {task.id}: Status correction by poller - "
                             f"{task.claude_status} → {detected_status} "
                             f"(correction #{self._correction_count})"
                         )
-                        task.claude_status = detected_status
-
-                        # Also update task status if needed
-                        if detected_status == ClaudeStatus.waiting:
-                            task.status = TaskStatus.waiting
-                        elif task.status == TaskStatus.waiting and detected_status == ClaudeStatus.idle:
-                            # Claude finished responding to permission
-                            task.status = TaskStatus.running
-                        elif detected_status == ClaudeStatus.busy and task.status == TaskStatus.running:
-                            # Ensure task status matches busy state
-                            pass  # Already running, no change needed
 
-                        db.add(task)
-
-                db.commit()
+                    # Also update task status if needed
+                    new_task_status = _TASK_STATUS_TRANSITIONS.get(
+                        (task.status, detected_status), task.status
+                    )
+                    updates.setdefault((detected_status, new_task_status), []).append(task.id)
+
+            if orphan_ids or updates:
+                await asyncio.to_thread(self._apply_changes, orphan_ids, updates)
+
+            if corrections or orphan_ids or frozen_ids:
+                # Frozen tasks need the user's attention (restart Claude)
+                logger.log(
+                    logging.ERROR if frozen_ids else logging.WARNING,
+                    f"Poller tick: {corrections} status corrections, "
+                    f"{len(orphan_ids)} orphan cleanups, "
+                    f"{len(frozen_ids)} frozen (busy > {self.frozen_threshold}s)"
+                    + (f": tasks {frozen_ids}" if frozen_ids else ""),
+                )
 
         except Exception as e:
+            # Retry the full scan next tick
+            self._dirty = True
             logger.error(f"Error during status polling: {e}", exc_info=True)
 
+    def _load_active_tasks(self, ids: Optional[set] = None) -> list:
+        """Read the running/waiting tasks that have a tmux session.
+
+        Uses a Core connection rather than an ORM Session: the poll only
+        reads a few columns, so there's nothing to hydrate.
+
+        Args:
+            ids: Only consider these tasks (the ones found active before);
+                 None scans the whole table
+        """
+        with self.engine.connect() as conn:
+            if ids is None:
+                rows = conn.execute(self._ACTIVE_TASKS_STMT)
+            else:
+                rows = conn.execute(self._CACHED_TASKS_STMT, {"ids": list(ids)})
+            return [row for row in rows.all() if row.tmux_session]
+
+    def _apply_changes(
+        self, orphan_ids: list, updates: dict[tuple[ClaudeStatus, TaskStatus], list]
+    ) -> None:
+        """Write detected status changes in one transaction.
+
+        On databases with row locks, rows currently locked by another writer
+        (a second poller instance or an API request) are skipped instead of
+        waited on; their change is re-detected on the next tick.
+
+        Args:
+            orphan_ids: Tasks whose tmux session is gone
+            updates: (claude status, task status) -> IDs of tasks moving to it
+        """
+        with self.engine.begin() as conn:
+            if conn.dialect.name in self._ROW_LOCKING_DIALECTS:
+                wanted = [*orphan_ids, *(tid for ids in updates.values() for tid in ids)]
+                claimed = set(conn.execute(
+                    select(Task.id)
+                    .where(Task.id.in_(wanted))
+                    .with_for_update(skip_locked=True)
+                ).scalars())
+                orphan_ids = [tid for tid in orphan_ids if tid in claimed]
+                updates = {
+                    target: kept
+                    for target, ids in updates.items()
+                    if (kept := [tid for tid in ids if tid in claimed])
+                }
+
+            if orphan_ids:
+                conn.execute(
+                    update(Task)
+                    .where(Task.id.in_(orphan_ids))
+                    .values(claude_status=ClaudeStatus.stopped, claude_session_id=None)
+                )
+            for (claude_status, task_status), task_ids in updates.items():
+                conn.execute(
+                    update(Task)
+                    .where(Task.id.in_(task_ids))
+                    .values(claude_status=claude_status, status=task_status)
+                )
+
+    def _on_pane_output(self, session_id: str, chunk: str) -> None:
+        """Control-mode callback: remember that the session's pane changed."""
+        self._pane_activity.add(session_id)
+
+    def _on_pane_exit(self, session_id: str) -> None:
+        """Control-mode callback: re-check a session whose client went away."""
+        self._pane_activity.add(session_id)
+
+    async def _tasks_with_activity(self, tasks: list) -> list:
+        """Narrow the tasks to those whose pane may have changed (control mode).
+
+        Attaches a control client to newly seen sessions and detaches from
+        sessions that are no longer active. Quiet panes are skipped except on
+        the periodic full sweep, which also keeps frozen detection working.
+        """
+        self._tick += 1
+        full_sweep = self._tick % self.CONTROL_SWEEP_TICKS == 0
+        changed, self._pane_activity = self._pane_activity, set()
+
+        active_sessions = {task.tmux_session for task in tasks}
+        for session_id in self._control.attached_sessions() - active_sessions:
+            await self._control.detach(session_id)
+
+        selected = []
+        for task in tasks:
+            if not self._control.is_attached(task.tmux_session):
+                # Capture once now, then rely on the output stream
+                await self._control.attach(task.tmux_session)
+                selected.append(task)
+            elif full_sweep or task.tmux_session in changed:
+                selected.append(task)
+        return selected
+
     async def _poll_loop(self) -> None:
         """Main polling loop."""
         logger.info(f"Status poller started (interval: {self.interval}s)")
 
         while self._running:
             await self._poll_once()
-            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+                self._wakeup.clear()
+            except asyncio.TimeoutError:
+                pass
 
         logger.info("Status poller stopped")
 
@@ -166,10 +364,36 @@ class StatusPoller:
             return
 
         self._running = True
-        # Create the background task (non-blocking)
-        self._task = asyncio.create_task(self._poll_loop())
+        if self.threaded:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_in_thread, name="status-poller", daemon=True
+            )
+            self._thread.start()
+        else:
+            # Created here so the event belongs to the loop that runs the poller
+            self._wakeup = asyncio.Event()
+            # Create the background task (non-blocking)
+            self._task = asyncio.create_task(self._poll_loop())
         logger.info("Status poller starting...")
 
+    def _run_in_thread(self) -> None:
+        """Worker thread body for threaded mode: run the loop to completion."""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run_threaded_loop())
+        finally:
+            self._loop.close()
+
+    async def _run_threaded_loop(self) -> None:
+        """Poll on the worker thread's loop, then release control clients."""
+        self._wakeup = asyncio.Event()
+        try:
+            await self._poll_loop()
+        finally:
+            if self._control is not None:
+                await self._control.close()
+
     async def stop(self) -> None:
         """Stop the polling loop.
 
@@ -179,16 +403,39 @@ class StatusPoller:
             return
 
         self._running = False
+        self.request_poll()
+
+        if self._thread is not None:
+            # The worker closes its control clients itself before exiting
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+            return
 
         # Wait for the task to finish
         if self._task:
             await self._task
 
+        if self._control is not None:
+            await self._control.close()
+
+    def request_poll(self) -> None:
+        """Wake the polling loop so it polls without waiting out the interval.
+
+        Safe to call from hook handlers, including in threaded mode; does
+        nothing visible if the loop isn't running.
+        """
+        if self._thread is not None:
+            if self._wakeup and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+        elif self._wakeup:
+            self._wakeup.set()
+
     async def poll_now(self) -> None:
         """Immediately poll all tasks once.
 
         Useful for testing or forcing an immediate update.
         """
+        self._dirty = True
         await self._poll_once()
 
     def get_stats(self) -> dict:
@@ -211,17 +458,56 @@ class StatusPoller:
 _poller: Optional[StatusPoller] = None
 
 
-def get_status_poller(interval: float = 2.0, frozen_threshold: float = 300.0) -> StatusPoller:
+def get_status_poller(
+    interval: float = 2.0,
+    frozen_threshold: float = 300.0,
+    control_mode: bool = False,
+    threaded: bool = False,
+) -> StatusPoller:
     """Get or create the global status poller instance.
 
     Args:
         interval: Polling interval in seconds
         frozen_threshold: Seconds before considering Claude frozen
+        control_mode: Use tmux control-mode clients to skip quiet panes
+        threaded: Run the poller on its own event loop in a worker thread
 
     Returns:
         StatusPoller instance
     """
     global _poller
     if _poller is None:
-        _poller = StatusPoller(interval=interval, frozen_threshold=frozen_threshold)
+        _poller = StatusPoller(
+            interval=interval,
+            frozen_threshold=frozen_threshold,
+            control_mode=control_mode,
+            threaded=threaded,
+        )
     return _poller
+
+
+def mark_dirty() -> None:
+    """Tell the global poller that a task became active.
+
+    ORM flushes do this automatically (see _mark_dirty_on_activation); call
+    it after writes that bypass the ORM. No-op if the poller was never created.
+    """
+    if _poller is not None:
+        _poller.mark_dirty()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_dirty_on_activation(session: Session, flush_context) -> None:
+    """Mark the global poller dirty when a flush moves a task into running/waiting.
+
+    Covers every ORM write path (API, hooks, services) without each of them
+    having to remember to call mark_dirty().
+    """
+    if _poller is None:
+        return
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Task) and obj.status in _ACTIVE_STATUSES and (
+            obj in session.new or inspect(obj).attrs.status.history.has_changes()
+        ):
+            _poller.mark_dirty()
+            return
@@ -4,18 +4,24 @@ Each task gets its own tmux session where Claude Code runs.
 The tmux session persists even if Claude crashes/hangs, allowing restarts.
 """
 
+import asyncio
 import json
+import logging
 import os
+import re
+import shlex
 import shutil
 import subprocess
+import threading
 import time
+import uuid
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from uuid import UUID
 
-from config import get_config
+from config import Config, get_config
 from services.hooks import get_hooks_config_dir
 from services.logging_utils import get_logger, log_subprocess_call
 
@@ -50,19 +56,124 @@ class SessionInfo:
     has_claude_process: bool = False
 
 
+# (config it was built from, "<session_prefix>-task-"); rebuilt when
+# set_config() installs a different config
+_task_prefix: Optional[tuple[Config, str]] = None
+
+
+def _task_session_prefix() -> str:
+    """Get the session name prefix shared by all task sessions."""
+    global _task_prefix
+    config = get_config()
+    if _task_prefix is None or _task_prefix[0] is not config:
+        _task_prefix = (config, f"{config.tmux.session_prefix}-task-")
+    return _task_prefix[1]
+
+
+# list-sessions -f needs tmux 3.2+; cleared the first time an older tmux rejects it
+_session_filter_supported = True
+
+
+@lru_cache(maxsize=8)
+def _list_task_sessions_args(prefix: str) -> tuple[str, ...]:
+    """Build list-sessions args that only list sessions named <prefix>*."""
+    return (*_LIST_SESSION_NAMES, "-f", f"#{{m:{prefix}*,#{{session_name}}}}")
+
+
+@lru_cache(maxsize=8)
+def _task_session_re(prefix: str) -> re.Pattern:
+    """Compile the pattern matching task session names, one per line."""
+    return re.compile(rf"^{re.escape(prefix)}([0-9]+)$", re.MULTILINE)
+
+
 def _session_id_for_task(task_id: UUID) -> str:
     """Generate tmux session ID for a task."""
-    config = get_config()
-    return f"{config.tmux.session_prefix}-task-{task_id}"
+    return f"{_task_session_prefix()}{task_id}"
+
+
+# Prebuilt argv pieces for the commands the status poller runs every tick
+_TMUX = ("tmux",)
+_LIST_SESSION_NAMES = ("list-sessions", "-F", "#{session_name}")
+_PANE_POSITION = "#{history_size} #{history_limit} #{cursor_y} #{pane_width}"
+_SHELLS = frozenset({"bash", "zsh", "sh", "dash", "fish", "ksh", "tcsh"})
+_PANE_SIGNATURES = (
+    "list-sessions", "-F",
+    "#{session_name} #{window_activity} #{history_size} #{cursor_x} #{cursor_y}",
+)
+
+
+@lru_cache(maxsize=1024)
+def _capture_args(session_id: str, lines: int) -> tuple[str, ...]:
+    """Build the capture-pane args for a session (cached, sessions are long-lived)."""
+    return ("capture-pane", "-t", session_id, "-p", "-S", f"-{lines}")
 
 
 def _run_tmux(args: list[str], check: bool = True) -> subprocess.CompletedProcess:
-    """Run a tmux command."""
-    cmd = ["tmux"] + args
-    log_subprocess_call(logger, cmd)
+    """Run a tmux command.
+
+    Goes through the persistent command client when one is enabled (see
+    enable_command_client), falling back to a one-shot tmux process.
+    """
+    if _command_client is not None and args[0] not in _SUBPROCESS_ONLY:
+        result = _command_client.run(args)
+        if result is not None:
+            if check:
+                result.check_returncode()
+            return result
+
+    cmd = [*_TMUX, *args]
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        log_subprocess_call(logger, cmd)
+    if args[0] in _OUTPUT_UNUSED:
+        # Nothing reads the output: don't set up pipes for it
+        streams = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    else:
+        streams = {"capture_output": True}
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=check)
-        log_subprocess_call(logger, cmd, result=result)
+        # The child only execs tmux, so skip closing every inherited fd
+        result = subprocess.run(
+            cmd, text=True, check=check, close_fds=False, **streams
+        )
+        # Successes are only logged at debug level, failures always
+        if debug or result.returncode != 0:
+            log_subprocess_call(logger, cmd, result=result)
+        return result
+    except Exception as e:
+        log_subprocess_call(logger, cmd, error=e)
+        raise
+
+
+async def _run_tmux_async(args: list[str], check: bool = True) -> subprocess.CompletedProcess:
+    """Run a tmux command without blocking the event loop.
+
+    Same contract as _run_tmux, so concurrent calls (e.g. via
+    asyncio.gather) overlap their process waits.
+    """
+    if _command_client is not None and args[0] not in _SUBPROCESS_ONLY:
+        # The command client serialises on a lock: run it off the loop
+        return await asyncio.to_thread(_run_tmux, args, check)
+
+    cmd = [*_TMUX, *args]
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        log_subprocess_call(logger, cmd)
+    stream = subprocess.DEVNULL if args[0] in _OUTPUT_UNUSED else asyncio.subprocess.PIPE
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=stream, stderr=stream, close_fds=False
+        )
+        stdout, stderr = await proc.communicate()
+        result = subprocess.CompletedProcess(
+            cmd,
+            proc.returncode,
+            stdout.decode() if stdout is not None else None,
+            stderr.decode() if stderr is not None else None,
+        )
+        if debug or result.returncode != 0:
+            log_subprocess_call(logger, cmd, result=result)
+        if check:
+            result.check_returncode()
         return result
     except Exception as e:
         log_subprocess_call(logger, cmd, error=e)
@@ -75,6 +186,448 @@ def session_exists(session_id: str) -> bool:
     return result.returncode == 0
 
 
+async def session_exists_async(session_id: str) -> bool:
+    """Check if a tmux session exists (async variant of session_exists)."""
+    result = await _run_tmux_async(["has-session", "-t", session_id], check=False)
+    return result.returncode == 0
+
+
+def list_session_names() -> set[str]:
+    """List the names of all tmux sessions on the server."""
+    result = _run_tmux(list(_LIST_SESSION_NAMES), check=False)
+    if result.returncode != 0:
+        return set()
+    return set(result.stdout.split())
+
+
+_PROC = Path("/proc")
+
+
+def _child_pids(pid: int) -> list[int]:
+    """List a process's children from /proc (every thread can own some)."""
+    children = []
+    for task in (_PROC / str(pid) / "task").iterdir():
+        children.extend(int(child) for child in (task / "children").read_text().split())
+    return children
+
+
+def _pane_has_claude(session_id: str) -> Optional[bool]:
+    """Check whether a claude process runs under the session's pane.
+
+    Reads the pane's pid from tmux and walks its descendants in /proc
+    comparing process names, which is cheaper and more reliable than
+    capturing the pane and searching its text.
+
+    Returns:
+        Whether claude is running, or None if /proc can't answer (no
+        procfs, e.g. macOS) and the caller should fall back.
+    """
+    if not (_PROC / "self").exists():
+        return None
+    result = _run_tmux(["list-panes", "-t", session_id, "-F", "#{pane_pid}"], check=False)
+    if result.returncode != 0:
+        return False
+
+    pending = [int(pid) for pid in result.stdout.split() if pid.isdigit()]
+    seen = set()
+    while pending:
+        pid = pending.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        try:
+            if (_PROC / str(pid) / "comm").read_text().strip() == "claude":
+                return True
+            pending.extend(_child_pids(pid))
+        except FileNotFoundError:
+            continue  # Exited while we were walking
+        except OSError:
+            return None
+    return False
+
+
+@dataclass(frozen=True)
+class PaneSignature:
+    """Cheap fingerprint of a session's active pane.
+
+    Equal signatures mean the pane produced no output in between, provided
+    the earlier one was read after ``activity`` (tmux only keeps whole
+    seconds).
+    """
+
+    activity: int
+    history_size: int
+    cursor_x: int
+    cursor_y: int
+
+
+def pane_signatures() -> dict[str, PaneSignature]:
+    """Read the pane signature of every tmux session in one call."""
+    result = _run_tmux(list(_PANE_SIGNATURES), check=False)
+    if result.returncode != 0:
+        return {}
+
+    signatures = {}
+    for line in result.stdout.splitlines():
+        parts = line.rsplit(" ", 4)
+        if len(parts) != 5:
+            continue
+        try:
+            signatures[parts[0]] = PaneSignature(*(int(part) for part in parts[1:]))
+        except ValueError:
+            continue
+    return signatures
+
+
+def capture_outputs_bulk(
+    session_ids: list[str], lines: int = 100, existing: Optional[set[str]] = None
+) -> dict[str, str]:
+    """Capture the panes of several tmux sessions with a single tmux invocation.
+
+    Chains ``capture-pane`` commands (separated by a ``display-message``
+    sentinel) into one tmux client call instead of forking tmux per session.
+
+    Args:
+        session_ids: tmux session IDs to capture.
+        lines: Number of lines to capture from history.
+        existing: Session IDs known to exist, to skip listing them again.
+
+    Returns:
+        Dict of session ID -> captured output. Sessions that don't exist
+        are omitted.
+    """
+    if existing is None:
+        existing = list_session_names()
+    targets = [sid for sid in dict.fromkeys(session_ids) if sid in existing]
+    if not targets:
+        return {}
+
+    sentinel = f"__chorus_capture_{uuid.uuid4().hex}__"
+    args: list[str] = []
+    for sid in targets:
+        if args:
+            args.append(";")
+        args += _capture_args(sid, lines)
+        args += [";", "display-message", "-p", sentinel]
+
+    result = _run_tmux(args, check=False)
+    if result.returncode == 0:
+        chunks = result.stdout.split(f"{sentinel}\n")
+        if len(chunks) == len(targets) + 1:
+            return dict(zip(targets, chunks))
+
+    # A session vanished mid-chain (tmux aborts the whole command list),
+    # fall back to capturing the remaining sessions one by one
+    outputs = {}
+    for sid in targets:
+        single = _run_tmux(list(_capture_args(sid, lines)), check=False)
+        if single.returncode == 0:
+            outputs[sid] = single.stdout
+    return outputs
+
+
+_CONTROL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _decode_control_output(data: str) -> str:
+    """Undo the octal escaping tmux applies to %output data in control mode."""
+    return _CONTROL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), data)
+
+
+class TmuxControl:
+    """Streams pane output from tmux sessions via control-mode clients.
+
+    Keeps one long-lived ``tmux -C attach`` process per session and hands
+    every ``%output`` notification to ``on_output(session_id, chunk)``, so
+    callers learn about pane activity without re-capturing panes. When a
+    client goes away on its own (session killed, tmux server gone)
+    ``on_exit(session_id)`` is called.
+    """
+
+    def __init__(
+        self,
+        on_output: Callable[[str, str], None],
+        on_exit: Optional[Callable[[str], None]] = None,
+    ):
+        self.on_output = on_output
+        self.on_exit = on_exit
+        self._clients: dict[str, tuple[asyncio.subprocess.Process, asyncio.Task]] = {}
+
+    def is_attached(self, session_id: str) -> bool:
+        """Check if a control client is streaming the session."""
+        return session_id in self._clients
+
+    def attached_sessions(self) -> set[str]:
+        """Session IDs with a live control client."""
+        return set(self._clients)
+
+    async def attach(self, session_id: str) -> None:
+        """Start streaming output from a session (no-op if already attached)."""
+        if session_id in self._clients:
+            return
+
+        cmd = [*_TMUX, "-C", "attach", "-t", session_id]
+        log_subprocess_call(logger, cmd)
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        reader = asyncio.create_task(self._read(session_id, proc))
+        self._clients[session_id] = (proc, reader)
+
+    async def _read(self, session_id: str, proc: asyncio.subprocess.Process) -> None:
+        """Forward %output notifications until the client exits."""
+        try:
+            async for raw in proc.stdout:
+                line = raw.decode(errors="replace").rstrip("\n")
+                if line.startswith("%output "):
+                    # %output %<pane_id> <escaped data>
+                    parts = line.split(" ", 2)
+                    chunk = _decode_control_output(parts[2]) if len(parts) == 3 else ""
+                    self.on_output(session_id, chunk)
+                elif line.startswith("%exit"):
+                    break
+        finally:
+            # Only report exits we didn't ask for via detach()
+            entry = self._clients.get(session_id)
+            if entry is not None and entry[0] is proc:
+                del self._clients[session_id]
+                if proc.returncode is None:
+                    proc.kill()
+                if self.on_exit:
+                    self.on_exit(session_id)
+
+    async def detach(self, session_id: str) -> None:
+        """Stop streaming a session and reap its control client."""
+        entry = self._clients.pop(session_id, None)
+        if entry is None:
+            return
+
+        proc, reader = entry
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+        await asyncio.gather(reader, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Detach from every session."""
+        for session_id in list(self._clients):
+            await self.detach(session_id)
+
+
+# tmux's double-quoted strings treat these specially; escape them with a backslash
+_CONTROL_QUOTE = re.compile(r'([\\"$])')
+
+
+def _quote_control_arg(arg: str) -> str:
+    """Quote an argument for a command line sent to a control-mode client."""
+    return '"' + _CONTROL_QUOTE.sub(r"\\\1", arg) + '"'
+
+
+class TmuxCommandClient:
+    """Runs tmux commands over one persistent control-mode client.
+
+    A ``tmux -C`` client attached to a dedicated session accepts command
+    lines on stdin and answers each with a ``%begin``/``%end`` (or
+    ``%error``) block, so commands cost a pipe write instead of spawning a
+    tmux client process. Safe to share between threads.
+    """
+
+    def __init__(self, session_name: str):
+        """Initialize the client (the tmux process starts on first use).
+
+        Args:
+            session_name: Session the control client attaches to (created
+                if missing).
+        """
+        self.session_name = session_name
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> subprocess.Popen:
+        """Launch the control client and consume its startup block."""
+        cmd = [*_TMUX, "-C", "new-session", "-A", "-s", self.session_name]
+        log_subprocess_call(logger, cmd)
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        )
+        self._proc = proc
+        self._read_block()
+        # Output of the client's own pane is never needed, and the session
+        # should go away with the client
+        self._send(["refresh-client", "-f", "no-output"])
+        self._send(["set-option", "-t", self.session_name, "destroy-unattached", "on"])
+        return proc
+
+    def _send(self, args: list[str]) -> tuple[bool, list[str]]:
+        """Write one command line and read its reply blocks.
+
+        Bare ";" arguments separate chained commands, as on the tmux command
+        line; each command gets its own reply block, and tmux skips the rest
+        of the chain (sending no blocks for it) once one fails.
+        """
+        line = " ".join(arg if arg == ";" else _quote_control_arg(arg) for arg in args)
+        self._proc.stdin.write(line + "\n")
+        self._proc.stdin.flush()
+        output = []
+        for _ in range(args.count(";") + 1):
+            ok, lines = self._read_block()
+            output += lines
+            if not ok:
+                return False, output
+        return True, output
+
+    def _read_block(self) -> tuple[bool, list[str]]:
+        """Read up to the next reply block, skipping notifications.
+
+        Returns:
+            (succeeded, output lines)
+
+        Raises:
+            EOFError: If the client exited.
+        """
+        stdout = self._proc.stdout
+        while True:
+            line = stdout.readline()
+            if not line:
+                raise EOFError("tmux control client exited")
+            if line.startswith("%begin "):
+                break
+
+        # The closing guard repeats the time, command number and flags
+        guard = line[len("%begin "):]
+        output = []
+        while True:
+            line = stdout.readline()
+            if not line:
+                raise EOFError("tmux control client exited")
+            if line == f"%end {guard}":
+                return True, output
+            if line == f"%error {guard}":
+                return False, output
+            output.append(line.rstrip("\n"))
+
+    def run(self, args: list[str]) -> Optional[subprocess.CompletedProcess]:
+        """Run a tmux command through the control client.
+
+        Args:
+            args: tmux command and arguments (without the leading "tmux").
+
+        Returns:
+            CompletedProcess shaped like a one-shot tmux call, or None if the
+            command can't go through the client (caller should fall back).
+        """
+        # Command lines are newline-delimited
+        if any("\n" in arg or "\r" in arg for arg in args):
+            return None
+
+        cmd = [*_TMUX, *args]
+        with self._lock:
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._start()
+                ok, lines = self._send(args)
+            except (OSError, EOFError) as e:
+                logger.warning(f"tmux control client unavailable, using subprocess: {e}")
+                self._close_locked()
+                return None
+
+        text = "".join(f"{line}\n" for line in lines)
+        result = subprocess.CompletedProcess(
+            cmd, 0 if ok else 1, stdout=text if ok else "", stderr="" if ok else text
+        )
+        log_subprocess_call(logger, cmd, result=result)
+        return result
+
+    def close(self) -> None:
+        """Detach the control client."""
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.poll() is None:
+            try:
+                # An empty line detaches a control client
+                proc.stdin.write("\n")
+                proc.stdin.flush()
+                proc.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                proc.kill()
+                proc.wait()
+
+
+# Commands that always get their own tmux process
+_SUBPROCESS_ONLY = frozenset({"new-session"})
+
+# Commands whose output nobody reads (only the exit status matters)
+_OUTPUT_UNUSED = frozenset({"has-session", "kill-session", "new-session", "send-keys", "set-environment"})
+
+# Persistent command client used by _run_tmux, if enabled
+_command_client: Optional[TmuxCommandClient] = None
+
+
+def enable_command_client(session_name: Optional[str] = None) -> None:
+    """Route tmux commands through a persistent control-mode client.
+
+    Args:
+        session_name: Session for the client to attach to. Defaults to
+            "<session_prefix>-ctl".
+    """
+    global _command_client
+    if _command_client is not None:
+        return
+    if session_name is None:
+        session_name = f"{get_config().tmux.session_prefix}-ctl"
+    _command_client = TmuxCommandClient(session_name)
+
+
+def disable_command_client() -> None:
+    """Close the persistent command client and go back to one-shot calls."""
+    global _command_client
+    client, _command_client = _command_client, None
+    if client is not None:
+        client.close()
+
+
+def _claude_command(
+    env: dict[str, str], args: list[str], context_file: Optional[Path] = None
+) -> str:
+    """Build the shell command line that launches Claude in a task pane.
+
+    Every value is shell-quoted, so prompts and tool lists can contain
+    quotes, ``$`` or backticks without being mangled by the pane's shell.
+    The context file is read by the pane's shell through ``$(cat ...)``, so
+    its contents are never typed into the pane.
+
+    Args:
+        env: Environment variables to set for the claude process.
+        args: Arguments to pass to claude.
+        context_file: Optional file whose contents go to --append-system-prompt.
+
+    Returns:
+        Command line to type into the tmux pane.
+    """
+    parts = [f"{name}={shlex.quote(value)}" for name, value in env.items()]
+    parts.append("claude")
+    if context_file is not None:
+        parts += ["--append-system-prompt", f'"$(cat {shlex.quote(str(context_file))})"']
+    if args:
+        parts.append(shlex.join(args))
+    return " ".join(parts)
+
+
+@lru_cache(maxsize=1024)
 def get_transcript_dir(task_id: UUID) -> Path:
     """Get the transcript directory path for a task.
 
@@ -87,6 +640,45 @@ def get_transcript_dir(task_id: UUID) -> Path:
     return Path(f"/tmp/chorus/task-{task_id}")
 
 
+# Terminal control sequences (CSI, OSC) and carriage returns in piped pane
+# output; the shell emits some (e.g. bracketed paste off) right before a
+# command's first line of output
+_TERMINAL_CONTROL = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)|\r")
+
+
+def _clean_stream(data: bytes) -> str:
+    """Decode raw piped pane output into plain text lines."""
+    return _TERMINAL_CONTROL.sub("", data.decode(errors="replace"))
+
+
+def get_json_stream_file(task_id: UUID) -> Path:
+    """Get the file a JSON-mode task's pane output is piped to.
+
+    Args:
+        task_id: The task UUID.
+
+    Returns:
+        Path to /tmp/chorus/task-{uuid}/claude.jsonl
+    """
+    return get_transcript_dir(task_id) / "claude.jsonl"
+
+
+# Minimal transcript entry with only cwd, sessionId and timestamp varying;
+# each placeholder takes a JSON-encoded string
+_TRANSCRIPT_TEMPLATE = (
+    '{"parentUuid":null,"isSidechain":false,"userType":"external","cwd":%s,'
+    '"sessionId":%s,"version":"1.0.0","gitBranch":"","type":"user",'
+    '"message":{"role":"user","content":"Task initialized"},'
+    '"uuid":"00000000-0000-0000-0000-000000000000","timestamp":%s}\n'
+)
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as ISO 8601 with microseconds, without datetime objects."""
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds))}.{micros:06d}+00:00"
+
+
 def create_transcript_file(task_id: UUID, project_root: str) -> Path:
     """Create a minimal transcript file for GitButler hooks.
 
@@ -105,27 +697,17 @@ def create_transcript_file(task_id: UUID, project_root: str) -> Path:
 
     transcript_file = transcript_dir / "transcript.json"
 
-    # Create minimal transcript entry (JSONL format - one JSON object per line)
-    entry = {
-        "parentUuid": None,
-        "isSidechain": False,
-        "userType": "external",
-        "cwd": project_root,
-        "sessionId": str(task_id),
-        "version": "1.0.0",
-        "gitBranch": "",
-        "type": "user",
-        "message": {
-            "role": "user",
-            "content": "Task initialized"
-        },
-        "uuid": "00000000-0000-0000-0000-000000000000",
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
-
-    # Write as JSONL (one JSON object per line)
-    with open(transcript_file, "w") as f:
-        f.write(json.dumps(entry) + "\n")
+    # Write as JSONL (one JSON object per line) with a single write() call
+    payload = _TRANSCRIPT_TEMPLATE % (
+        json.dumps(project_root),
+        json.dumps(str(task_id)),
+        json.dumps(_utc_timestamp()),
+    )
+    fd = os.open(transcript_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload.encode())
+    finally:
+        os.close(fd)
 
     logger.debug(f"Created transcript file: {transcript_file}")
     return transcript_file
@@ -143,6 +725,15 @@ class TmuxService:
     5. kill_task_session() - Cleanup when task completes
     """
 
+    # How long a positive session existence check is trusted (seconds)
+    EXISTS_CACHE_TTL = 0.5
+
+    # restart_claude polls the pane's foreground command this often (seconds)
+    # and gives up waiting for the shell after this many polls per Ctrl-C
+    # (0.5s, no shorter than the fixed 0.2s/0.3s sleeps it replaced)
+    RESTART_POLL_INTERVAL = 0.02
+    RESTART_POLL_ATTEMPTS = 25
+
     def __init__(self, project_root: Optional[str] = None):
         """Initialize the tmux service.
 
@@ -153,6 +744,21 @@ class TmuxService:
             config = get_config()
             project_root = str(config.project_root)
         self.project_root = project_root
+        # Pass through CLAUDE_CODE_OAUTH_TOKEN if set (for headless auth)
+        # See: https://github.com/anthropics/claude-code/issues/8938
+        self._oauth_token = os.environ.get("CLAUDE_CODE_OAUTH_TOKEN")
+        # Environment for interactive launches: shared config directory for
+        # hooks, which keeps them out of the hosted project's .claude/ directory
+        self._hooks_env = {"CLAUDE_CONFIG_DIR": str(get_hooks_config_dir())}
+        if self._oauth_token:
+            self._hooks_env["CLAUDE_CODE_OAUTH_TOKEN"] = self._oauth_token
+        # session_id -> monotonic time it was last seen to exist
+        self._exists_cache: dict[str, float] = {}
+        # capture_json_events(since_last=True): task -> next line position to read
+        self._json_positions: dict[UUID, int] = {}
+        # capture_json_events(since_last=True): task -> bytes of its JSON
+        # stream file already read
+        self._json_offsets: dict[UUID, int] = {}
 
     def get_session_id(self, task_id: UUID) -> str:
         """Get the tmux session ID for a task."""
@@ -160,7 +766,37 @@ class TmuxService:
 
     def session_exists(self, task_id: UUID) -> bool:
         """Check if the tmux session for a task exists."""
-        return session_exists(self.get_session_id(task_id))
+        return self._session_exists_cached(self.get_session_id(task_id))
+
+    def _session_exists_cached(self, session_id: str) -> bool:
+        """Check if a session exists, trusting a recent positive result.
+
+        Most methods check the session before acting on it, so this saves a
+        `tmux has-session` call on back-to-back operations. Only positive
+        results are cached, so a newly created session is never missed.
+        """
+        if self._recently_seen(session_id):
+            return True
+        return self._record_exists(session_id, session_exists(session_id))
+
+    async def _session_exists_cached_async(self, session_id: str) -> bool:
+        """Async variant of _session_exists_cached."""
+        if self._recently_seen(session_id):
+            return True
+        return self._record_exists(session_id, await session_exists_async(session_id))
+
+    def _recently_seen(self, session_id: str) -> bool:
+        """Whether the session was seen within EXISTS_CACHE_TTL."""
+        seen = self._exists_cache.get(session_id)
+        return seen is not None and time.monotonic() - seen < self.EXISTS_CACHE_TTL
+
+    def _record_exists(self, session_id: str, exists: bool) -> bool:
+        """Update the existence cache with a fresh check and return it."""
+        if exists:
+            self._exists_cache[session_id] = time.monotonic()
+        else:
+            self._exists_cache.pop(session_id, None)
+        return exists
 
     def create_task_session(self, task_id: UUID) -> str:
         """Create a new tmux session for a task.
@@ -178,7 +814,7 @@ class TmuxService:
         """
         session_id = self.get_session_id(task_id)
 
-        if session_exists(session_id):
+        if self._session_exists_cached(session_id):
             raise SessionExistsError(f"Session {session_id} already exists")
 
         logger.info(f"Creating tmux session for task {task_id}: {session_id}")
@@ -198,6 +834,7 @@ class TmuxService:
             ]
         )
 
+        self._exists_cache[session_id] = time.monotonic()
         logger.info(f"Created tmux session: {session_id}")
         return session_id
 
@@ -222,43 +859,20 @@ class TmuxService:
         """
         session_id = self.get_session_id(task_id)
 
-        if not session_exists(session_id):
+        if not self._session_exists_cached(session_id):
             raise SessionNotFoundError(f"Session {session_id} not found")
 
         logger.info(f"Starting Claude Code for task {task_id} in session {session_id}")
 
-        # Get shared config directory for hooks
-        # This keeps hooks out of the hosted project's .claude/ directory
-        config_dir = get_hooks_config_dir()
-
-        # Build the claude command with isolated config
-        # Pass through CLAUDE_CODE_OAUTH_TOKEN if set (for headless auth)
-        # See: https://github.com/anthropics/claude-code/issues/8938
-        env_vars = [f'CLAUDE_CONFIG_DIR="{config_dir}"']
-        oauth_token = os.environ.get("CLAUDE_CODE_OAUTH_TOKEN")
-        if oauth_token:
-            env_vars.append(f'CLAUDE_CODE_OAUTH_TOKEN="{oauth_token}"')
-        env_prefix = " ".join(env_vars)
-
-        # Build Claude command with context and initial prompt
-        if context_file and context_file.exists():
-            # Use --append-system-prompt to inject task context
-            # The context becomes part of Claude's system prompt for the entire session
-            claude_cmd = f'{env_prefix} claude --append-system-prompt "$(cat {context_file})"'
-            logger.debug(f"Starting Claude with context file: {context_file}")
-        else:
-            claude_cmd = f"{env_prefix} claude"
-
-        # If there's an initial prompt, pass it using -p flag
+        # If there's an initial prompt, pass it directly to Claude as an argument
+        # (-p would run it non-interactively and exit after the first reply).
         # This is more reliable than waiting and sending keys via tmux
+        args = []
         if initial_prompt:
-            # Escape the prompt for shell
-            escaped_prompt = initial_prompt.replace('"', '\\"')
-            claude_cmd += f' -p "{escaped_prompt}"'
+            args.append(initial_prompt)
             logger.debug(f"Starting Claude with initial prompt: {initial_prompt[:100]}...")
 
-        # Send the claude command
-        _run_tmux(["send-keys", "-t", session_id, claude_cmd, "Enter"])
+        self._launch_claude(session_id, self._hooks_env, args, context_file)
         logger.info(f"Claude Code started for task {task_id}")
 
     def start_claude_json_mode(
@@ -283,7 +897,7 @@ class TmuxService:
         """
         session_id = self.get_session_id(task_id)
 
-        if not session_exists(session_id):
+        if not self._session_exists_cached(session_id):
             raise SessionNotFoundError(f"Session {session_id} not found")
 
         logger.info(f"Starting Claude Code (JSON mode) for task {task_id} in session {session_id}")
@@ -302,46 +916,39 @@ class TmuxService:
         _run_tmux(["set-environment", "-t", session_id, "CHORUS_DB_PATH", str(db_path)])
 
         # Pass through OAuth token if set
-        oauth_token = os.environ.get("CLAUDE_CODE_OAUTH_TOKEN")
-        if oauth_token:
-            _run_tmux(["set-environment", "-t", session_id, "CLAUDE_CODE_OAUTH_TOKEN", oauth_token])
+        if self._oauth_token:
+            _run_tmux(["set-environment", "-t", session_id, "CLAUDE_CODE_OAUTH_TOKEN", self._oauth_token])
 
         # Build Claude command with JSON output format in non-interactive mode
         # Note: Do NOT use --permission-mode delegate as it removes standard tools when MCP servers are present
         # Explicitly export environment variables in the command (tmux set-environment doesn't auto-export)
-        env_prefix = f'CHORUS_TASK_ID="{task_id}" CHORUS_DB_PATH="{db_path}"'
-        if oauth_token:
-            env_prefix += f' CLAUDE_CODE_OAUTH_TOKEN="{oauth_token}"'
-
-        if context_file and context_file.exists():
-            claude_cmd = '{env_prefix} claude -p "" --append-system-prompt "$(cat {context_file})" --output-format stream-json --verbose'.format(
-                env_prefix=env_prefix,
-                context_file=context_file
-            )
-            logger.debug(f"Starting Claude (JSON) with context file: {context_file}")
-        else:
-            claude_cmd = f'{env_prefix} claude -p "" --output-format stream-json --verbose'
-            logger.debug("Starting Claude (JSON) in -p mode")
+        env = {"CHORUS_TASK_ID": str(task_id), "CHORUS_DB_PATH": str(db_path)}
+        if self._oauth_token:
+            env["CLAUDE_CODE_OAUTH_TOKEN"] = self._oauth_token
+
+        # The initial prompt (if any) is the -p argument
+        args = ["-p", initial_prompt or "", "--output-format", "stream-json", "--verbose"]
+        if initial_prompt:
+            logger.debug(f"Starting Claude with initial prompt: {initial_prompt[:100]}...")
 
         # Add resume flag if session ID provided
         if resume_session_id:
-            claude_cmd += f" --resume {resume_session_id}"
+            args += ["--resume", resume_session_id]
             logger.debug(f"Resuming Claude session: {resume_session_id}")
 
         # Add allowed tools if provided
         if allowed_tools:
-            escaped_tools = allowed_tools.replace('"', '\\"')
-            claude_cmd += f' --allowedTools "{escaped_tools}"'
+            args += ["--allowedTools", allowed_tools]
             logger.debug(f"Setting allowed tools: {allowed_tools}")
 
-        # If there's an initial prompt, replace the empty prompt
-        if initial_prompt:
-            escaped_prompt = initial_prompt.replace('"', '\\"')
-            claude_cmd = claude_cmd.replace('-p ""', f'-p "{escaped_prompt}"', 1)
-            logger.debug(f"Starting Claude with initial prompt: {initial_prompt[:100]}...")
+        # Copy everything the pane prints to a file before Claude starts, so
+        # events are read from there instead of capturing the scrollback.
+        # Without -o this replaces any pipe left from an earlier run.
+        stream_file = get_json_stream_file(task_id)
+        stream_file.parent.mkdir(parents=True, exist_ok=True)
+        _run_tmux(["pipe-pane", "-t", session_id, f"cat >> {shlex.quote(str(stream_file))}"])
 
-        # Send the claude command
-        _run_tmux(["send-keys", "-t", session_id, claude_cmd, "Enter"])
+        self._launch_claude(session_id, env, args, context_file)
         logger.info(f"Claude Code (JSON mode) started for task {task_id}")
 
     def restart_claude(
@@ -365,46 +972,67 @@ class TmuxService:
         """
         session_id = self.get_session_id(task_id)
 
-        if not session_exists(session_id):
+        if not self._session_exists_cached(session_id):
             raise SessionNotFoundError(f"Session {session_id} not found")
 
         logger.info(f"Restarting Claude Code for task {task_id}")
 
         # Send Ctrl-C to interrupt any running process
         _run_tmux(["send-keys", "-t", session_id, "C-c"])
-        time.sleep(0.2)
-
-        # Send another Ctrl-C in case Claude needs confirmation to exit
-        _run_tmux(["send-keys", "-t", session_id, "C-c"])
-        time.sleep(0.3)
-
-        # Get shared config directory for hooks
-        config_dir = get_hooks_config_dir()
 
-        # Build the claude command with isolated config (same logic as start_claude)
-        # Pass through CLAUDE_CODE_OAUTH_TOKEN if set (for headless auth)
-        env_vars = [f'CLAUDE_CONFIG_DIR="{config_dir}"']
-        oauth_token = os.environ.get("CLAUDE_CODE_OAUTH_TOKEN")
-        if oauth_token:
-            env_vars.append(f'CLAUDE_CODE_OAUTH_TOKEN="{oauth_token}"')
-        env_prefix = " ".join(env_vars)
-
-        # Build Claude command with context and initial prompt
-        if context_file and context_file.exists():
-            claude_cmd = f'{env_prefix} claude --append-system-prompt "$(cat {context_file})"'
-        else:
-            claude_cmd = f"{env_prefix} claude"
+        if not self._wait_for_shell(session_id):
+            # Send another Ctrl-C in case Claude needs confirmation to exit
+            _run_tmux(["send-keys", "-t", session_id, "C-c"])
+            if not self._wait_for_shell(session_id):
+                # Typing the command now would feed it to the still-running Claude
+                logger.error(
+                    f"Claude in session {session_id} didn't exit after Ctrl-C; "
+                    f"not relaunching it for task {task_id}"
+                )
+                return
 
         # If there's an initial prompt, pass it directly to Claude as an argument
         # This is more reliable than waiting and sending keys via tmux
-        if initial_prompt:
-            # Escape the prompt for shell
-            escaped_prompt = initial_prompt.replace('"', '\\"')
-            claude_cmd += f' "{escaped_prompt}"'
+        args = [initial_prompt] if initial_prompt else []
+        self._launch_claude(session_id, self._hooks_env, args, context_file)
+        logger.info(f"Claude Code restarted for task {task_id}")
+
+    def _launch_claude(
+        self,
+        session_id: str,
+        env: dict[str, str],
+        args: list[str],
+        context_file: Optional[Path],
+    ) -> None:
+        """Type the claude command line into the session's pane.
 
-        # Start Claude again
+        Task context from context_file goes to --append-system-prompt and
+        becomes part of Claude's system prompt for the entire session; a
+        missing file is skipped.
+        """
+        if context_file is not None:
+            if context_file.exists():
+                logger.debug(f"Starting Claude with context file: {context_file}")
+            else:
+                context_file = None
+        claude_cmd = _claude_command(env, args, context_file)
         _run_tmux(["send-keys", "-t", session_id, claude_cmd, "Enter"])
-        logger.info(f"Claude Code restarted for task {task_id}")
+
+    def _wait_for_shell(self, session_id: str) -> bool:
+        """Poll until the pane's foreground command is a shell again.
+
+        Returns:
+            True once the shell is back, False after RESTART_POLL_ATTEMPTS.
+        """
+        for _ in range(self.RESTART_POLL_ATTEMPTS):
+            result = _run_tmux(
+                ["display-message", "-p", "-t", session_id, "#{pane_current_command}"],
+                check=False,
+            )
+            if result.returncode == 0 and result.stdout.strip() in _SHELLS:
+                return True
+            time.sleep(self.RESTART_POLL_INTERVAL)
+        return False
 
     def kill_task_session(self, task_id: UUID) -> None:
         """Kill the tmux session for a task and cleanup transcript directory.
@@ -417,18 +1045,25 @@ class TmuxService:
         """
         session_id = self.get_session_id(task_id)
 
-        if not session_exists(session_id):
+        if not self._session_exists_cached(session_id):
             raise SessionNotFoundError(f"Session {session_id} not found")
 
         logger.info(f"Killing tmux session for task {task_id}: {session_id}")
         _run_tmux(["kill-session", "-t", session_id])
+        self._exists_cache.pop(session_id, None)
         logger.info(f"Killed tmux session: {session_id}")
 
-        # Cleanup transcript directory
+        # Cleanup transcript directory, which normally holds just the transcript
         transcript_dir = get_transcript_dir(task_id)
-        if transcript_dir.exists():
+        try:
+            os.unlink(transcript_dir / "transcript.json")
+            os.rmdir(transcript_dir)
+        except OSError:
+            # Already gone, or holds more files (e.g. a context file)
+            if not transcript_dir.exists():
+                return
             shutil.rmtree(transcript_dir, ignore_errors=True)
-            logger.debug(f"Cleaned up transcript directory: {transcript_dir}")
+        logger.debug(f"Cleaned up transcript directory: {transcript_dir}")
 
     def capture_output(self, task_id: UUID, lines: int = 100) -> str:
         """Capture terminal output from the task's tmux session.
@@ -445,16 +1080,73 @@ class TmuxService:
         """
         session_id = self.get_session_id(task_id)
 
-        if not session_exists(session_id):
+        if not self._session_exists_cached(session_id):
             raise SessionNotFoundError(f"Session {session_id} not found")
 
-        result = _run_tmux(
-            ["capture-pane", "-t", session_id, "-p", "-S", f"-{lines}"],
-            check=False,
-        )
+        result = _run_tmux(list(_capture_args(session_id, lines)), check=False)
+        return result.stdout if result.returncode == 0 else ""
+
+    async def capture_output_async(self, task_id: UUID, lines: int = 100) -> str:
+        """Capture terminal output without blocking the event loop.
+
+        Async variant of capture_output for callers on the event loop;
+        several captures can run concurrently with asyncio.gather.
+
+        Raises:
+            SessionNotFoundError: If the session doesn't exist.
+        """
+        session_id = self.get_session_id(task_id)
+
+        if not await self._session_exists_cached_async(session_id):
+            raise SessionNotFoundError(f"Session {session_id} not found")
+
+        result = await _run_tmux_async(list(_capture_args(session_id, lines)), check=False)
         return result.stdout if result.returncode == 0 else ""
 
-    def capture_json_events(self, task_id: UUID) -> str:
+    def capture_outputs(
+        self, task_ids: list[UUID], lines: int = 100, existing: Optional[set[UUID]] = None
+    ) -> dict[UUID, str]:
+        """Capture terminal output from several task sessions at once.
+
+        Uses a single tmux invocation for all sessions (see capture_outputs_bulk).
+
+        Args:
+            task_ids: The task IDs.
+            lines: Number of lines to capture from history.
+            existing: Task IDs whose sessions are known to exist, to skip
+                listing sessions again.
+
+        Returns:
+            Dict of task ID -> captured output. Tasks whose session doesn't
+            exist are omitted.
+        """
+        session_ids = {task_id: self.get_session_id(task_id) for task_id in task_ids}
+        known = None if existing is None else {self.get_session_id(task_id) for task_id in existing}
+        outputs = capture_outputs_bulk(list(session_ids.values()), lines=lines, existing=known)
+        return {
+            task_id: outputs[session_id]
+            for task_id, session_id in session_ids.items()
+            if session_id in outputs
+        }
+
+    def pane_signatures(self, task_ids: list[UUID]) -> dict[UUID, PaneSignature]:
+        """Get pane signatures for several task sessions with one tmux call.
+
+        Args:
+            task_ids: The task IDs.
+
+        Returns:
+            Dict of task ID -> PaneSignature. Tasks whose session doesn't
+            exist are omitted.
+        """
+        signatures = pane_signatures()
+        return {
+            task_id: signatures[session_id]
+            for task_id in task_ids
+            if (session_id := self.get_session_id(task_id)) in signatures
+        }
+
+    def capture_json_events(self, task_id: UUID, since_last: bool = False) -> str:
         """Capture JSON events from the task's tmux session.
 
         This method is specifically for capturing output from Claude running
@@ -462,6 +1154,10 @@ class TmuxService:
 
         Args:
             task_id: The task ID.
+            since_last: Only return lines that appeared since the previous
+                since_last call for this task, instead of the whole
+                scrollback. A JSON object still being written is held back
+                until it's complete.
 
         Returns:
             The captured terminal output containing JSON events.
@@ -471,9 +1167,19 @@ class TmuxService:
         """
         session_id = self.get_session_id(task_id)
 
-        if not session_exists(session_id):
+        if not self._session_exists_cached(session_id):
             raise SessionNotFoundError(f"Session {session_id} not found")
 
+        stream_file = get_json_stream_file(task_id)
+        if stream_file.exists():
+            if since_last:
+                return self._read_new_stream_lines(task_id, stream_file)
+            return _clean_stream(stream_file.read_bytes())
+
+        # No piped output (e.g. started by an older version): use the pane
+        if since_last:
+            return self._capture_new_lines(task_id, session_id)
+
         # Capture more lines to get all JSON events
         # -S - captures entire scrollback history (up to tmux's history limit)
         # -p prints to stdout
@@ -483,6 +1189,72 @@ class TmuxService:
         )
         return result.stdout if result.returncode == 0 else ""
 
+    def _read_new_stream_lines(self, task_id: UUID, stream_file: Path) -> str:
+        """Read the complete lines appended to a task's JSON stream file.
+
+        Only the bytes after the previous call's offset are read; a line
+        still being written is left for the next call.
+        """
+        offset = self._json_offsets.get(task_id, 0)
+        with open(stream_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size < offset:
+                # Recreated since the last read: start over
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        self._json_offsets[task_id] = offset + end
+        return _clean_stream(data[:end])
+
+    def _capture_new_lines(self, task_id: UUID, session_id: str) -> str:
+        """Capture pane lines from the last read position to the cursor.
+
+        Positions count lines from the top of the scrollback (history size
+        + cursor row), so each call only moves the new lines through the
+        pipe. Once the history is full, lines scroll away without the
+        count growing; the whole scrollback is returned then, as without
+        since_last.
+        """
+        result = _run_tmux(
+            ["display-message", "-p", "-t", session_id, _PANE_POSITION], check=False
+        )
+        try:
+            history, limit, cursor_y, width = (int(value) for value in result.stdout.split())
+        except ValueError:
+            history = limit = cursor_y = width = 0
+
+        start = self._json_positions.pop(task_id, 0)
+        if result.returncode != 0 or history >= limit:
+            result = _run_tmux(["capture-pane", "-t", session_id, "-p", "-S", "-"], check=False)
+            return result.stdout if result.returncode == 0 else ""
+        if start > history + cursor_y:
+            # Scrollback was cleared: read again from the top
+            start = 0
+
+        result = _run_tmux(
+            ["capture-pane", "-t", session_id, "-p",
+             "-S", str(start - history), "-E", str(cursor_y)],
+            check=False,
+        )
+        if result.returncode != 0:
+            return ""
+
+        rows = result.stdout.split("\n")[: history + cursor_y - start + 1]
+        # Re-read the cursor row next time: output lands there (or it's the
+        # shell prompt, which later output leaves behind as an ordinary line)
+        held = len(rows) - 1
+        if rows[-1].strip():
+            # A JSON object still being written (no trailing newline yet) may
+            # have wrapped over several full-width rows ending at the cursor:
+            # hold all of them back so it's returned whole next time
+            first = held
+            while first > 0 and len(rows[first - 1]) >= width:
+                first -= 1
+            if rows[first].lstrip().startswith("{"):
+                held = first
+        self._json_positions[task_id] = start + held
+        return "".join(f"{row}\n" for row in rows[:held])
+
     def send_keys(self, task_id: UUID, text: str, enter: bool = True) -> None:
         """Send text to the task's tmux session.
 
@@ -496,7 +1268,7 @@ class TmuxService:
         """
         session_id = self.get_session_id(task_id)
 
-        if not session_exists(session_id):
+        if not self._session_exists_cached(session_id):
             raise SessionNotFoundError(f"Session {session_id} not found")
 
         args = ["send-keys", "-t", session_id, text]
@@ -527,14 +1299,16 @@ class TmuxService:
             SessionInfo with session details.
         """
         session_id = self.get_session_id(task_id)
-        exists = session_exists(session_id)
+        exists = self._session_exists_cached(session_id)
 
         has_claude = False
         if exists:
             # Check if 'claude' process is running in the session
-            output = self.capture_output(task_id, lines=5)
-            # Simple heuristic: if output contains typical Claude prompts
-            has_claude = ">" in output or "claude" in output.lower()
+            has_claude = _pane_has_claude(session_id)
+            if has_claude is None:
+                # No /proc: simple heuristic on typical Claude prompts
+                output = self.capture_output(task_id, lines=5)
+                has_claude = ">" in output or "claude" in output.lower()
 
         return SessionInfo(
             session_id=session_id,
@@ -549,20 +1323,28 @@ class TmuxService:
         Returns:
             List of task IDs with active sessions.
         """
-        result = _run_tmux(
-            ["list-sessions", "-F", "#{session_name}"], check=False
-        )
+        global _session_filter_supported
+        prefix = _task_session_prefix()
+        # tmux filters out non-task sessions server-side; the regex then
+        # only has to pull the IDs out (and reject non-numeric ones)
+        if _session_filter_supported:
+            result = _run_tmux(list(_list_task_sessions_args(prefix)), check=False)
+            if result.returncode != 0:
+                # No server, or a tmux older than 3.2 without -f: list every
+                # session and leave the filtering to the regex
+                result = _run_tmux(list(_LIST_SESSION_NAMES), check=False)
+                if result.returncode == 0:
+                    _session_filter_supported = False
+        else:
+            result = _run_tmux(list(_LIST_SESSION_NAMES), check=False)
         if result.returncode != 0:
             return []
 
+        matches = _task_session_re(prefix).finditer(result.stdout)
+        now = time.monotonic()
         task_ids = []
-        config = get_config()
-        prefix = f"{config.tmux.session_prefix}-task-"
-        for line in result.stdout.strip().split("\n"):
-            if line.startswith(prefix):
-                try:
-                    task_id = int(line[len(prefix) :])
-                    task_ids.append(task_id)
-                except ValueError:
-                    continue
+        for match in matches:
+            task_ids.append(int(match[1]))
+            # Listed sessions exist: spare follow-up calls their own check
+            self._exists_cache[match[0]] = now
         return task_ids
@@ -4,14 +4,17 @@ Manages ttyd processes that provide web-based terminal access to task tmux sessi
 Each task gets its own ttyd instance on a unique port.
 """
 
+import asyncio
+import select
 import subprocess
 import signal
 import os
+import threading
+import time
 from dataclasses import dataclass
 from typing import Optional
 from uuid import UUID
 
-from config import get_config
 from services.logging_utils import get_logger, log_subprocess_call
 
 logger = get_logger(__name__)
@@ -32,10 +35,18 @@ class TtydAlreadyRunningError(TtydError):
     pass
 
 
+# First port handed out to ttyd instances (task ports are offset from it)
+DEFAULT_BASE_PORT = 7681
+
+# Usable ttyd ports: unprivileged, and within the 16-bit TCP range
+MIN_PORT = 1024
+MAX_PORT = 65535
+
+
 @dataclass
 class TtydConfig:
     """ttyd configuration."""
-    base_port: int = 7681
+    base_port: int = DEFAULT_BASE_PORT
     enabled: bool = True
 
 
@@ -48,19 +59,89 @@ class TtydInfo:
     url: str
 
 
-# Track running ttyd processes: task_id -> (pid, port)
-_running_processes: dict[UUID, tuple[int, int]] = {}
+# Guards the tracking state below: the service is used from FastAPI's
+# threadpool and the event loop (reap callbacks). Reentrant since public
+# methods call each other (e.g. stop_if_running -> is_running -> _forget)
+_lock = threading.RLock()
 
+# Track running ttyd processes: task_id -> (pid, port, pidfd, url)
+# pidfd is None where pidfd_open isn't available (non-Linux, Linux < 5.3)
+_running_processes: dict[UUID, tuple[int, int, Optional[int], str]] = {}
 
-def _get_port_for_task(task_id: UUID, base_port: int = 7681) -> int:
+
+def _get_port_for_task(task_id: UUID, base_port: int = DEFAULT_BASE_PORT) -> int:
     """Calculate port for a task using hash of UUID."""
     # Use hash of UUID to generate port in range [base_port, base_port + 10000)
     port_offset = hash(task_id) % 10000
     return base_port + port_offset
 
 
-def _is_process_running(pid: int) -> bool:
-    """Check if a process is still running."""
+# Tasks whose ttyd exit is watched by an event loop (see TtydService.start_async):
+# task_id -> loop; their _running_processes entries are removed on exit
+_watchers: dict[UUID, asyncio.AbstractEventLoop] = {}
+
+
+# Signalled or exited ttyd pids not reaped yet; retried on later starts/stops
+# (what subprocess does for abandoned Popen objects)
+_unreaped: list[int] = []
+
+
+def _spawn(cmd: list[str]) -> int:
+    """Start a detached process with output discarded and return its pid.
+
+    Uses posix_spawn, which glibc implements with a vfork-style clone, so
+    the (large) server process's page tables aren't copied per launch the
+    way fork() in subprocess.Popen can. Falls back to Popen where
+    posix_spawn can't create a new session.
+    """
+    _reap_finished()
+    devnull = [
+        (os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_WRONLY, 0) for fd in (1, 2)
+    ]
+    try:
+        # setsid: detach from the server's session, like start_new_session
+        return os.posix_spawnp(cmd[0], cmd, os.environ, file_actions=devnull, setsid=True)
+    except (AttributeError, NotImplementedError):
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,  # Detach from parent
+        )
+        return process.pid
+
+
+def _reap_finished() -> None:
+    """Collect exit statuses of finished ttyd processes so they don't linger as zombies."""
+    for pid in list(_unreaped):
+        try:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            done = pid  # Not our child (anymore)
+        if done:
+            _unreaped.remove(pid)
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """Open a pidfd for a process, or None if the platform lacks them."""
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+def _is_process_running(pid: int, pidfd: Optional[int] = None) -> bool:
+    """Check if a process is still running.
+
+    With a pidfd this can't be fooled by PID reuse, and an exited but
+    unreaped (zombie) process counts as stopped: the fd turns readable
+    once the process exits.
+    """
+    if pidfd is not None:
+        readable, _, _ = select.select([pidfd], [], [], 0)
+        return not readable
     try:
         os.kill(pid, 0)
         return True
@@ -68,6 +149,88 @@ def _is_process_running(pid: int) -> bool:
         return False
 
 
+def _exited_pidfds(pidfds: list[int], timeout: float = 0) -> set[int]:
+    """Find which of several pidfds belong to exited processes, in one poll().
+
+    Waits up to timeout seconds for at least one to exit.
+    """
+    if not pidfds:
+        return set()
+    poller = select.poll()
+    for fd in pidfds:
+        poller.register(fd, select.POLLIN)
+    return {fd for fd, _ in poller.poll(timeout * 1000)}
+
+
+def _signal_group(pid: int, sig: int) -> None:
+    """Signal a ttyd's process group (it leads its own), or just the pid."""
+    try:
+        os.killpg(pid, sig)
+    except OSError:
+        try:
+            os.kill(pid, sig)
+        except OSError as e:
+            logger.warning(f"Failed to signal ttyd process {pid}: {e}")
+
+
+def _collect(pid: int, pidfd: int) -> bool:
+    """Reap an exited ttyd through its pidfd (or its pid without P_PIDFD).
+
+    Returns True once the process is reaped, False if it hasn't exited yet.
+    """
+    try:
+        if hasattr(os, "P_PIDFD"):
+            return os.waitid(os.P_PIDFD, pidfd, os.WEXITED | os.WNOHANG) is not None
+        return os.waitpid(pid, os.WNOHANG)[0] != 0
+    except ChildProcessError:
+        return True  # Already reaped
+
+
+def _untrack(task_id: UUID) -> Optional[tuple[int, int, Optional[int], str]]:
+    """Remove a task's ttyd from tracking and from its event loop watcher."""
+    with _lock:
+        entry = _running_processes.pop(task_id, None)
+        loop = _watchers.pop(task_id, None)
+        if entry is not None and entry[2] is not None:
+            if loop is not None and not loop.is_closed():
+                loop.remove_reader(entry[2])
+        return entry
+
+
+def _release(entry: tuple[int, int, Optional[int], str], reaped: bool = False) -> None:
+    """Release an untracked ttyd's pidfd.
+
+    Unless reaped, the pid is queued for a later waitpid(); a pid that was
+    already reaped must not be, as the kernel may have reused it.
+    """
+    with _lock:
+        if not reaped:
+            _unreaped.append(entry[0])
+        _reap_finished()
+        if entry[2] is not None:
+            os.close(entry[2])
+
+
+def _forget(task_id: UUID, reaped: bool = False) -> None:
+    """Stop tracking a task's ttyd process and release its pidfd."""
+    with _lock:
+        entry = _untrack(task_id)
+        if entry is not None:
+            _release(entry, reaped)
+
+
+def _reap(task_id: UUID) -> None:
+    """Event loop callback for a watched ttyd exiting: reap it and forget it."""
+    with _lock:
+        entry = _running_processes.get(task_id)
+        if entry is None:
+            return
+        pid, _, pidfd, _ = entry
+        reaped = _collect(pid, pidfd)
+        logger.info(f"ttyd for task {task_id} exited (PID {pid})")
+        _forget(task_id, reaped=reaped)
+
+
 class TtydService:
     """Manage ttyd processes for web terminal access.
 
@@ -75,7 +238,10 @@ class TtydService:
     terminal access to its tmux session.
     """
 
-    def __init__(self, base_port: int = 7681):
+    # How long cleanup_all waits for instances to exit after SIGTERM (seconds)
+    STOP_TIMEOUT = 1.0
+
+    def __init__(self, base_port: int = DEFAULT_BASE_PORT):
         """Initialize the ttyd service.
 
         Args:
@@ -85,23 +251,33 @@ class TtydService:
 
     def get_port(self, task_id: UUID) -> int:
         """Get the port for a task's ttyd instance."""
+        entry = _running_processes.get(task_id)
+        if entry is not None:
+            return entry[1]
         return _get_port_for_task(task_id, self.base_port)
 
     def get_url(self, task_id: UUID) -> str:
         """Get the URL for a task's ttyd instance."""
+        entry = _running_processes.get(task_id)
+        if entry is not None:
+            return entry[3]
         port = self.get_port(task_id)
         return f"http://localhost:{port}"
 
     def is_running(self, task_id: UUID) -> bool:
         """Check if ttyd is running for a task."""
-        if task_id not in _running_processes:
-            return False
-        pid, _ = _running_processes[task_id]
-        if not _is_process_running(pid):
-            # Clean up stale entry
-            del _running_processes[task_id]
-            return False
-        return True
+        with _lock:
+            if task_id not in _running_processes:
+                return False
+            if task_id in _watchers:
+                # The loop removes the entry as soon as the process exits
+                return True
+            pid, _, pidfd, _ = _running_processes[task_id]
+            if not _is_process_running(pid, pidfd):
+                # Clean up stale entry
+                _forget(task_id)
+                return False
+            return True
 
     def start(self, task_id: UUID, session_id: str) -> TtydInfo:
         """Start ttyd for a task's tmux session.
@@ -117,54 +293,87 @@ class TtydService:
             TtydAlreadyRunningError: If ttyd is already running for this task.
             TtydError: If ttyd fails to start.
         """
-        if self.is_running(task_id):
-            raise TtydAlreadyRunningError(f"ttyd already running for task {task_id}")
-
-        port = self.get_port(task_id)
-
-        logger.info(f"Starting ttyd for task {task_id} on port {port} (session: {session_id})")
-
-        # Build ttyd command
-        # -W: writable (allow input)
-        # -p: port
-        # Use 'setsid' to run tmux attach in its own session, preventing SIGHUP
-        # propagation when WebSocket clients disconnect
-        # This prevents page refreshes from killing processes in the tmux session
-        cmd = [
-            "ttyd",
-            "-W",  # Writable
-            "-p", str(port),
-            "sh", "-c", f"setsid tmux attach -t {session_id}"
-        ]
-
-        try:
-            log_subprocess_call(logger, cmd)
-            # Start ttyd in background
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                start_new_session=True,  # Detach from parent
-            )
+        with _lock:
+            if self.is_running(task_id):
+                raise TtydAlreadyRunningError(f"ttyd already running for task {task_id}")
+
+            port = self.get_port(task_id)
+            if not MIN_PORT <= port <= MAX_PORT:
+                raise TtydError(
+                    f"Port {port} for task {task_id} is outside {MIN_PORT}-{MAX_PORT}; "
+                    f"lower the base port ({self.base_port})"
+                )
+
+            logger.info(f"Starting ttyd for task {task_id} on port {port} (session: {session_id})")
+
+            # Build ttyd command
+            # -W: writable (allow input)
+            # -p: port
+            # ttyd runs tmux attach directly, without a shell in between. The
+            # SIGHUP it sends when a WebSocket client disconnects (e.g. a page
+            # refresh) only reaches that attached tmux client, which detaches;
+            # the processes in the tmux session belong to the tmux server and
+            # keep running
+            cmd = [
+                "ttyd",
+                "-W",  # Writable
+                "-p", str(port),
+                "tmux", "attach", "-t", session_id,
+            ]
+
+            try:
+                log_subprocess_call(logger, cmd)
+                # Start ttyd in background
+                pid = _spawn(cmd)
+
+                # Store process info, with a pidfd for cheap, reuse-safe liveness
+                # checks and the URL formatted once for every later listing
+                url = f"http://localhost:{port}"
+                _running_processes[task_id] = (pid, port, _open_pidfd(pid), url)
+
+                logger.info(f"Started ttyd for task {task_id}: PID {pid}, URL {url}")
+
+                return TtydInfo(
+                    task_id=task_id,
+                    port=port,
+                    pid=pid,
+                    url=url,
+                )
+
+            except FileNotFoundError:
+                logger.error("ttyd not found. Install with: brew install ttyd")
+                raise TtydError("ttyd not found. Install with: brew install ttyd")
+            except Exception as e:
+                logger.error(f"Failed to start ttyd for task {task_id}: {e}", exc_info=e)
+                raise TtydError(f"Failed to start ttyd: {e}")
+
+    async def start_async(self, task_id: UUID, session_id: str) -> TtydInfo:
+        """Start ttyd and have the running event loop reap it when it exits.
+
+        The process's pidfd is registered with the loop, so an exited ttyd
+        is reaped and dropped from tracking right away instead of lingering
+        as a zombie until the next liveness check. Without pidfd support
+        this behaves like start().
 
-            # Store process info
-            _running_processes[task_id] = (process.pid, port)
-
-            logger.info(f"Started ttyd for task {task_id}: PID {process.pid}, URL {self.get_url(task_id)}")
+        Args:
+            task_id: The task ID.
+            session_id: The tmux session ID to attach to.
 
-            return TtydInfo(
-                task_id=task_id,
-                port=port,
-                pid=process.pid,
-                url=self.get_url(task_id),
-            )
+        Returns:
+            TtydInfo with connection details.
 
-        except FileNotFoundError:
-            logger.error("ttyd not found. Install with: brew install ttyd")
-            raise TtydError("ttyd not found. Install with: brew install ttyd")
-        except Exception as e:
-            logger.error(f"Failed to start ttyd for task {task_id}: {e}", exc_info=e)
-            raise TtydError(f"Failed to start ttyd: {e}")
+        Raises:
+            TtydAlreadyRunningError: If ttyd is already running for this task.
+            TtydError: If ttyd fails to start.
+        """
+        info = self.start(task_id, session_id)
+        with _lock:
+            entry = _running_processes.get(task_id)
+            if entry is not None and entry[2] is not None:
+                loop = asyncio.get_running_loop()
+                loop.add_reader(entry[2], _reap, task_id)
+                _watchers[task_id] = loop
+        return info
 
     def stop(self, task_id: UUID) -> None:
         """Stop ttyd for a task.
@@ -175,22 +384,38 @@ class TtydService:
         Raises:
             TtydNotRunningError: If ttyd is not running for this task.
         """
-        if task_id not in _running_processes:
-            raise TtydNotRunningError(f"ttyd not running for task {task_id}")
-
-        pid, port = _running_processes[task_id]
-
-        logger.info(f"Stopping ttyd for task {task_id}: PID {pid}, port {port}")
-
-        try:
-            # Send SIGTERM to gracefully stop
-            os.kill(pid, signal.SIGTERM)
-            logger.debug(f"Sent SIGTERM to ttyd process {pid}")
-        except OSError as e:
-            logger.warning(f"Failed to kill ttyd process {pid}: {e}")
-
-        # Remove from tracking
-        del _running_processes[task_id]
+        with _lock:
+            entry = _untrack(task_id)
+            if entry is None:
+                raise TtydNotRunningError(f"ttyd not running for task {task_id}")
+
+            pid, port, pidfd, _ = entry
+
+            logger.info(f"Stopping ttyd for task {task_id}: PID {pid}, port {port}")
+
+            try:
+                # Send SIGTERM to gracefully stop
+                os.kill(pid, signal.SIGTERM)
+                logger.debug(f"Sent SIGTERM to ttyd process {pid}")
+            except OSError as e:
+                logger.warning(f"Failed to kill ttyd process {pid}: {e}")
+
+        # Wait without holding _lock: reap callbacks on the event loop take it
+        reaped = False
+        if pidfd is not None:
+            # Block in poll() on the pidfd until ttyd exits (bounded by
+            # STOP_TIMEOUT), then reap it so no zombie is left behind
+            if not _exited_pidfds([pidfd], timeout=self.STOP_TIMEOUT):
+                logger.warning(f"ttyd process {pid} ignored SIGTERM, killing it")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError as e:
+                    logger.warning(f"Failed to kill ttyd process {pid}: {e}")
+                _exited_pidfds([pidfd], timeout=self.STOP_TIMEOUT)
+            reaped = _collect(pid, pidfd)
+
+        # Closes the pidfd
+        _release(entry, reaped)
         logger.info(f"Stopped ttyd for task {task_id}")
 
     def stop_if_running(self, task_id: UUID) -> bool:
@@ -202,14 +427,15 @@ class TtydService:
         Returns:
             True if ttyd was stopped, False if it wasn't running.
         """
-        if not self.is_running(task_id):
-            return False
+        with _lock:
+            if not self.is_running(task_id):
+                return False
 
-        try:
-            self.stop(task_id)
-            return True
-        except TtydNotRunningError:
-            return False
+            try:
+                self.stop(task_id)
+                return True
+            except TtydNotRunningError:
+                return False
 
     def get_info(self, task_id: UUID) -> Optional[TtydInfo]:
         """Get info about a running ttyd instance.
@@ -220,16 +446,17 @@ class TtydService:
         Returns:
             TtydInfo if running, None otherwise.
         """
-        if not self.is_running(task_id):
-            return None
-
-        pid, port = _running_processes[task_id]
-        return TtydInfo(
-            task_id=task_id,
-            port=port,
-            pid=pid,
-            url=self.get_url(task_id),
-        )
+        with _lock:
+            if not self.is_running(task_id):
+                return None
+
+            pid, port, _, url = _running_processes[task_id]
+            return TtydInfo(
+                task_id=task_id,
+                port=port,
+                pid=pid,
+                url=url,
+            )
 
     def list_running(self) -> list[TtydInfo]:
         """List all running ttyd instances.
@@ -237,13 +464,26 @@ class TtydService:
         Returns:
             List of TtydInfo for all running instances.
         """
-        result = []
-        # Iterate over copy to allow modification during iteration
-        for task_id in list(_running_processes.keys()):
-            info = self.get_info(task_id)
-            if info:
-                result.append(info)
-        return result
+        with _lock:
+            # Check every pidfd with a single poll() instead of one call per task
+            exited = _exited_pidfds(
+                [pidfd for _, _, pidfd, _ in _running_processes.values() if pidfd is not None]
+            )
+
+            result = []
+            # Iterate over copy to allow modification during iteration
+            for task_id, (pid, port, pidfd, url) in list(_running_processes.items()):
+                running = pidfd not in exited if pidfd is not None else _is_process_running(pid)
+                if not running:
+                    _forget(task_id)
+                    continue
+                result.append(TtydInfo(
+                    task_id=task_id,
+                    port=port,
+                    pid=pid,
+                    url=url,
+                ))
+            return result
 
     def cleanup_all(self) -> int:
         """Stop all running ttyd instances.
@@ -251,10 +491,29 @@ class TtydService:
         Returns:
             Number of instances stopped.
         """
-        logger.info(f"Cleaning up all ttyd instances ({len(_running_processes)} running)")
-        count = 0
-        for task_id in list(_running_processes.keys()):
-            if self.stop_if_running(task_id):
-                count += 1
-        logger.info(f"Cleaned up {count} ttyd instances")
-        return count
+        with _lock:
+            logger.info(f"Cleaning up all ttyd instances ({len(_running_processes)} running)")
+            running = {task_id: entry for task_id, entry in _running_processes.items()
+                       if task_id in _watchers or _is_process_running(entry[0], entry[2])}
+            for task_id in set(_running_processes) - set(running):
+                _forget(task_id)
+
+            # SIGTERM every instance's process group (each ttyd leads its own
+            # session), then wait for all of them together
+            for pid, _, _, _ in running.values():
+                _signal_group(pid, signal.SIGTERM)
+
+            pending = {pidfd: pid for pid, _, pidfd, _ in running.values() if pidfd is not None}
+            deadline = time.monotonic() + self.STOP_TIMEOUT
+            while pending and (remaining := deadline - time.monotonic()) > 0:
+                for fd in _exited_pidfds(list(pending), timeout=remaining):
+                    del pending[fd]
+
+            for pid in pending.values():
+                logger.warning(f"ttyd process {pid} ignored SIGTERM, killing it")
+                _signal_group(pid, signal.SIGKILL)
+
+            for task_id in running:
+                _forget(task_id)
+            logger.info(f"Cleaned up {len(running)} ttyd instances")
+            return len(running)
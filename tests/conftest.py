@@ -1,17 +1,22 @@
 """Pytest fixtures for Claude Session Orchestrator tests."""
 
-import os
+from __future__ import annotations
+
 import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Generator
+from typing import TYPE_CHECKING, Generator
 
 import pytest
-from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, Session, create_engine
-from sqlmodel.pool import StaticPool
+
+# FastAPI and SQLModel are imported inside the fixtures that need them, so
+# running tests that don't (e.g. tests/test_config.py) skips ~1s of imports
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+    from sqlmodel import Session
 
 # Set up test config before importing any app modules
-from config import Config, ServerConfig, DatabaseConfig, TmuxConfig, StatusPatterns, set_config
+from config import Config, ServerConfig, DatabaseConfig, TmuxConfig, StatusPatterns, default_config, set_config
 
 # Create test config with in-memory database
 _test_project_root = Path(tempfile.mkdtemp())
@@ -25,9 +30,19 @@ _test_config = Config(
 set_config(_test_config)
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    """Create a test database engine."""
+@pytest.fixture(scope="session")
+def default_cfg() -> Config:
+    """Default configuration, shared by tests that only read it."""
+    return default_config()
+
+
+@pytest.fixture(scope="session")
+def shared_engine():
+    """Create the test database engine and schema once per test session."""
+    from sqlmodel import SQLModel, create_engine
+    from sqlmodel.pool import StaticPool
+    import models  # noqa: F401  (registers the tables on SQLModel.metadata)
+
     engine = create_engine(
         "sqlite://",
         connect_args={"check_same_thread": False},
@@ -36,31 +51,91 @@ def engine_fixture():
     SQLModel.metadata.create_all(engine)
     yield engine
     SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(shared_engine):
+    """Provide the shared test engine, emptying every table after the test."""
+    from sqlmodel import SQLModel
+
+    yield shared_engine
+    with shared_engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            conn.execute(table.delete())
 
 
 @pytest.fixture(name="db")
 def db_fixture(engine) -> Generator[Session, None, None]:
     """Create a test database session."""
+    from sqlmodel import Session
+
     with Session(engine) as session:
         yield session
 
 
-@pytest.fixture(name="client")
-def client_fixture(engine) -> Generator[TestClient, None, None]:
-    """Create a test client with overridden database."""
+@asynccontextmanager
+async def _test_lifespan(app):
+    """Lifespan for tests marked no_lifespan: no startup or shutdown at all."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def app_client() -> Generator[TestClient, None, None]:
+    """Create one test client (and run the app's lifespan) for the whole test session.
+
+    Only the tmux/ttyd externals the lifespan reaches are patched: the
+    status poller it starts gets a mock detector instead of capturing
+    panes, and shutdown sees no ttyd processes rather than the fake pids
+    other tests leave tracked.
+    """
+    from unittest.mock import patch
+    from fastapi.testclient import TestClient
     from main import app
+
+    client = TestClient(app)
+    with patch("services.status_poller.get_status_detector"):
+        client.__enter__()
+    try:
+        yield client
+    finally:
+        with patch.dict("services.ttyd._running_processes", clear=True):
+            client.__exit__(None, None, None)
+
+
+@pytest.fixture(name="client")
+def client_fixture(request, engine) -> Generator[TestClient, None, None]:
+    """Provide the test client with the database overridden for this test.
+
+    Tests marked no_lifespan get a client of their own whose app skips
+    startup and shutdown.
+    """
+    from sqlmodel import Session
     from database import get_db
 
     def get_test_db():
         with Session(engine) as session:
             yield session
 
-    app.dependency_overrides[get_db] = get_test_db
-
-    with TestClient(app) as client:
+    if request.node.get_closest_marker("no_lifespan") is None:
+        client = request.getfixturevalue("app_client")
+        client.app.dependency_overrides[get_db] = get_test_db
         yield client
+        client.app.dependency_overrides.clear()
+        return
+
+    from fastapi.testclient import TestClient
+    from main import app
 
-    app.dependency_overrides.clear()
+    lifespan = app.router.lifespan_context
+    app.router.lifespan_context = _test_lifespan
+    app.dependency_overrides[get_db] = get_test_db
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        app.router.lifespan_context = lifespan
 
 
 @pytest.fixture
@@ -79,6 +154,14 @@ def temp_project_dir() -> Generator[Path, None, None]:
         yield project_path
 
 
+@pytest.fixture
+def detect_all():
+    """Build detect_statuses side effects returning one status for every task."""
+    def build(status):
+        return lambda task_ids, **kwargs: {task_id: status for task_id in task_ids}
+    return build
+
+
 @pytest.fixture
 def sample_session_data() -> dict:
     """Sample session creation data."""
@@ -15,6 +15,24 @@ class TestHealthEndpoint:
         assert response.json() == {"status": "healthy"}
 
 
+class TestLifespan:
+    """Tests for app startup and shutdown."""
+
+    def test_startup_starts_status_poller(self, client: TestClient):
+        """Test the lifespan started the (legacy mode) status poller."""
+        import services.status_poller as poller_module
+
+        assert poller_module._poller is not None
+        assert poller_module._poller._running is True
+
+    @pytest.mark.no_lifespan
+    def test_no_lifespan_client_serves_requests(self, client: TestClient):
+        """Test that tests opting out of the lifespan still get a working client."""
+        response = client.get("/health")
+
+        assert response.status_code == 200
+
+
 class TestRootEndpoint:
     """Tests for root endpoint."""
 
@@ -1,6 +1,8 @@
 """Tests for configuration module."""
 
 import re
+from collections.abc import Mapping
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 
 import pytest
@@ -11,6 +13,8 @@ from config import (
     DatabaseConfig,
     TmuxConfig,
     StatusPatterns,
+    LiteralMatcher,
+    PatternSet,
     load_config,
     default_config,
     set_config,
@@ -19,12 +23,11 @@ from config import (
 
 
 @pytest.fixture
-def reset_config():
+def reset_config(monkeypatch):
     """Reset global config after test."""
     import config
-    original = config._config
-    yield
-    config._config = original
+    # monkeypatch restores the original value when the test ends
+    monkeypatch.setattr(config, "_config", config._config)
 
 
 class TestConfigDefaults:
@@ -35,119 +38,138 @@ class TestConfigDefaults:
         cfg = default_config()
         assert isinstance(cfg, Config)
 
-    def test_session_prefix_default(self):
+    def test_session_prefix_default(self, default_cfg):
         """Test default session prefix."""
-        cfg = default_config()
-        assert cfg.tmux.session_prefix == "claude"
+        assert default_cfg.tmux.session_prefix == "claude"
 
-    def test_poll_interval_default(self):
+    def test_poll_interval_default(self, default_cfg):
         """Test default poll interval."""
-        cfg = default_config()
-        assert cfg.tmux.poll_interval == 1.0
+        assert default_cfg.tmux.poll_interval == 1.0
 
-    def test_host_default(self):
+    def test_host_default(self, default_cfg):
         """Test default host."""
-        cfg = default_config()
-        assert cfg.server.host == "127.0.0.1"
+        assert default_cfg.server.host == "127.0.0.1"
 
-    def test_port_default(self):
+    def test_port_default(self, default_cfg):
         """Test default port."""
-        cfg = default_config()
-        assert cfg.server.port == 8000
+        assert default_cfg.server.port == 8000
 
-    def test_editor_default(self):
+    def test_editor_default(self, default_cfg):
         """Test default editor."""
-        cfg = default_config()
-        assert cfg.editor == "vim"
+        assert default_cfg.editor == "vim"
 
 
 class TestDocumentPatterns:
     """Tests for document discovery patterns."""
 
-    def test_document_patterns_exist(self):
+    def test_document_patterns_exist(self, default_cfg):
         """Test document patterns are defined."""
-        cfg = default_config()
-        assert isinstance(cfg.document_patterns, list)
-        assert len(cfg.document_patterns) > 0
+        assert isinstance(default_cfg.document_patterns, list)
+        assert len(default_cfg.document_patterns) > 0
 
-    def test_markdown_pattern_included(self):
+    def test_markdown_pattern_included(self, default_cfg):
         """Test markdown patterns are included."""
-        cfg = default_config()
-        assert "*.md" in cfg.document_patterns
+        assert "*.md" in default_cfg.document_patterns
 
-    def test_docs_pattern_included(self):
+    def test_docs_pattern_included(self, default_cfg):
         """Test docs directory pattern is included."""
-        cfg = default_config()
-        assert "docs/**/*.md" in cfg.document_patterns
+        assert "docs/**/*.md" in default_cfg.document_patterns
 
 
 class TestStatusPatterns:
     """Tests for status detection patterns."""
 
-    def test_status_patterns_exist(self):
+    def test_status_patterns_exist(self, default_cfg):
         """Test status patterns are defined."""
-        cfg = default_config()
-        assert isinstance(cfg.status_patterns, StatusPatterns)
-        assert len(cfg.status_patterns.idle) > 0
-        assert len(cfg.status_patterns.waiting) > 0
+        assert isinstance(default_cfg.status_patterns, StatusPatterns)
+        assert len(default_cfg.status_patterns.idle) > 0
+        assert len(default_cfg.status_patterns.waiting) > 0
 
-    def test_idle_patterns(self):
+    def test_idle_patterns(self, default_cfg):
         """Test idle patterns are valid regex."""
-        cfg = default_config()
-        for pattern in cfg.status_patterns.idle:
+        for pattern in default_cfg.status_patterns.idle:
             # Should compile without error
             re.compile(pattern)
 
-    def test_waiting_patterns(self):
+    def test_waiting_patterns(self, default_cfg):
         """Test waiting patterns are valid regex."""
-        cfg = default_config()
-        for pattern in cfg.status_patterns.waiting:
+        for pattern in default_cfg.status_patterns.waiting:
             # Should compile without error
             re.compile(pattern)
 
-    def test_idle_pattern_matches_prompt(self):
+    @pytest.mark.parametrize("text", [
+        ">",
+        "> ",
+        "claude>",
+        "claude> ",
+    ])
+    def test_idle_pattern_matches_prompt(self, default_cfg, text):
         """Test idle patterns match expected prompts."""
-        cfg = default_config()
-        test_cases = [
-            ">",
-            "> ",
-            "claude>",
-            "claude> ",
-        ]
-
-        for text in test_cases:
-            matched = any(
-                re.search(pattern, text)
-                for pattern in cfg.status_patterns.idle
-            )
-            assert matched, f"Idle pattern should match: {text!r}"
-
-    def test_waiting_pattern_matches_prompts(self):
+        assert default_cfg.status_patterns.idle_combined.search(text) is not None
+
+    @pytest.mark.parametrize("text", [
+        "Allow write? (y/n)",
+        "Do you want to proceed?",
+        "Allow?",
+        "Continue?",
+        "Press Enter to confirm",
+    ])
+    def test_waiting_pattern_matches_prompts(self, default_cfg, text):
         """Test waiting patterns match expected prompts."""
-        cfg = default_config()
-        test_cases = [
-            "Allow write? (y/n)",
-            "Do you want to proceed?",
-            "Allow?",
-            "Continue?",
-            "Press Enter to confirm",
-        ]
-
-        for text in test_cases:
-            matched = any(
-                re.search(pattern, text)
-                for pattern in cfg.status_patterns.waiting
-            )
-            assert matched, f"Waiting pattern should match: {text!r}"
+        assert default_cfg.status_patterns.waiting_combined.search(text) is not None
+
+    def test_literal_patterns_use_substring_matcher(self, default_cfg):
+        """Test that plain-text patterns skip the regex engine."""
+        combined = default_cfg.status_patterns.waiting_combined
+        assert isinstance(combined, LiteralMatcher)
+        assert "(y/n)" in combined.literals
+        assert combined.search("Allow write? (y/n)") is not None
+        assert combined.search("nothing to see") is None
+
+    def test_regex_patterns_are_not_literal(self):
+        """Test that patterns with regex syntax keep a compiled regex."""
+        patterns = StatusPatterns(idle=[r">\s*$"], waiting=[r"Allow\?", r"a.b"])
+        assert not isinstance(patterns.idle_combined, LiteralMatcher)
+        assert not isinstance(patterns.waiting_combined, LiteralMatcher)
+        assert patterns.waiting_combined.search("axb")
+
+    def test_combined_pattern_uses_re2_when_installed(self):
+        """Test that RE2 is used when available, with re for what it can't handle."""
+        pytest.importorskip("re2")
+        patterns = StatusPatterns(idle=[r">\s*$"], waiting=[r"(a)\1"])
+        assert not isinstance(patterns.idle_combined, re.Pattern)
+        assert patterns.idle_combined.search("claude> ")
+        # Backreferences are unsupported in RE2 (and can't be combined)
+        assert isinstance(patterns.waiting_combined, PatternSet)
+
+    def test_inline_flag_patterns_are_matched_separately(self):
+        """Test that a pattern with an inline global flag still compiles and matches."""
+        patterns = StatusPatterns(idle=[r"(?i)idle", r">\s*$"], waiting=[])
+        assert isinstance(patterns.idle_combined, PatternSet)
+        assert patterns.idle_combined.search("IDLE")
+        assert patterns.idle_combined.search("claude> ")
+        assert patterns.idle_combined.search("busy") is None
+
+    def test_backreference_patterns_keep_their_own_groups(self):
+        """Test that numbered backreferences aren't shifted by other patterns' groups."""
+        patterns = StatusPatterns(idle=[], waiting=[r"(x)y", r"(a)\1"])
+        assert isinstance(patterns.waiting_combined, PatternSet)
+        assert patterns.waiting_combined.search("aa")
+        assert patterns.waiting_combined.search("ax") is None
+
+    def test_combined_pattern_empty(self):
+        """Test that no patterns give no combined pattern (not a match-all)."""
+        patterns = StatusPatterns(idle=[], waiting=[])
+        assert patterns.idle_combined is None
+        assert patterns.waiting_combined is None
 
 
 class TestProjectRoot:
     """Tests for PROJECT_ROOT configuration."""
 
-    def test_project_root_is_path(self):
+    def test_project_root_is_path(self, default_cfg):
         """Test project_root is a Path object."""
-        cfg = default_config()
-        assert isinstance(cfg.project_root, Path)
+        assert isinstance(default_cfg.project_root, Path)
 
     def test_project_root_from_load_config(self, tmp_path):
         """Test project_root is set from load_config argument."""
@@ -209,6 +231,19 @@ port = 8080
         assert cfg.server.host == "127.0.0.1"  # default
         assert cfg.tmux.session_prefix == "claude"  # default
 
+    def test_load_config_rereads_changed_file(self, tmp_path):
+        """Test that repeated loads share one config until the file changes."""
+        config_file = tmp_path / "chorus.toml"
+        config_file.write_text('[server]\nport = 9000\n')
+
+        first = load_config(config_file, project_root=tmp_path)
+        assert load_config(config_file, project_root=tmp_path) is first
+        with pytest.raises(FrozenInstanceError):
+            first.server.port = 1234
+
+        config_file.write_text('[server]\nport = 19001\n')
+        assert load_config(config_file, project_root=tmp_path).server.port == 19001
+
     def test_load_config_file_not_found(self, tmp_path):
         """Test loading non-existent config raises error."""
         with pytest.raises(FileNotFoundError):
@@ -243,4 +278,8 @@ class TestGlobalConfig:
         assert config.POLL_INTERVAL == 1.0
         assert config.EDITOR == "vim"
         assert isinstance(config.DOCUMENT_PATTERNS, list)
-        assert isinstance(config.STATUS_PATTERNS, dict)
+        assert isinstance(config.STATUS_PATTERNS, Mapping)
+        assert config.STATUS_PATTERNS is config.STATUS_PATTERNS
+        assert config.STATUS_PATTERNS["idle"] == tuple(cfg.status_patterns.idle)
+        with pytest.raises(TypeError):
+            config.STATUS_PATTERNS["idle"] = ()
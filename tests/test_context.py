@@ -1,5 +1,6 @@
 """Tests for the context service."""
 
+import os
 import pytest
 from pathlib import Path
 import tempfile
@@ -17,6 +18,16 @@ from services.context import (
 )
 
 
+@pytest.fixture
+def fresh_task_id():
+    """A task ID with no context on disk, cleaned up after the test."""
+    # High ID to avoid real tasks, per process so parallel workers don't collide
+    task_id = 90000 + os.getpid() % 10000
+    cleanup_task_context(task_id)
+    yield task_id
+    cleanup_task_context(task_id)
+
+
 class TestGetContextPaths:
     """Tests for context path helpers."""
 
@@ -98,38 +109,40 @@ class TestBuildTaskContext:
         assert "task-5-add-dark-mode" not in context
 
 
-class TestWriteTaskContext:
-    """Tests for writing context to files."""
+    def test_context_rebuilt_when_task_changes(self):
+        """Test that cached contexts follow edits to the task."""
+        task = Task(id=7, title="Cache me", description="First")
+        assert build_task_context(task) is build_task_context(task)
 
-    def setup_method(self):
-        """Clean up any existing test context before each test."""
-        self.test_task_id = 99999  # Use high ID to avoid conflicts
-        cleanup_task_context(self.test_task_id)
+        task.description = "Second"
+        context = build_task_context(task)
+        assert "Second" in context
+        assert "First" not in context
 
-    def teardown_method(self):
-        """Clean up test context after each test."""
-        cleanup_task_context(self.test_task_id)
 
-    def test_write_creates_directory(self):
+class TestWriteTaskContext:
+    """Tests for writing context to files."""
+
+    def test_write_creates_directory(self, fresh_task_id):
         """Test that write creates the context directory."""
-        task = Task(id=self.test_task_id, title="Test task")
+        task = Task(id=fresh_task_id, title="Test task")
         context_file = write_task_context(task)
 
         assert context_file.parent.exists()
-        assert context_file.parent == get_context_dir(self.test_task_id)
+        assert context_file.parent == get_context_dir(fresh_task_id)
 
-    def test_write_creates_file(self):
+    def test_write_creates_file(self, fresh_task_id):
         """Test that write creates the context file."""
-        task = Task(id=self.test_task_id, title="Test task")
+        task = Task(id=fresh_task_id, title="Test task")
         context_file = write_task_context(task)
 
         assert context_file.exists()
         assert context_file.name == "context.md"
 
-    def test_write_content_correct(self):
+    def test_write_content_correct(self, fresh_task_id):
         """Test that written content is correct."""
         task = Task(
-            id=self.test_task_id,
+            id=fresh_task_id,
             title="Test task",
             description="Test description",
         )
@@ -140,9 +153,9 @@ class TestWriteTaskContext:
         assert "Test description" in content
         assert "Extra instructions" in content
 
-    def test_write_overwrites_existing(self):
+    def test_write_overwrites_existing(self, fresh_task_id):
         """Test that write overwrites existing file."""
-        task = Task(id=self.test_task_id, title="First title")
+        task = Task(id=fresh_task_id, title="First title")
         write_task_context(task)
 
         task.title = "Second title"
@@ -156,43 +169,42 @@ class TestWriteTaskContext:
 class TestCleanupTaskContext:
     """Tests for context cleanup."""
 
-    def test_cleanup_removes_directory(self):
+    def test_cleanup_removes_directory(self, fresh_task_id):
         """Test that cleanup removes the context directory."""
-        task_id = 99998
-        task = Task(id=task_id, title="Test")
+        task = Task(id=fresh_task_id, title="Test")
         write_task_context(task)
 
-        assert get_context_dir(task_id).exists()
+        assert get_context_dir(fresh_task_id).exists()
+
+        cleanup_task_context(fresh_task_id)
+
+        assert not get_context_dir(fresh_task_id).exists()
 
-        cleanup_task_context(task_id)
+    def test_cleanup_removes_extra_files(self, fresh_task_id):
+        """Test that cleanup also removes files besides the context file."""
+        write_task_context(Task(id=fresh_task_id, title="Test"))
+        (get_context_dir(fresh_task_id) / "notes.txt").write_text("extra")
 
-        assert not get_context_dir(task_id).exists()
+        cleanup_task_context(fresh_task_id)
 
-    def test_cleanup_nonexistent_is_safe(self):
+        assert not get_context_dir(fresh_task_id).exists()
+
+    def test_cleanup_nonexistent_is_safe(self, fresh_task_id):
         """Test that cleanup on non-existent directory is safe."""
         # Should not raise
-        cleanup_task_context(99997)
+        cleanup_task_context(fresh_task_id)
 
 
 class TestContextExists:
     """Tests for context existence check."""
 
-    def setup_method(self):
-        """Clean up test context."""
-        self.test_task_id = 99996
-        cleanup_task_context(self.test_task_id)
-
-    def teardown_method(self):
-        """Clean up test context."""
-        cleanup_task_context(self.test_task_id)
-
-    def test_exists_when_written(self):
+    def test_exists_when_written(self, fresh_task_id):
         """Test that context_exists returns True when file exists."""
-        task = Task(id=self.test_task_id, title="Test")
+        task = Task(id=fresh_task_id, title="Test")
         write_task_context(task)
 
-        assert context_exists(self.test_task_id) is True
+        assert context_exists(fresh_task_id) is True
 
-    def test_not_exists_when_not_written(self):
+    def test_not_exists_when_not_written(self, fresh_task_id):
         """Test that context_exists returns False when file doesn't exist."""
-        assert context_exists(self.test_task_id) is False
+        assert context_exists(fresh_task_id) is False
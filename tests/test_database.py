@@ -1,8 +1,11 @@
 """Tests for database module."""
 
-from sqlmodel import Session, select
+import pytest
+from sqlalchemy import event, inspect, text
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.pool import StaticPool
 
-from database import create_db_and_tables, get_db, get_engine
+from database import _pool_options, _set_sqlite_pragmas, create_db_and_tables, db_session, get_engine
 from models import Task, Document, DocumentReference
 
 
@@ -11,45 +14,84 @@ class TestDatabaseSetup:
 
     def test_create_db_and_tables(self):
         """Test database tables are created."""
-        # Should not raise any errors
         create_db_and_tables()
 
+        # The app engine is in-memory SQLite on one shared connection, so this sees the tables
+        assert set(SQLModel.metadata.tables) <= set(inspect(get_engine()).get_table_names())
+
     def test_engine_exists(self):
         """Test database engine is configured."""
         engine = get_engine()
         assert engine is not None
 
 
+class TestPoolOptions:
+    """Tests for connection pool configuration."""
+
+    def test_file_database_uses_lifo_queue_pool(self):
+        """Test file-backed databases get tuned queue pool options."""
+        options = _pool_options("sqlite:///orchestrator.db")
+        assert options["pool_use_lifo"] is True
+        assert options["pool_pre_ping"] is True
+        assert options["pool_size"] == 10
+
+    def test_memory_database_shares_one_connection(self):
+        """Test in-memory SQLite uses one connection shared by all threads."""
+        for url in ("sqlite://", "sqlite:///:memory:"):
+            options = _pool_options(url)
+            assert options["poolclass"] is StaticPool
+            assert options["connect_args"] == {"check_same_thread": False}
+            assert "pool_recycle" not in options
+            assert "pool_use_lifo" not in options
+
+
+class TestSqlitePragmas:
+    """Tests for SQLite connection tuning."""
+
+    def test_file_database_uses_wal(self, tmp_path):
+        """Test new connections switch to WAL with relaxed syncing."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            # NORMAL == 1
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        engine.dispose()
+
+
 class TestGetDbDependency:
     """Tests for FastAPI database dependency."""
 
     def test_get_db_yields_session(self):
         """Test get_db yields a valid session."""
-        gen = get_db()
-        session = next(gen)
-
-        assert isinstance(session, Session)
-
-        # Cleanup
-        try:
-            next(gen)
-        except StopIteration:
-            pass
+        with db_session() as session:
+            assert isinstance(session, Session)
 
     def test_get_db_session_is_usable(self):
         """Test yielded session can execute queries."""
-        gen = get_db()
-        session = next(gen)
+        with db_session() as session:
+            # Should be able to execute a simple query
+            result = session.exec(select(Task)).all()
+            assert isinstance(result, list)
+
+
+@pytest.fixture
+def sample_task(db: Session) -> Task:
+    """A task row, flushed so it has an ID (the db fixture empties tables)."""
+    task = Task(title="Fixture Task")
+    db.add(task)
+    db.flush()
+    return task
 
-        # Should be able to execute a simple query
-        result = session.exec(select(Task)).all()
-        assert isinstance(result, list)
 
-        # Cleanup
-        try:
-            next(gen)
-        except StopIteration:
-            pass
+@pytest.fixture
+def sample_document(db: Session) -> Document:
+    """A document row, flushed so it has an ID."""
+    document = Document(path="fixture.md")
+    db.add(document)
+    db.flush()
+    return document
 
 
 class TestDatabaseOperations:
@@ -66,61 +108,41 @@ class TestDatabaseOperations:
         assert result is not None
         assert result.title == "DB Test Task"
 
-    def test_update_task(self, db: Session):
+    def test_update_task(self, db: Session, sample_task: Task):
         """Test updating a task."""
-        task = Task(title="Original Title")
-        db.add(task)
-        db.commit()
-        db.refresh(task)
+        sample_task.title = "Updated Title"
+        db.add(sample_task)
+        db.flush()
+        db.refresh(sample_task)
 
-        task.title = "Updated Title"
-        db.add(task)
-        db.commit()
-        db.refresh(task)
+        assert sample_task.title == "Updated Title"
 
-        assert task.title == "Updated Title"
-
-    def test_delete_task(self, db: Session):
+    def test_delete_task(self, db: Session, sample_task: Task):
         """Test deleting a task."""
-        task = Task(title="To Delete")
-        db.add(task)
-        db.commit()
-        db.refresh(task)
-
-        task_id = task.id
-        db.delete(task)
-        db.commit()
+        task_id = sample_task.id
+        db.delete(sample_task)
+        db.flush()
 
         result = db.get(Task, task_id)
         assert result is None
 
-    def test_foreign_key_relationship(self, db: Session):
+    def test_foreign_key_relationship(self, db: Session, sample_task: Task, sample_document: Document):
         """Test foreign key between DocumentReference and Document/Task."""
-        doc = Document(path="fk_test.md")
-        task = Task(title="FK Test Task")
-        db.add(doc)
-        db.add(task)
-        db.commit()
-        db.refresh(doc)
-        db.refresh(task)
-
         ref = DocumentReference(
-            document_id=doc.id,
-            task_id=task.id,
+            document_id=sample_document.id,
+            task_id=sample_task.id,
             start_line=1,
             end_line=10,
         )
         db.add(ref)
-        db.commit()
-        db.refresh(ref)
+        db.flush()
 
         # Verify relationships
-        assert ref.document_id == doc.id
-        assert ref.task_id == task.id
+        assert ref.document_id == sample_document.id
+        assert ref.task_id == sample_task.id
 
     def test_unique_document_path(self, db: Session):
         """Test document path uniqueness constraint."""
-        import pytest
         from sqlalchemy.exc import IntegrityError
 
         doc1 = Document(path="unique_test.md")
@@ -147,8 +169,7 @@ class TestDatabaseOperations:
         db.commit()
 
         result = db.exec(select(Task).order_by(Task.priority)).all()
-        assert len(result) >= 3
+        assert len(result) == 3
 
         # Check ordering
-        priorities = [t.priority for t in result if t.priority in [1, 2, 3]]
-        assert priorities == sorted(priorities)
+        assert [t.priority for t in result] == [1, 2, 3]
@@ -1,9 +1,10 @@
 """Tests for error handling functionality."""
 
 import pytest
-from unittest.mock import Mock, patch
-from sqlmodel import Session, create_engine, SQLModel
+from unittest.mock import create_autospec, patch
+from sqlmodel import Session
 
+from services import context, error_handler
 from services.error_handler import (
     ServiceError,
     RecoverableError,
@@ -11,35 +12,32 @@ from services.error_handler import (
     TaskRecovery,
     log_service_error,
 )
-from services.tmux import SessionNotFoundError, SessionExistsError
+from services.tmux import SessionNotFoundError, SessionExistsError, TmuxService
 from services.gitbutler import GitButlerError, StackExistsError
 from models import Task, TaskStatus, ClaudeStatus
 
+# Built once: autospec checks call signatures against the real TmuxService
+_TMUX_SPEC = create_autospec(TmuxService, instance=True)
+
 
 @pytest.fixture
-def db_session():
-    """Create an in-memory database for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
+def db_session(db):
+    """Session on the shared test database (schema built once, see conftest.py)."""
+    return db
 
 
 class TestExceptionClasses:
     """Test custom exception classes."""
 
-    def test_service_error(self):
-        error = ServiceError("test error")
+    @pytest.mark.parametrize("cls, parent", [
+        (ServiceError, Exception),
+        (RecoverableError, ServiceError),
+        (UnrecoverableError, ServiceError),
+    ])
+    def test_exception_hierarchy(self, cls, parent):
+        error = cls("test error")
         assert str(error) == "test error"
-        assert isinstance(error, Exception)
-
-    def test_recoverable_error(self):
-        error = RecoverableError("recoverable")
-        assert isinstance(error, ServiceError)
-
-    def test_unrecoverable_error(self):
-        error = UnrecoverableError("unrecoverable")
-        assert isinstance(error, ServiceError)
+        assert isinstance(error, parent)
 
 
 class TestLogServiceError:
@@ -57,12 +55,8 @@ class TestLogServiceError:
         log_service_error("tmux", "create_session", error, task_id=123)
 
         # Check that task_id is included in the log record
-        for record in caplog.records:
-            if "task_id" in record.__dict__:
-                assert record.__dict__["task_id"] == 123
-                break
-        else:
-            pytest.fail("task_id not found in log record")
+        (record,) = caplog.records
+        assert record.task_id == 123
 
     def test_log_with_extra_context(self, caplog):
         error = ValueError("test error")
@@ -70,73 +64,58 @@ class TestLogServiceError:
         log_service_error("gitbutler", "commit", error, extra=extra)
 
         # Check that extra context is included
-        for record in caplog.records:
-            if "session_id" in record.__dict__:
-                assert record.__dict__["session_id"] == "tmux-1"
-                assert record.__dict__["attempt"] == 2
-                break
-        else:
-            pytest.fail("extra context not found in log record")
+        (record,) = caplog.records
+        assert record.session_id == "tmux-1"
+        assert record.attempt == 2
 
 
 class TestTaskRecovery:
     """Test task recovery functionality."""
 
-    def test_recover_from_tmux_failure_session_not_exists(self, db_session):
-        """Test recovery when tmux session doesn't exist."""
-        task = Task(title="Test Task", status=TaskStatus.running)
-        db_session.add(task)
-        db_session.commit()
-        db_session.refresh(task)
-
-        with patch("services.error_handler.TmuxService") as mock_tmux:
-            mock_tmux.return_value.session_exists.return_value = False
-
-            result = TaskRecovery.recover_from_tmux_failure(task, db_session)
-
-            assert result is False
-            assert task.status == TaskStatus.failed
-            assert task.claude_status == ClaudeStatus.stopped
-            assert "tmux session not found" in task.result
-
-    def test_recover_from_tmux_failure_restart_success(self, db_session):
-        """Test successful recovery by restarting Claude."""
-        task = Task(title="Test Task", status=TaskStatus.running)
-        db_session.add(task)
-        db_session.commit()
-        db_session.refresh(task)
-
-        with patch("services.error_handler.TmuxService") as mock_tmux, \
-             patch("services.context.get_context_file") as mock_context:
-            mock_tmux.return_value.session_exists.return_value = True
-            mock_context.return_value = "/tmp/context.txt"
-
-            result = TaskRecovery.recover_from_tmux_failure(task, db_session)
-
-            assert result is True
-            assert task.claude_status == ClaudeStatus.starting
-            assert task.claude_restarts > 0
-            mock_tmux.return_value.restart_claude.assert_called_once()
-
-    def test_recover_from_tmux_failure_restart_fails(self, db_session):
-        """Test recovery failure when restart fails."""
-        task = Task(title="Test Task", status=TaskStatus.running)
-        db_session.add(task)
-        db_session.commit()
-        db_session.refresh(task)
-
-        with patch("services.error_handler.TmuxService") as mock_tmux, \
-             patch("services.context.get_context_file") as mock_context:
-            mock_tmux.return_value.session_exists.return_value = True
-            mock_tmux.return_value.restart_claude.side_effect = Exception("Restart failed")
+    @pytest.fixture
+    def mock_tmux(self, monkeypatch):
+        """The TmuxService instance TaskRecovery creates, as a mock."""
+        _TMUX_SPEC.reset_mock(return_value=True, side_effect=True)
+        monkeypatch.setattr(error_handler, "TmuxService", lambda: _TMUX_SPEC)
+        return _TMUX_SPEC
+
+    @pytest.mark.parametrize(
+        "session_exists, restart_error, recovered, status, claude_status, result",
+        [
+            (False, None, False, TaskStatus.failed, ClaudeStatus.stopped, "tmux session not found"),
+            (True, None, True, TaskStatus.running, ClaudeStatus.starting, None),
+            (True, Exception("Restart failed"), False, TaskStatus.failed, ClaudeStatus.stopped,
+             "could not restart Claude"),
+        ],
+        ids=["session-missing", "restart-succeeds", "restart-fails"],
+    )
+    def test_recover_from_tmux_failure(
+        self, mock_tmux,
+        session_exists, restart_error, recovered, status, claude_status, result,
+    ):
+        """Test recovery for each outcome of checking and restarting Claude."""
+        # Recovery only updates the task it is given, so no database is needed
+        task = Task(id=1, title="Test Task", status=TaskStatus.running)
+        db = create_autospec(Session, instance=True)
+
+        mock_tmux.session_exists.return_value = session_exists
+        mock_tmux.restart_claude.side_effect = restart_error
+
+        with patch.object(context, "get_context_file") as mock_context:
             mock_context.return_value = "/tmp/context.txt"
 
-            result = TaskRecovery.recover_from_tmux_failure(task, db_session)
+            assert TaskRecovery.recover_from_tmux_failure(task, db) is recovered
 
-            assert result is False
-            assert task.status == TaskStatus.failed
-            assert task.claude_status == ClaudeStatus.stopped
-            assert "could not restart Claude" in task.result
+        db.add.assert_called_once_with(task)
+        db.commit.assert_called_once()
+        assert task.status == status
+        assert task.claude_status == claude_status
+        if result is not None:
+            assert result in task.result
+        if session_exists:
+            mock_tmux.restart_claude.assert_called_once()
+            if recovered:
+                assert task.claude_restarts > 0
 
     def test_detect_hanging_tasks(self, db_session):
         """Test detection of hanging tasks."""
@@ -146,7 +125,7 @@ class TestTaskRecovery:
         task3 = Task(title="Completed", status=TaskStatus.completed)
 
         db_session.add_all([task1, task2, task3])
-        db_session.commit()
+        db_session.flush()
 
         # Detect hanging tasks (for now, just checks they exist)
         hanging = TaskRecovery.detect_hanging_tasks(db_session)
@@ -154,7 +133,7 @@ class TestTaskRecovery:
         # The function returns empty list for now (just logs warnings)
         assert isinstance(hanging, list)
 
-    def test_cleanup_orphaned_sessions(self, db_session):
+    def test_cleanup_orphaned_sessions(self, db_session, mock_tmux):
         """Test cleanup of orphaned tmux sessions."""
         # Create a completed task (shouldn't have active session)
         task = Task(
@@ -163,34 +142,32 @@ class TestTaskRecovery:
             tmux_session="chorus-task-1",
         )
         db_session.add(task)
-        db_session.commit()
+        db_session.flush()
 
-        with patch("services.error_handler.TmuxService") as mock_tmux:
-            # Simulate orphaned session exists in tmux
-            mock_tmux.return_value.list_task_sessions.return_value = [1]
+        # Simulate orphaned session exists in tmux
+        mock_tmux.list_task_sessions.return_value = [1]
 
-            cleaned = TaskRecovery.cleanup_orphaned_sessions(db_session)
+        cleaned = TaskRecovery.cleanup_orphaned_sessions(db_session)
 
-            assert cleaned == 1
-            mock_tmux.return_value.kill_task_session.assert_called_once_with(1)
+        assert cleaned == 1
+        mock_tmux.kill_task_session.assert_called_once_with(1)
 
-    def test_cleanup_orphaned_sessions_handles_errors(self, db_session):
+    def test_cleanup_orphaned_sessions_handles_errors(self, db_session, mock_tmux):
         """Test cleanup handles errors gracefully."""
-        with patch("services.error_handler.TmuxService") as mock_tmux:
-            # Simulate orphaned session that fails to kill
-            mock_tmux.return_value.list_task_sessions.return_value = [1, 2]
-            mock_tmux.return_value.kill_task_session.side_effect = [
-                None,  # First succeeds
-                Exception("Kill failed"),  # Second fails
-            ]
+        # Simulate orphaned session that fails to kill
+        mock_tmux.list_task_sessions.return_value = [1, 2]
+        mock_tmux.kill_task_session.side_effect = [
+            None,  # First succeeds
+            Exception("Kill failed"),  # Second fails
+        ]
 
-            cleaned = TaskRecovery.cleanup_orphaned_sessions(db_session)
+        cleaned = TaskRecovery.cleanup_orphaned_sessions(db_session)
 
-            # Should have cleaned 1 out of 2
-            assert cleaned == 1
-            assert mock_tmux.return_value.kill_task_session.call_count == 2
+        # Should have cleaned 1 out of 2
+        assert cleaned == 1
+        assert mock_tmux.kill_task_session.call_count == 2
 
-    def test_cleanup_no_orphaned_sessions(self, db_session):
+    def test_cleanup_no_orphaned_sessions(self, db_session, mock_tmux):
         """Test cleanup when there are no orphaned sessions."""
         # Create a running task
         task = Task(
@@ -199,14 +176,12 @@ class TestTaskRecovery:
             tmux_session="chorus-task-1",
         )
         db_session.add(task)
-        db_session.commit()
-        db_session.refresh(task)
+        db_session.flush()
 
-        with patch("services.error_handler.TmuxService") as mock_tmux:
-            # Same task in both DB and tmux - no orphans
-            mock_tmux.return_value.list_task_sessions.return_value = [task.id]
+        # Same task in both DB and tmux - no orphans
+        mock_tmux.list_task_sessions.return_value = [task.id]
 
-            cleaned = TaskRecovery.cleanup_orphaned_sessions(db_session)
+        cleaned = TaskRecovery.cleanup_orphaned_sessions(db_session)
 
-            assert cleaned == 0
-            mock_tmux.return_value.kill_task_session.assert_not_called()
+        assert cleaned == 0
+        mock_tmux.kill_task_session.assert_not_called()
@@ -3,7 +3,6 @@
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from uuid import UUID
-from sqlmodel import Session, create_engine, SQLModel
 
 from models import Task, TaskStatus, ClaudeStatus
 from services.json_monitor import JsonMonitor
@@ -16,15 +15,6 @@ from services.gitbutler import GitButlerService
 TEST_TASK_ID = UUID("12345678-1234-5678-1234-567812345678")
 
 
-@pytest.fixture
-def db():
-    """Create an in-memory database for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
-
 @pytest.fixture
 def mock_tmux():
     """Create a mock TmuxService."""
@@ -144,6 +144,18 @@ class TestNotifierService:
 class TestConvenienceMethods:
     """Test convenience methods for common notifications."""
 
+    def test_send_async_returns_future(self):
+        """Test that send_async runs send() in the background pool."""
+        notifier = NotifierService()
+
+        with patch.object(notifier, "send", return_value=True) as mock_send:
+            future = notifier.send_async("Test", "Message")
+
+            assert future.result(timeout=5) is True
+            mock_send.assert_called_once_with("Test", "Message", NotificationLevel.INFO, False)
+
+        notifier.close()
+
     @patch("platform.system")
     def test_task_started(self, mock_platform):
         """Test task started notification."""
@@ -153,7 +165,7 @@ class TestConvenienceMethods:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
 
-            result = notifier.task_started(123, "Test Task")
+            result = notifier.task_started(123, "Test Task").result()
 
             assert result is True
             args = mock_run.call_args[0][0]
@@ -170,7 +182,7 @@ class TestConvenienceMethods:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
 
-            result = notifier.task_completed(123, "Test Task")
+            result = notifier.task_completed(123, "Test Task").result()
 
             assert result is True
             args = mock_run.call_args[0][0]
@@ -188,7 +200,7 @@ class TestConvenienceMethods:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
 
-            result = notifier.task_failed(123, "Test Task", "Error occurred")
+            result = notifier.task_failed(123, "Test Task", "Error occurred").result()
 
             assert result is True
             args = mock_run.call_args[0][0]
@@ -207,7 +219,7 @@ class TestConvenienceMethods:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
 
-            result = notifier.task_failed(123, "Test Task")
+            result = notifier.task_failed(123, "Test Task").result()
 
             assert result is True
             args = mock_run.call_args[0][0]
@@ -223,7 +235,7 @@ class TestConvenienceMethods:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
 
-            result = notifier.claude_idle(123, "Test Task")
+            result = notifier.claude_idle(123, "Test Task").result()
 
             assert result is True
             args = mock_run.call_args[0][0]
@@ -239,7 +251,7 @@ class TestConvenienceMethods:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
 
-            result = notifier.permission_requested(123, "Test Task")
+            result = notifier.permission_requested(123, "Test Task").result()
 
             assert result is True
             args = mock_run.call_args[0][0]
@@ -257,7 +269,7 @@ class TestConvenienceMethods:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0)
 
-            result = notifier.claude_crashed(123, "Test Task")
+            result = notifier.claude_crashed(123, "Test Task").result()
 
             assert result is True
             args = mock_run.call_args[0][0]
@@ -5,7 +5,7 @@ from unittest.mock import MagicMock, patch
 
 from models import ClaudeStatus
 from services.status_detector import StatusDetector
-from services.tmux import SessionNotFoundError
+from services.tmux import PaneSignature, SessionNotFoundError
 
 
 class TestStatusDetector:
@@ -91,6 +91,93 @@ class TestStatusDetector:
         status = detector.detect_status(task_id=1)
         assert status == ClaudeStatus.waiting
 
+    def test_detect_with_inline_flag_pattern(self):
+        """Test that a configured (?i) pattern doesn't break building the detector."""
+        from dataclasses import replace
+        from config import StatusPatterns, get_config, set_config
+
+        original = get_config()
+        patterns = StatusPatterns(
+            idle=[r"(?i)ready", r">\s*$"], waiting=list(original.status_patterns.waiting)
+        )
+        try:
+            set_config(replace(original, status_patterns=patterns))
+            detector = StatusDetector()
+        finally:
+            set_config(original)
+
+        detector.tmux.capture_output = MagicMock(return_value="Done\nREADY")
+        assert detector.detect_status(task_id=1) == ClaudeStatus.idle
+
+    def test_detectors_share_compiled_patterns(self):
+        """Test that patterns are compiled once and shared between detectors."""
+        first = StatusDetector()
+        second = StatusDetector()
+
+        assert first._idle_re is second._idle_re
+        assert first._waiting_re is second._waiting_re
+
+    def test_unchanged_output_reuses_cached_status(self):
+        """Test that identical terminal tails skip pattern matching."""
+        detector = StatusDetector()
+
+        detector.tmux.capture_output = MagicMock(return_value="Thinking...")
+
+        with patch.object(detector, "_match_status", wraps=detector._match_status) as mock_match:
+            assert detector.detect_status(task_id=1) == ClaudeStatus.busy
+            assert detector.detect_status(task_id=1) == ClaudeStatus.busy
+            assert mock_match.call_count == 1
+
+            # Changed output is re-scanned
+            detector.tmux.capture_output.return_value = "Done\n> "
+            assert detector.detect_status(task_id=1) == ClaudeStatus.idle
+            assert mock_match.call_count == 2
+
+    def test_detect_statuses_uses_bulk_capture(self):
+        """Test detecting several tasks from one bulk capture."""
+        detector = StatusDetector()
+
+        detector.tmux.pane_signatures = MagicMock(return_value={
+            task_id: PaneSignature(100, 0, 0, task_id) for task_id in (1, 2, 3)
+        })
+        detector.tmux.capture_outputs = MagicMock(return_value={
+            1: "Done\n> ",
+            2: "Allow write? (y/n)",
+            3: "Thinking...",
+        })
+
+        statuses = detector.detect_statuses([1, 2, 3, 4], lines=40)
+
+        assert statuses == {
+            1: ClaudeStatus.idle,
+            2: ClaudeStatus.waiting,
+            3: ClaudeStatus.busy,
+            4: None,  # Session not found
+        }
+        detector.tmux.capture_outputs.assert_called_once_with(
+            [1, 2, 3], lines=40, existing={1, 2, 3}
+        )
+
+    def test_detect_statuses_skips_unchanged_panes(self):
+        """Test that panes with an unchanged signature aren't captured again."""
+        detector = StatusDetector()
+
+        signatures = {1: PaneSignature(100, 0, 0, 1), 2: PaneSignature(100, 0, 0, 2)}
+        detector.tmux.pane_signatures = MagicMock(return_value=signatures)
+        detector.tmux.capture_outputs = MagicMock(
+            return_value={1: "Done\n> ", 2: "Thinking..."}
+        )
+
+        detector.detect_statuses([1, 2])
+
+        # Pane 2 printed more output; pane 1 is untouched
+        signatures[2] = PaneSignature(200, 0, 0, 2)
+        detector.tmux.capture_outputs.return_value = {2: "Done\n> "}
+        statuses = detector.detect_statuses([1, 2])
+
+        assert statuses == {1: ClaudeStatus.idle, 2: ClaudeStatus.idle}
+        assert detector.tmux.capture_outputs.call_args[0][0] == [2]
+
     def test_is_claude_running_true(self):
         """Test detecting if Claude is running."""
         detector = StatusDetector()
@@ -147,3 +234,14 @@ class TestStatusDetector:
         detector.detect_status(task_id=1, lines=100)
 
         mock_capture.assert_called_once_with(1, lines=100)
+
+    def test_default_capture_lines(self):
+        """Test that only capture_lines lines are captured by default."""
+        detector = StatusDetector(capture_lines=25)
+
+        mock_capture = MagicMock(return_value="> ")
+        detector.tmux.capture_output = mock_capture
+
+        detector.detect_status(task_id=1)
+
+        mock_capture.assert_called_once_with(1, lines=25)
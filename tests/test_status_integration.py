@@ -17,7 +17,7 @@ class TestHybridStatusDetection:
     """Integration tests for hybrid status detection."""
 
     @pytest.mark.asyncio
-    async def test_hooks_take_priority_over_polling(self, engine):
+    async def test_hooks_take_priority_over_polling(self, engine, detect_all):
         """Test that hook updates are faster than polling updates."""
         with Session(engine) as db:
             task = Task(
@@ -33,7 +33,7 @@ class TestHybridStatusDetection:
 
         # Mock detector to return idle
         detector = StatusDetector()
-        detector.detect_status = MagicMock(return_value=ClaudeStatus.idle)
+        detector.detect_statuses = MagicMock(side_effect=detect_all(ClaudeStatus.idle))
 
         poller = StatusPoller(interval=0.1, engine=engine)
         poller.detector = detector
@@ -62,7 +62,7 @@ class TestHybridStatusDetection:
             assert poller._correction_count >= 1
 
     @pytest.mark.asyncio
-    async def test_polling_catches_missed_hooks(self, engine):
+    async def test_polling_catches_missed_hooks(self, engine, detect_all):
         """Test that polling detects status changes when hooks are missed."""
         with Session(engine) as db:
             task = Task(
@@ -78,7 +78,7 @@ class TestHybridStatusDetection:
 
         # Mock detector to return busy (simulating Claude working but no hook fired)
         detector = StatusDetector()
-        detector.detect_status = MagicMock(return_value=ClaudeStatus.busy)
+        detector.detect_statuses = MagicMock(side_effect=detect_all(ClaudeStatus.busy))
 
         poller = StatusPoller(interval=0.1, engine=engine)
         poller.detector = detector
@@ -100,7 +100,7 @@ class TestCornerCases:
     """Tests for corner cases in status detection."""
 
     @pytest.mark.asyncio
-    async def test_tmux_session_killed_during_polling(self, engine):
+    async def test_tmux_session_killed_during_polling(self, engine, detect_all):
         """Test handling when tmux session is killed mid-poll."""
         with Session(engine) as db:
             task = Task(
@@ -116,7 +116,7 @@ class TestCornerCases:
 
         # Mock detector to return None (session not found)
         detector = StatusDetector()
-        detector.detect_status = MagicMock(return_value=None)
+        detector.detect_statuses = MagicMock(side_effect=detect_all(None))
 
         poller = StatusPoller(interval=0.1, engine=engine)
         poller.detector = detector
@@ -132,7 +132,7 @@ class TestCornerCases:
             assert poller._orphan_cleanups == 1
 
     @pytest.mark.asyncio
-    async def test_claude_frozen_detection(self, engine):
+    async def test_claude_frozen_detection(self, engine, detect_all):
         """Test detecting when Claude is frozen (busy for too long)."""
         with Session(engine) as db:
             task = Task(
@@ -148,7 +148,7 @@ class TestCornerCases:
 
         # Mock detector to consistently return busy
         detector = StatusDetector()
-        detector.detect_status = MagicMock(return_value=ClaudeStatus.busy)
+        detector.detect_statuses = MagicMock(side_effect=detect_all(ClaudeStatus.busy))
 
         poller = StatusPoller(interval=0.05, engine=engine)
         poller.detector = detector
@@ -182,11 +182,12 @@ class TestCornerCases:
         detector = StatusDetector()
         call_count = [0]
 
-        def alternating_status(task_id):
+        def alternating_status(task_ids, **kwargs):
             call_count[0] += 1
-            return ClaudeStatus.busy if call_count[0] % 2 == 0 else ClaudeStatus.idle
+            status = ClaudeStatus.busy if call_count[0] % 2 == 0 else ClaudeStatus.idle
+            return {task_id: status for task_id in task_ids}
 
-        detector.detect_status = MagicMock(side_effect=alternating_status)
+        detector.detect_statuses = MagicMock(side_effect=alternating_status)
 
         poller = StatusPoller(interval=0.05, engine=engine)
         poller.detector = detector
@@ -199,14 +200,14 @@ class TestCornerCases:
         assert poller._correction_count >= 2
 
     @pytest.mark.asyncio
-    async def test_database_error_during_polling(self, engine):
+    async def test_database_error_during_polling(self, engine, tmp_path, detect_all):
         """Test that polling handles database errors gracefully."""
-        # Create poller with invalid engine
+        # Create poller with an engine on an empty database (no tables)
         from sqlalchemy import create_engine as sa_create_engine
-        bad_engine = sa_create_engine("sqlite:///nonexistent.db")
+        bad_engine = sa_create_engine(f"sqlite:///{tmp_path / 'nonexistent.db'}")
 
         detector = StatusDetector()
-        detector.detect_status = MagicMock(return_value=ClaudeStatus.idle)
+        detector.detect_statuses = MagicMock(side_effect=detect_all(ClaudeStatus.idle))
 
         poller = StatusPoller(interval=0.05, engine=bad_engine)
         poller.detector = detector
@@ -218,7 +219,7 @@ class TestCornerCases:
         assert poller._correction_count == 0
 
     @pytest.mark.asyncio
-    async def test_multiple_tasks_polling(self, engine):
+    async def test_multiple_tasks_polling(self, engine, detect_all):
         """Test polling multiple tasks simultaneously."""
         task_ids = []
         with Session(engine) as db:
@@ -236,7 +237,7 @@ class TestCornerCases:
 
         # Mock detector to return busy for all
         detector = StatusDetector()
-        detector.detect_status = MagicMock(return_value=ClaudeStatus.busy)
+        detector.detect_statuses = MagicMock(side_effect=detect_all(ClaudeStatus.busy))
 
         poller = StatusPoller(interval=0.1, engine=engine)
         poller.detector = detector
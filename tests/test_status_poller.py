@@ -11,7 +11,7 @@ from services.status_poller import StatusPoller
 @pytest.fixture
 def mock_detector():
     """Create a mock status detector."""
-    with patch("services.status_poller.StatusDetector") as mock:
+    with patch("services.status_poller.get_status_detector") as mock:
         yield mock.return_value
 
 
@@ -25,13 +25,17 @@ class TestStatusPoller:
         assert poller._running is False
         assert poller._correction_count == 0
 
+    def test_pollers_share_detector(self):
+        """Test that pollers reuse one shared status detector."""
+        assert StatusPoller().detector is StatusPoller().detector
+
     def test_default_interval(self):
         """Test default polling interval is 5 seconds (hybrid mode)."""
         poller = StatusPoller()
         assert poller.interval == 5.0
 
     @pytest.mark.asyncio
-    async def test_poll_once_updates_changed_status(self, engine, mock_detector):
+    async def test_poll_once_updates_changed_status(self, engine, mock_detector, detect_all):
         """Test that poll_once updates status when detection differs."""
         with Session(engine) as db:
             task = Task(
@@ -46,7 +50,7 @@ class TestStatusPoller:
             task_id = task.id
 
         # Mock detector to return busy (different from idle)
-        mock_detector.detect_status.return_value = ClaudeStatus.busy
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.busy)
 
         poller = StatusPoller(interval=5.0, engine=engine)
         poller.detector = mock_detector
@@ -60,7 +64,7 @@ class TestStatusPoller:
             assert poller._correction_count == 1
 
     @pytest.mark.asyncio
-    async def test_poll_once_skips_unchanged_status(self, engine, mock_detector):
+    async def test_poll_once_skips_unchanged_status(self, engine, mock_detector, detect_all):
         """Test that poll_once doesn't update when status matches."""
         with Session(engine) as db:
             task = Task(
@@ -75,12 +79,15 @@ class TestStatusPoller:
             task_id = task.id
 
         # Mock detector to return same status
-        mock_detector.detect_status.return_value = ClaudeStatus.idle
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.idle)
 
         poller = StatusPoller(interval=5.0, engine=engine)
         poller.detector = mock_detector
 
-        await poller._poll_once()
+        with patch.object(poller, "_apply_changes") as mock_apply:
+            await poller._poll_once()
+            # No write transaction when nothing changed
+            mock_apply.assert_not_called()
 
         # Verify status wasn't changed
         with Session(engine) as db:
@@ -89,7 +96,7 @@ class TestStatusPoller:
             assert poller._correction_count == 0
 
     @pytest.mark.asyncio
-    async def test_poll_once_updates_task_status_when_waiting(self, engine, mock_detector):
+    async def test_poll_once_updates_task_status_when_waiting(self, engine, mock_detector, detect_all):
         """Test that poll_once updates task status to waiting."""
         with Session(engine) as db:
             task = Task(
@@ -104,7 +111,7 @@ class TestStatusPoller:
             task_id = task.id
 
         # Mock detector to return waiting
-        mock_detector.detect_status.return_value = ClaudeStatus.waiting
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.waiting)
 
         poller = StatusPoller(interval=5.0, engine=engine)
         poller.detector = mock_detector
@@ -117,6 +124,113 @@ class TestStatusPoller:
             assert task.claude_status == ClaudeStatus.waiting
             assert task.status == TaskStatus.waiting
 
+    @pytest.mark.asyncio
+    async def test_poll_once_resumes_task_after_permission(self, engine, mock_detector, detect_all):
+        """Test that a waiting task goes back to running once Claude is idle."""
+        with Session(engine) as db:
+            task = Task(
+                title="Test",
+                status=TaskStatus.waiting,
+                claude_status=ClaudeStatus.waiting,
+                tmux_session="test-session",
+            )
+            db.add(task)
+            db.commit()
+            db.refresh(task)
+            task_id = task.id
+
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.idle)
+
+        poller = StatusPoller(interval=5.0, engine=engine)
+        poller.detector = mock_detector
+
+        await poller._poll_once()
+
+        with Session(engine) as db:
+            task = db.get(Task, task_id)
+            assert task.claude_status == ClaudeStatus.idle
+            assert task.status == TaskStatus.running
+
+    @pytest.mark.asyncio
+    async def test_poll_once_batches_updates(self, engine, mock_detector, detect_all):
+        """Test that tasks with the same transition share one UPDATE statement."""
+        from sqlalchemy import event
+
+        with Session(engine) as db:
+            for i in range(3):
+                db.add(Task(
+                    title=f"Test {i}",
+                    status=TaskStatus.running,
+                    claude_status=ClaudeStatus.idle,
+                    tmux_session=f"test-session-{i}",
+                ))
+            db.commit()
+
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.busy)
+
+        poller = StatusPoller(interval=5.0, engine=engine)
+        poller.detector = mock_detector
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            await poller._poll_once()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        updates = [stmt for stmt in statements if stmt.lstrip().upper().startswith("UPDATE")]
+        assert len(updates) == 1
+        assert poller._correction_count == 3
+
+    @pytest.mark.asyncio
+    async def test_poll_once_logs_one_summary_per_tick(self, engine, mock_detector, caplog, detect_all):
+        """Test that corrections are summarized in a single log line per tick."""
+        import logging
+
+        with Session(engine) as db:
+            for i in range(3):
+                db.add(Task(
+                    title=f"Test {i}",
+                    status=TaskStatus.running,
+                    claude_status=ClaudeStatus.idle,
+                    tmux_session=f"test-session-{i}",
+                ))
+            db.commit()
+
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.busy)
+
+        poller = StatusPoller(interval=5.0, engine=engine)
+        poller.detector = mock_detector
+
+        with caplog.at_level(logging.WARNING, logger="services.status_poller"):
+            await poller._poll_once()
+
+        assert len(caplog.records) == 1
+        assert "3 status corrections" in caplog.records[0].getMessage()
+
+    def test_apply_changes_skips_rows_locked_elsewhere(self):
+        """Test that rows locked by another writer are left for the next tick."""
+        from sqlalchemy.dialects import postgresql
+
+        poller = StatusPoller(interval=5.0, engine=MagicMock())
+        conn = poller.engine.begin.return_value.__enter__.return_value
+        conn.dialect.name = "postgresql"
+        # Task 2 is locked by someone else
+        conn.execute.return_value.scalars.return_value = [1, 3]
+
+        poller._apply_changes([3], {(ClaudeStatus.busy, TaskStatus.running): [1, 2]})
+
+        statements = [call.args[0] for call in conn.execute.call_args_list]
+        lock_sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE SKIP LOCKED" in lock_sql
+
+        update_params = [stmt.compile().params for stmt in statements[1:]]
+        assert [params["id_1"] for params in update_params] == [[3], [1]]
+
     @pytest.mark.asyncio
     async def test_poll_once_skips_tasks_without_tmux(self, engine, mock_detector):
         """Test that poll_once skips tasks without tmux sessions."""
@@ -137,10 +251,166 @@ class TestStatusPoller:
         await poller._poll_once()
 
         # Detector should not be called
-        mock_detector.detect_status.assert_not_called()
+        mock_detector.detect_statuses.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_poll_once_skips_db_when_idle(self, engine, mock_detector, detect_all):
+        """Test that an idle poller skips the DB until marked dirty."""
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.busy)
+
+        poller = StatusPoller(interval=5.0, engine=engine)
+        poller.detector = mock_detector
+
+        # First poll scans and finds nothing active
+        await poller._poll_once()
+
+        with Session(engine) as db:
+            task = Task(
+                title="Test",
+                status=TaskStatus.running,
+                claude_status=ClaudeStatus.idle,
+                tmux_session="test-session",
+            )
+            db.add(task)
+            db.commit()
+
+        with patch.object(poller, "engine") as mock_engine:
+            await poller._poll_once()
+            mock_engine.connect.assert_not_called()
+            mock_engine.begin.assert_not_called()
+
+        # Once marked dirty the new task is picked up
+        poller.mark_dirty()
+        await poller._poll_once()
+        mock_detector.detect_statuses.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_poll_once_rescans_periodically_when_idle(self, engine, mock_detector, detect_all):
+        """Test that an idle poller still does a full scan every FULL_SCAN_TICKS."""
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.busy)
+
+        poller = StatusPoller(interval=5.0, engine=engine)
+        poller.detector = mock_detector
+        await poller._poll_once()
+
+        # Written without going through the ORM, so nothing marks the poller dirty
+        with engine.begin() as conn:
+            conn.execute(Task.__table__.insert().values(
+                title="Test",
+                status=TaskStatus.running,
+                claude_status=ClaudeStatus.idle,
+                tmux_session="test-session",
+            ))
+
+        for _ in range(poller.FULL_SCAN_TICKS - 1):
+            await poller._poll_once()
+        mock_detector.detect_statuses.assert_not_called()
+
+        await poller._poll_once()
+        mock_detector.detect_statuses.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_poll_once_marks_stopped_when_session_not_found(self, engine, mock_detector):
+    async def test_poll_once_rereads_only_cached_tasks(self, engine, mock_detector, detect_all):
+        """Test that between full scans only previously active tasks are re-read."""
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.idle)
+
+        with Session(engine) as db:
+            first = Task(
+                title="First",
+                status=TaskStatus.running,
+                claude_status=ClaudeStatus.idle,
+                tmux_session="test-session-1",
+            )
+            db.add(first)
+            db.commit()
+            db.refresh(first)
+            first_id = first.id
+
+        poller = StatusPoller(interval=5.0, engine=engine)
+        poller.detector = mock_detector
+        await poller._poll_once()
+
+        with Session(engine) as db:
+            db.add(Task(
+                title="Second",
+                status=TaskStatus.running,
+                claude_status=ClaudeStatus.idle,
+                tmux_session="test-session-2",
+            ))
+            db.commit()
+
+        await poller._poll_once()
+        assert mock_detector.detect_statuses.call_args.args[0] == [first_id]
+
+        poller.mark_dirty()
+        await poller._poll_once()
+        assert len(mock_detector.detect_statuses.call_args.args[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_control_mode_only_checks_panes_with_output(self, engine, mock_detector, detect_all):
+        """Test that control mode skips panes that produced no output."""
+        with Session(engine) as db:
+            for i in range(2):
+                db.add(Task(
+                    title=f"Test {i}",
+                    status=TaskStatus.running,
+                    claude_status=ClaudeStatus.idle,
+                    tmux_session=f"test-session-{i}",
+                ))
+            db.commit()
+
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.idle)
+
+        poller = StatusPoller(interval=5.0, engine=engine, control_mode=True)
+        poller.detector = mock_detector
+        attached = set()
+        poller._control = MagicMock()
+        poller._control.attached_sessions.side_effect = lambda: set(attached)
+        poller._control.is_attached.side_effect = lambda sid: sid in attached
+        poller._control.attach = AsyncMock(side_effect=attached.add)
+
+        # First tick attaches and checks every pane
+        await poller._poll_once()
+        assert len(mock_detector.detect_statuses.call_args[0][0]) == 2
+
+        # Quiet panes are skipped entirely
+        await poller._poll_once()
+        assert mock_detector.detect_statuses.call_count == 1
+
+        # Only the pane that produced output is re-checked
+        poller._on_pane_output("test-session-1", "working...")
+        await poller._poll_once()
+        assert mock_detector.detect_statuses.call_count == 2
+        assert len(mock_detector.detect_statuses.call_args[0][0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_poll_once_warns_when_busy_past_threshold(self, engine, mock_detector, detect_all):
+        """Test frozen detection compares against the monotonic busy start."""
+        import time
+        with Session(engine) as db:
+            task = Task(
+                title="Test",
+                status=TaskStatus.running,
+                claude_status=ClaudeStatus.busy,
+                tmux_session="test-session",
+            )
+            db.add(task)
+            db.commit()
+            db.refresh(task)
+            task_id = task.id
+
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.busy)
+
+        poller = StatusPoller(interval=5.0, engine=engine, frozen_threshold=60.0)
+        poller.detector = mock_detector
+        poller._last_busy_check[task_id] = time.monotonic() - 120.0
+
+        await poller._poll_once()
+
+        assert poller._frozen_warnings == 1
+
+    @pytest.mark.asyncio
+    async def test_poll_once_marks_stopped_when_session_not_found(self, engine, mock_detector, detect_all):
         """Test that poll_once marks Claude as stopped when session doesn't exist."""
         with Session(engine) as db:
             task = Task(
@@ -155,7 +425,7 @@ class TestStatusPoller:
             task_id = task.id
 
         # Mock detector to return None (session not found)
-        mock_detector.detect_status.return_value = None
+        mock_detector.detect_statuses.side_effect = detect_all(None)
 
         poller = StatusPoller(interval=5.0, engine=engine)
         poller.detector = mock_detector
@@ -173,7 +443,7 @@ class TestStatusPoller:
     async def test_poll_once_handles_errors_gracefully(self, engine, mock_detector):
         """Test that poll_once doesn't crash on errors."""
         # Mock detector to raise exception
-        mock_detector.detect_status.side_effect = Exception("Test error")
+        mock_detector.detect_statuses.side_effect = Exception("Test error")
 
         poller = StatusPoller(interval=5.0)
         poller.detector = mock_detector
@@ -194,9 +464,9 @@ class TestStatusPoller:
         assert stats["correction_count"] == 5
 
     @pytest.mark.asyncio
-    async def test_poll_now(self, mock_detector):
+    async def test_poll_now(self, mock_detector, detect_all):
         """Test poll_now triggers immediate poll."""
-        mock_detector.detect_status.return_value = ClaudeStatus.idle
+        mock_detector.detect_statuses.side_effect = detect_all(ClaudeStatus.idle)
 
         poller = StatusPoller(interval=5.0)
         poller.detector = mock_detector
@@ -205,7 +475,7 @@ class TestStatusPoller:
         await poller.poll_now()
 
         # Verify it actually polled (detector was called)
-        mock_detector.detect_status.called
+        mock_detector.detect_statuses.called
 
     @pytest.mark.asyncio
     async def test_start_and_stop(self):
@@ -225,6 +495,56 @@ class TestStatusPoller:
         await poller.stop()
         assert poller._running is False
 
+    @pytest.mark.asyncio
+    async def test_stop_does_not_wait_for_interval(self):
+        """Test that stop wakes the loop instead of sleeping out the interval."""
+        import asyncio
+        poller = StatusPoller(interval=60.0)
+        poller.start()
+        await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(poller.stop(), timeout=1.0)
+        assert poller._task.done()
+
+    @pytest.mark.asyncio
+    async def test_request_poll_wakes_loop(self, mock_detector):
+        """Test that request_poll triggers a poll before the interval elapses."""
+        import asyncio
+        poller = StatusPoller(interval=60.0)
+        poller._poll_once = AsyncMock()
+        poller.start()
+        await asyncio.sleep(0.05)
+        assert poller._poll_once.await_count == 1
+
+        poller.request_poll()
+        await asyncio.sleep(0.05)
+        assert poller._poll_once.await_count == 2
+
+        await poller.stop()
+
+    @pytest.mark.asyncio
+    async def test_threaded_mode_polls_on_worker_thread(self, mock_detector):
+        """Test that threaded mode runs the loop off the caller's thread."""
+        import asyncio
+        import threading
+        poll_threads = []
+
+        async def record_poll():
+            poll_threads.append(threading.current_thread())
+
+        poller = StatusPoller(interval=60.0, threaded=True)
+        poller._poll_once = record_poll
+        poller.start()
+        await asyncio.sleep(0.05)
+        assert poller._task is None
+
+        poller.request_poll()
+        await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(poller.stop(), timeout=1.0)
+        assert len(poll_threads) == 2
+        assert threading.current_thread() not in poll_threads
+
     def test_start_when_already_running(self):
         """Test that starting when already running is safe."""
         poller = StatusPoller(interval=5.0)
@@ -248,18 +568,37 @@ class TestStatusPoller:
 class TestStatusPollerGlobalInstance:
     """Tests for global poller instance management."""
 
-    def test_get_status_poller_creates_instance(self):
+    def test_get_status_poller_creates_instance(self, monkeypatch):
         """Test that get_status_poller creates a poller."""
-        from services.status_poller import get_status_poller, _poller
+        from services.status_poller import get_status_poller
 
-        # Clear global instance
+        # Clear global instance (restored afterwards for the app's lifespan)
         import services.status_poller as poller_module
-        poller_module._poller = None
+        monkeypatch.setattr(poller_module, "_poller", None)
 
         poller = get_status_poller(interval=3.0)
         assert poller is not None
         assert poller.interval == 3.0
 
+    def test_task_activation_marks_global_poller_dirty(self, engine, monkeypatch):
+        """Test that flushing a task into running marks the global poller dirty."""
+        import services.status_poller as poller_module
+
+        poller = StatusPoller(interval=5.0, engine=engine)
+        monkeypatch.setattr(poller_module, "_poller", poller)
+
+        with Session(engine) as db:
+            task = Task(title="Test", status=TaskStatus.pending)
+            db.add(task)
+            poller._dirty = False
+            db.commit()
+            assert poller._dirty is False
+
+            task.status = TaskStatus.running
+            db.add(task)
+            db.commit()
+            assert poller._dirty is True
+
     def test_get_status_poller_returns_same_instance(self):
         """Test that get_status_poller returns the same instance."""
         from services.status_poller import get_status_poller
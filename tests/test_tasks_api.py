@@ -1,7 +1,7 @@
 """Tests for Task API endpoints."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from sqlmodel import Session
 
 from models import Task, TaskStatus, ClaudeStatus
@@ -648,7 +648,7 @@ class TestTaskOutput:
     def test_get_output_success(self, mock_tmux_class, client, engine):
         """Test getting task output."""
         mock_tmux = MagicMock()
-        mock_tmux.capture_output.return_value = "Claude output here..."
+        mock_tmux.capture_output_async = AsyncMock(return_value="Claude output here...")
         mock_tmux_class.return_value = mock_tmux
 
         with Session(engine) as db:
@@ -664,7 +664,7 @@ class TestTaskOutput:
         data = response.json()
         assert data["output"] == "Claude output here..."
         assert data["lines"] == 50
-        mock_tmux.capture_output.assert_called_once_with(task_id, lines=50)
+        mock_tmux.capture_output_async.assert_awaited_once_with(task_id, lines=50)
 
     def test_get_output_not_running(self, client, engine):
         """Test that getting output from non-running task fails."""
@@ -1,8 +1,13 @@
 """Tests for task-centric tmux service."""
 
+import json
+import shlex
+import subprocess
+
 import pytest
-from unittest.mock import patch, MagicMock, call, mock_open
+from unittest.mock import patch, MagicMock, AsyncMock, call
 from uuid import UUID, uuid4
+from dataclasses import replace
 from pathlib import Path
 
 from services.tmux import (
@@ -13,9 +18,18 @@ from services.tmux import (
     SessionInfo,
     session_exists,
     _session_id_for_task,
+    _pane_has_claude,
     _run_tmux,
+    _run_tmux_async,
     get_transcript_dir,
     create_transcript_file,
+    capture_outputs_bulk,
+    pane_signatures,
+    PaneSignature,
+    TmuxControl,
+    TmuxCommandClient,
+    _decode_control_output,
+    _quote_control_arg,
 )
 
 
@@ -27,35 +41,67 @@ class TestTranscriptFunctions:
         task_id = UUID("12345678-1234-5678-1234-567812345678")
         expected = Path("/tmp/chorus/task-12345678-1234-5678-1234-567812345678")
         assert get_transcript_dir(task_id) == expected
+        # Cached: the same (immutable) Path object comes back
+        assert get_transcript_dir(task_id) is get_transcript_dir(task_id)
 
-    @patch("services.tmux.Path.mkdir")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("services.tmux.datetime")
-    def test_create_transcript_file(self, mock_datetime, mock_file, mock_mkdir):
+    @patch("services.tmux.get_transcript_dir")
+    @patch("services.tmux.time.time_ns")
+    def test_create_transcript_file(self, mock_time_ns, mock_dir, tmp_path):
         """Test creating transcript file with minimal entry."""
         from datetime import datetime, timezone
 
         task_id = UUID("12345678-1234-5678-1234-567812345678")
-        mock_now = datetime(2025, 12, 31, 12, 0, 0, tzinfo=timezone.utc)
-        mock_datetime.now.return_value = mock_now
+        mock_now = datetime(2025, 12, 31, 12, 0, 0, 123456, tzinfo=timezone.utc)
+        mock_time_ns.return_value = int(mock_now.timestamp()) * 10**9 + 123456 * 1000
+        mock_dir.return_value = tmp_path / "task-12345678-1234-5678-1234-567812345678"
 
         result = create_transcript_file(task_id, "/test/project")
 
-        # Check directory creation
-        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
-
-        # Check file was opened for writing
-        expected_path = Path("/tmp/chorus/task-12345678-1234-5678-1234-567812345678/transcript.json")
-        mock_file.assert_called_once_with(expected_path, "w")
-
         # Check returned path
-        assert result == expected_path
+        assert result == tmp_path / "task-12345678-1234-5678-1234-567812345678" / "transcript.json"
+
+        # Check one JSONL line was written
+        lines = result.read_text().splitlines()
+        assert len(lines) == 1
+        entry = json.loads(lines[0])
+        assert entry["sessionId"] == "12345678-1234-5678-1234-567812345678"
+        assert entry["cwd"] == "/test/project"
+        assert entry["timestamp"] == mock_now.isoformat() == "2025-12-31T12:00:00.123456+00:00"
+
+    @patch("services.tmux.get_transcript_dir")
+    def test_create_transcript_file_entry(self, mock_dir, tmp_path):
+        """Test the full entry, including a cwd that needs escaping."""
+        task_id = UUID("12345678-1234-5678-1234-567812345678")
+        mock_dir.return_value = tmp_path
+
+        entry = json.loads(create_transcript_file(task_id, 'C:\\a "b"').read_text())
+
+        timestamp = entry.pop("timestamp")
+        assert timestamp.endswith("+00:00")
+        assert entry == {
+            "parentUuid": None,
+            "isSidechain": False,
+            "userType": "external",
+            "cwd": 'C:\\a "b"',
+            "sessionId": "12345678-1234-5678-1234-567812345678",
+            "version": "1.0.0",
+            "gitBranch": "",
+            "type": "user",
+            "message": {"role": "user", "content": "Task initialized"},
+            "uuid": "00000000-0000-0000-0000-000000000000",
+        }
+
+    @patch("services.tmux.get_transcript_dir")
+    def test_create_transcript_file_overwrites(self, mock_dir, tmp_path):
+        """Test that an existing transcript is truncated, not appended to."""
+        task_id = UUID("12345678-1234-5678-1234-567812345678")
+        mock_dir.return_value = tmp_path
+        (tmp_path / "transcript.json").write_text("x" * 4096)
+
+        result = create_transcript_file(task_id, "/test/project")
 
-        # Check JSON was written
-        handle = mock_file()
-        written_data = "".join(call.args[0] for call in handle.write.call_args_list)
-        assert '"sessionId": "12345678-1234-5678-1234-567812345678"' in written_data
-        assert '"cwd": "/test/project"' in written_data
+        assert len(result.read_text().splitlines()) == 1
+        assert result.read_text().startswith("{")
 
 
 class TestSessionIdGeneration:
@@ -66,6 +112,19 @@ class TestSessionIdGeneration:
         task_id = UUID("12345678-1234-5678-1234-567812345678")
         assert _session_id_for_task(task_id) == "claude-task-12345678-1234-5678-1234-567812345678"
 
+    def test_session_id_follows_config_change(self):
+        """Test that the cached prefix is rebuilt when the config is replaced."""
+        from config import TmuxConfig, get_config, set_config
+
+        original = get_config()
+        assert _session_id_for_task(7) == "claude-task-7"
+        try:
+            set_config(replace(original, tmux=TmuxConfig(session_prefix="other")))
+            assert _session_id_for_task(7) == "other-task-7"
+        finally:
+            set_config(original)
+        assert _session_id_for_task(7) == "claude-task-7"
+
     def test_get_session_id(self):
         """Test TmuxService.get_session_id method."""
         service = TmuxService()
@@ -154,7 +213,7 @@ class TestTmuxServiceStartClaude:
         # Claude should be launched with CLAUDE_CONFIG_DIR pointing to shared hooks config
         mock_run.assert_called_once_with(
             ["send-keys", "-t", "claude-task-42",
-             'CLAUDE_CONFIG_DIR="/tmp/chorus/hooks/.claude" claude', "Enter"]
+             'CLAUDE_CONFIG_DIR=/tmp/chorus/hooks/.claude claude', "Enter"]
         )
 
     @patch("services.tmux._session_id_for_task")
@@ -174,8 +233,50 @@ class TestTmuxServiceStartClaude:
         # Should call send-keys once with prompt included as argument to claude
         mock_run.assert_called_once_with(
             ["send-keys", "-t", "claude-task-42",
-             'CLAUDE_CONFIG_DIR="/tmp/chorus/hooks/.claude" claude "Hello Claude"', "Enter"]
+             "CLAUDE_CONFIG_DIR=/tmp/chorus/hooks/.claude claude 'Hello Claude'", "Enter"]
+        )
+
+    @patch("services.tmux.os.environ.get")
+    @patch("services.tmux.session_exists")
+    @patch("services.tmux._run_tmux")
+    def test_start_claude_quotes_prompt_for_shell(self, mock_run, mock_exists, mock_env_get):
+        """Test that quotes, $ and backticks in the prompt reach claude verbatim."""
+        import shlex
+        mock_exists.return_value = True
+        mock_run.return_value = MagicMock(returncode=0)
+        mock_env_get.return_value = None
+
+        prompt = """Fix the "it's $HOME" bug in `main.py`"""
+        service = TmuxService()
+        service.start_claude(42, initial_prompt=prompt)
+
+        claude_cmd = mock_run.call_args[0][0][3]
+        assert shlex.split(claude_cmd)[-1] == prompt
+
+    @patch("services.tmux.os.environ.get")
+    @patch("services.tmux.session_exists")
+    @patch("services.tmux._run_tmux")
+    def test_start_claude_reads_context_in_pane(self, mock_run, mock_exists, mock_env_get, tmp_path):
+        """Test that the context file path is shell-quoted inside $(cat ...)."""
+        mock_exists.return_value = True
+        mock_run.return_value = MagicMock(returncode=0)
+        mock_env_get.return_value = None
+
+        context_file = tmp_path / "it's context.md"
+        context_file.write_text("# Task\n\tIt's done\n")
+        service = TmuxService()
+        service.start_claude(42, context_file=context_file)
+
+        claude_cmd = mock_run.call_args[0][0][3]
+        quoted_path = shlex.quote(str(context_file))
+        assert claude_cmd.endswith(f'claude --append-system-prompt "$(cat {quoted_path})"')
+        # A POSIX shell hands claude the file's contents (trailing newline stripped)
+        script = claude_cmd.split(" claude ", 1)[1].replace(
+            "--append-system-prompt", "printf %s", 1
         )
+        assert subprocess.run(
+            ["sh", "-c", script], capture_output=True, text=True, check=True
+        ).stdout == "# Task\n\tIt's done"
 
     @patch("services.tmux.session_exists")
     def test_start_claude_no_session(self, mock_exists):
@@ -200,22 +301,63 @@ class TestTmuxServiceRestartClaude:
     def test_restart_claude_success(self, mock_sleep, mock_run, mock_exists, mock_env_get):
         """Test restarting Claude with shared config."""
         mock_exists.return_value = True
-        mock_run.return_value = MagicMock(returncode=0)
         mock_env_get.return_value = None  # No OAuth token
+        service = TmuxService()
+        # The shell only comes back after the second Ctrl-C
+        mock_run.side_effect = lambda args, check=True: MagicMock(
+            returncode=0,
+            stdout="bash\n" if mock_run.call_count > service.RESTART_POLL_ATTEMPTS + 2 else "claude\n",
+        )
+
+        service.restart_claude(42)
+
+        # Ctrl-C twice, waiting a bounded time after the first, then restart
+        # with shared config
+        send_keys = [c for c in mock_run.call_args_list if c[0][0][0] == "send-keys"]
+        assert send_keys == [
+            call(["send-keys", "-t", "claude-task-42", "C-c"]),
+            call(["send-keys", "-t", "claude-task-42", "C-c"]),
+            call(["send-keys", "-t", "claude-task-42",
+                  'CLAUDE_CONFIG_DIR=/tmp/chorus/hooks/.claude claude', "Enter"]),
+        ]
+        assert mock_sleep.call_count == service.RESTART_POLL_ATTEMPTS
+
+    @patch("services.tmux.os.environ.get", return_value=None)
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    @patch("services.tmux.time.sleep")
+    def test_restart_claude_gives_up_when_shell_never_returns(
+        self, mock_sleep, mock_run, mock_exists, mock_env_get, caplog
+    ):
+        """Test that the claude command isn't typed into a Claude that didn't exit."""
+        mock_run.return_value = MagicMock(returncode=0, stdout="claude\n")
 
         service = TmuxService()
         service.restart_claude(42)
 
-        # Should send Ctrl-C twice, then restart with shared config
-        calls = mock_run.call_args_list
-        assert len(calls) == 3
-        assert calls[0] == call(["send-keys", "-t", "claude-task-42", "C-c"])
-        assert calls[1] == call(["send-keys", "-t", "claude-task-42", "C-c"])
-        assert calls[2] == call(
-            ["send-keys", "-t", "claude-task-42",
-             'CLAUDE_CONFIG_DIR="/tmp/chorus/hooks/.claude" claude', "Enter"]
+        send_keys = [c[0][0][-1] for c in mock_run.call_args_list if c[0][0][0] == "send-keys"]
+        assert send_keys == ["C-c", "C-c"]
+        assert mock_sleep.call_count == 2 * service.RESTART_POLL_ATTEMPTS
+        assert service.RESTART_POLL_INTERVAL * service.RESTART_POLL_ATTEMPTS >= 0.3
+        assert "not relaunching" in caplog.text
+
+    @patch("services.tmux.os.environ.get", return_value=None)
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    @patch("services.tmux.time.sleep")
+    def test_restart_claude_skips_second_interrupt(self, mock_sleep, mock_run, mock_exists, mock_env_get):
+        """Test that the relaunch happens as soon as the shell is back."""
+        mock_run.side_effect = lambda args, check=True: MagicMock(
+            returncode=0, stdout="claude\n" if mock_run.call_count == 2 else "bash\n"
         )
 
+        service = TmuxService()
+        service.restart_claude(42)
+
+        send_keys = [c[0][0][-1] for c in mock_run.call_args_list if c[0][0][0] == "send-keys"]
+        assert send_keys == ["C-c", "Enter"]
+        mock_sleep.assert_called_once_with(service.RESTART_POLL_INTERVAL)
+
     @patch("services.tmux.session_exists")
     def test_restart_claude_no_session(self, mock_exists):
         """Test restarting Claude when session doesn't exist."""
@@ -244,6 +386,25 @@ class TestTmuxServiceKillSession:
             ["kill-session", "-t", "claude-task-42"]
         )
 
+    @pytest.mark.parametrize("extra_file", [False, True])
+    @patch("services.tmux.get_transcript_dir")
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    def test_kill_task_session_removes_transcript_dir(
+        self, mock_run, mock_exists, mock_dir, extra_file, tmp_path
+    ):
+        """Test cleanup of a transcript-only directory and a fuller one."""
+        transcript_dir = tmp_path / "task-42"
+        transcript_dir.mkdir()
+        (transcript_dir / "transcript.json").write_text("{}\n")
+        if extra_file:
+            (transcript_dir / "context.md").write_text("context")
+        mock_dir.return_value = transcript_dir
+
+        TmuxService().kill_task_session(42)
+
+        assert not transcript_dir.exists()
+
     @patch("services.tmux.session_exists")
     def test_kill_task_session_not_found(self, mock_exists):
         """Test killing a non-existent session."""
@@ -301,6 +462,234 @@ class TestTmuxServiceCaptureOutput:
             service.capture_output(42)
 
 
+class TestCaptureOutputsBulk:
+    """Tests for batched pane capture."""
+
+    @patch("services.tmux.uuid.uuid4")
+    @patch("services.tmux._run_tmux")
+    def test_capture_outputs_bulk_single_invocation(self, mock_run, mock_uuid):
+        """Test that all panes are captured with one chained tmux call."""
+        mock_uuid.return_value = MagicMock(hex="abc")
+        sentinel = "__chorus_capture_abc__"
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="claude-task-1\nclaude-task-2\n"),
+            MagicMock(returncode=0, stdout=f"out 1\n>\n{sentinel}\nout 2\n{sentinel}\n"),
+        ]
+
+        outputs = capture_outputs_bulk(["claude-task-1", "claude-task-2", "claude-task-3"], lines=50)
+
+        assert outputs == {"claude-task-1": "out 1\n>\n", "claude-task-2": "out 2\n"}
+        assert mock_run.call_count == 2
+        assert mock_run.call_args_list[1] == call(
+            [
+                "capture-pane", "-t", "claude-task-1", "-p", "-S", "-50",
+                ";", "display-message", "-p", sentinel,
+                ";", "capture-pane", "-t", "claude-task-2", "-p", "-S", "-50",
+                ";", "display-message", "-p", sentinel,
+            ],
+            check=False,
+        )
+
+    @patch("services.tmux._run_tmux")
+    def test_capture_outputs_bulk_no_sessions(self, mock_run):
+        """Test that nothing is captured when no sessions exist."""
+        mock_run.return_value = MagicMock(returncode=1, stdout="")
+
+        assert capture_outputs_bulk(["claude-task-1"]) == {}
+        mock_run.assert_called_once()
+
+    @patch("services.tmux._run_tmux")
+    def test_capture_outputs_bulk_falls_back_when_chain_fails(self, mock_run):
+        """Test per-session fallback when a session dies mid-chain."""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="claude-task-1\nclaude-task-2\n"),
+            MagicMock(returncode=1, stdout=""),
+            MagicMock(returncode=0, stdout="out 1\n"),
+            MagicMock(returncode=1, stdout=""),
+        ]
+
+        outputs = capture_outputs_bulk(["claude-task-1", "claude-task-2"], lines=50)
+
+        assert outputs == {"claude-task-1": "out 1\n"}
+
+    @patch("services.tmux._run_tmux")
+    def test_pane_signatures(self, mock_run):
+        """Test parsing pane signatures, including session names with spaces."""
+        mock_run.return_value = MagicMock(
+            returncode=0, stdout="claude-task-1 1700000000 12 2 5\nmy session 1700000001 0 0 0\n"
+        )
+
+        assert pane_signatures() == {
+            "claude-task-1": PaneSignature(1700000000, 12, 2, 5),
+            "my session": PaneSignature(1700000001, 0, 0, 0),
+        }
+
+    @patch("services.tmux.capture_outputs_bulk")
+    def test_service_capture_outputs_maps_task_ids(self, mock_bulk):
+        """Test TmuxService.capture_outputs maps session IDs back to task IDs."""
+        mock_bulk.return_value = {"claude-task-1": "out 1"}
+
+        service = TmuxService()
+        outputs = service.capture_outputs([1, 2], lines=50)
+
+        assert outputs == {1: "out 1"}
+        mock_bulk.assert_called_once_with(["claude-task-1", "claude-task-2"], lines=50, existing=None)
+
+
+class TestTmuxControl:
+    """Tests for the control-mode output streamer."""
+
+    def test_decode_control_output(self):
+        """Test that tmux's octal escapes are decoded."""
+        assert _decode_control_output("hi\\015\\012> ") == "hi\r\n> "
+        assert _decode_control_output("a\\134b") == "a\\b"
+
+    @pytest.mark.asyncio
+    async def test_attach_forwards_output_and_exit(self):
+        """Test that %output lines reach the callback and %exit is reported."""
+        async def lines():
+            for line in [b"%begin 1 2 0\n", b"%output %3 busy\\015\\012\n", b"%exit\n"]:
+                yield line
+
+        proc = MagicMock(returncode=None, stdout=lines())
+        outputs, exits = [], []
+        control = TmuxControl(
+            on_output=lambda sid, chunk: outputs.append((sid, chunk)),
+            on_exit=exits.append,
+        )
+
+        with patch(
+            "services.tmux.asyncio.create_subprocess_exec", AsyncMock(return_value=proc)
+        ) as mock_exec:
+            await control.attach("claude-task-1")
+            await control._clients["claude-task-1"][1]
+
+        assert mock_exec.call_args[0][:5] == ("tmux", "-C", "attach", "-t", "claude-task-1")
+        assert outputs == [("claude-task-1", "busy\r\n")]
+        assert exits == ["claude-task-1"]
+        assert not control.is_attached("claude-task-1")
+
+
+class TestTmuxServiceCaptureJsonEvents:
+    """Tests for incremental TmuxService.capture_json_events."""
+
+    def _run(self, position, rows):
+        """Build a _run_tmux side effect for a display-message + capture-pane pair."""
+        def run(args, check=True):
+            if args[0] == "display-message":
+                return MagicMock(returncode=0, stdout=position)
+            return MagicMock(returncode=0, stdout="".join(f"{row}\n" for row in rows))
+        return run
+
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    def test_since_last_reads_only_new_lines(self, mock_run, mock_exists):
+        """Test that the next capture starts where the previous one stopped."""
+        service = TmuxService()
+
+        # history 10, limit 2000, cursor on row 2 (absolute line 12)
+        mock_run.side_effect = self._run("10 2000 2 80\n", ['{"a":1}'] * 12 + [""])
+        first = service.capture_json_events(1, since_last=True)
+        assert first.count('{"a":1}') == 12
+        assert mock_run.call_args[0][0][-4:] == ["-S", "-10", "-E", "2"]
+
+        # Two more lines printed, cursor now on absolute line 15
+        mock_run.side_effect = self._run("12 2000 3 80\n", ["", '{"b":2}', '{"c":3}', ""])
+        assert service.capture_json_events(1, since_last=True) == '\n{"b":2}\n{"c":3}\n'
+        assert mock_run.call_args[0][0][-4:] == ["-S", "0", "-E", "3"]
+
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    def test_since_last_holds_back_partial_object(self, mock_run, mock_exists):
+        """Test that a JSON object still being written is returned once complete."""
+        service = TmuxService()
+
+        mock_run.side_effect = self._run("0 2000 1 80\n", ['{"a":1}', '{"b":'])
+        assert service.capture_json_events(1, since_last=True) == '{"a":1}\n'
+
+        mock_run.side_effect = self._run("0 2000 2 80\n", ['{"b":2}', ""])
+        assert service.capture_json_events(1, since_last=True) == '{"b":2}\n'
+        assert mock_run.call_args[0][0][-4:] == ["-S", "1", "-E", "2"]
+
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    def test_since_last_holds_back_wrapped_partial_object(self, mock_run, mock_exists):
+        """Test that an unfinished object wrapped over several rows is held back whole."""
+        service = TmuxService()
+
+        mock_run.side_effect = self._run("0 2000 2 8\n", ['{"a":1}', '{"b":"12', '345'])
+        assert service.capture_json_events(1, since_last=True) == '{"a":1}\n'
+
+        mock_run.side_effect = self._run("0 2000 3 8\n", ['{"b":"12', '345"}', ""])
+        assert service.capture_json_events(1, since_last=True) == '{"b":"12\n345"}\n'
+
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    def test_since_last_returns_json_line_followed_by_prompt(self, mock_run, mock_exists):
+        """Test that the last line isn't held back once claude exits to the prompt."""
+        service = TmuxService()
+
+        mock_run.side_effect = self._run("0 2000 2 80\n", ['{"k":39}', '{"k":40}', "$ "])
+        assert service.capture_json_events(1, since_last=True) == '{"k":39}\n{"k":40}\n'
+
+        # Only the prompt row is read again
+        mock_run.side_effect = self._run("0 2000 2 80\n", ["$ "])
+        assert service.capture_json_events(1, since_last=True) == ""
+        assert mock_run.call_args[0][0][-4:] == ["-S", "2", "-E", "2"]
+
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    def test_since_last_full_capture_when_history_is_full(self, mock_run, mock_exists):
+        """Test falling back to the whole scrollback once lines scroll away."""
+        service = TmuxService()
+
+        mock_run.side_effect = self._run("2000 2000 5 80\n", ['{"a":1}'])
+        service.capture_json_events(1, since_last=True)
+
+        assert mock_run.call_args[0][0] == ["capture-pane", "-t", "claude-task-1", "-p", "-S", "-"]
+
+
+class TestTmuxServiceJsonStreamFile:
+    """Tests for JSON events read from the piped pane output file."""
+
+    @patch("services.tmux.get_json_stream_file")
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    def test_json_mode_pipes_pane_before_launch(self, mock_run, mock_exists, mock_file, tmp_path):
+        """Test that the pane is piped to the stream file before Claude starts."""
+        mock_file.return_value = tmp_path / "claude.jsonl"
+        mock_run.return_value = MagicMock(returncode=0)
+
+        TmuxService().start_claude_json_mode(42, initial_prompt="hi")
+
+        commands = [c[0][0][0] for c in mock_run.call_args_list]
+        assert commands.index("pipe-pane") < commands.index("send-keys")
+        assert call(
+            ["pipe-pane", "-t", "claude-task-42", f"cat >> {tmp_path / 'claude.jsonl'}"]
+        ) in mock_run.call_args_list
+
+    @patch("services.tmux.get_json_stream_file")
+    @patch("services.tmux.session_exists", return_value=True)
+    @patch("services.tmux._run_tmux")
+    def test_since_last_reads_appended_lines(self, mock_run, mock_exists, mock_file, tmp_path):
+        """Test incremental reads of complete lines, without terminal escapes."""
+        stream = tmp_path / "claude.jsonl"
+        mock_file.return_value = stream
+        stream.write_bytes(b'$ claude -p hi\r\n\x1b[?2004l{"a":1}\r\n{"b":')
+
+        service = TmuxService()
+        assert service.capture_json_events(42, since_last=True) == '$ claude -p hi\n{"a":1}\n'
+
+        with open(stream, "ab") as f:
+            f.write(b'2}\r\n')
+        assert service.capture_json_events(42, since_last=True) == '{"b":2}\n'
+        assert service.capture_json_events(42, since_last=True) == ""
+
+        # Full read returns the whole file; tmux isn't asked for the pane
+        assert service.capture_json_events(42).endswith('{"a":1}\n{"b":2}\n')
+        mock_run.assert_not_called()
+
+
 class TestTmuxServiceSendKeys:
     """Tests for TmuxService.send_keys."""
 
@@ -378,14 +767,11 @@ class TestTmuxServiceSendConfirmation:
 class TestTmuxServiceGetSessionInfo:
     """Tests for TmuxService.get_session_info."""
 
+    @patch("services.tmux._pane_has_claude", return_value=True)
     @patch("services.tmux.session_exists")
-    @patch("services.tmux._run_tmux")
-    def test_get_session_info_exists(self, mock_run, mock_exists):
+    def test_get_session_info_exists(self, mock_exists, mock_has_claude):
         """Test getting info for existing session."""
         mock_exists.return_value = True
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout="Hello\n>"
-        )
 
         service = TmuxService()
         info = service.get_session_info(42)
@@ -393,6 +779,22 @@ class TestTmuxServiceGetSessionInfo:
         assert info.session_id == "claude-task-42"
         assert info.task_id == 42
         assert info.exists is True
+        assert info.has_claude_process is True
+        mock_has_claude.assert_called_once_with("claude-task-42")
+
+    @patch("services.tmux._pane_has_claude", return_value=None)
+    @patch("services.tmux.session_exists")
+    @patch("services.tmux._run_tmux")
+    def test_get_session_info_falls_back_without_proc(self, mock_run, mock_exists, mock_has_claude):
+        """Test the pane text heuristic when /proc is unavailable."""
+        mock_exists.return_value = True
+        mock_run.return_value = MagicMock(
+            returncode=0, stdout="Hello\n>"
+        )
+
+        service = TmuxService()
+        info = service.get_session_info(42)
+
         assert info.has_claude_process is True  # '>' in output
 
     @patch("services.tmux.session_exists")
@@ -409,12 +811,135 @@ class TestTmuxServiceGetSessionInfo:
         assert info.has_claude_process is False
 
 
+class TestPaneHasClaude:
+    """Tests for _pane_has_claude's /proc walk."""
+
+    def _proc(self, root, pid, comm, children=()):
+        """Create a fake /proc/<pid> entry."""
+        (root / "self").mkdir(exist_ok=True)
+        task = root / str(pid) / "task" / str(pid)
+        task.mkdir(parents=True)
+        (root / str(pid) / "comm").write_text(f"{comm}\n")
+        (task / "children").write_text("".join(f"{child} " for child in children))
+
+    @patch("services.tmux._run_tmux")
+    def test_finds_claude_below_the_shell(self, mock_run, tmp_path):
+        """Test that claude started from the pane's shell is found."""
+        self._proc(tmp_path, 100, "bash", children=[200])
+        self._proc(tmp_path, 200, "claude")
+        mock_run.return_value = MagicMock(returncode=0, stdout="100\n")
+
+        with patch("services.tmux._PROC", tmp_path):
+            assert _pane_has_claude("claude-task-42") is True
+
+        mock_run.assert_called_once_with(
+            ["list-panes", "-t", "claude-task-42", "-F", "#{pane_pid}"], check=False
+        )
+
+    @patch("services.tmux._run_tmux")
+    def test_plain_shell_has_no_claude(self, mock_run, tmp_path):
+        """Test a pane running only a shell and a vanished child."""
+        self._proc(tmp_path, 100, "bash", children=[300])
+        mock_run.return_value = MagicMock(returncode=0, stdout="100\n")
+
+        with patch("services.tmux._PROC", tmp_path):
+            assert _pane_has_claude("claude-task-42") is False
+
+    def test_no_procfs(self, tmp_path):
+        """Test that None asks the caller to fall back."""
+        with patch("services.tmux._PROC", tmp_path):
+            assert _pane_has_claude("claude-task-42") is None
+
+
+class TestTmuxServiceCaptureOutputAsync:
+    """Tests for TmuxService.capture_output_async and _run_tmux_async."""
+
+    def _process(self, stdout, returncode=0):
+        """Build a fake asyncio subprocess."""
+        proc = MagicMock(returncode=returncode)
+        proc.communicate = AsyncMock(return_value=(stdout, b"" if stdout is not None else None))
+        return proc
+
+    @patch("services.tmux.asyncio.create_subprocess_exec")
+    async def test_capture_output_async(self, mock_exec):
+        """Test that has-session and capture-pane run as async subprocesses."""
+        mock_exec.side_effect = [self._process(None), self._process(b"Hello\n>")]
+
+        service = TmuxService()
+        output = await service.capture_output_async(42, lines=50)
+
+        assert output == "Hello\n>"
+        assert mock_exec.call_args_list[0].args == ("tmux", "has-session", "-t", "claude-task-42")
+        assert mock_exec.call_args_list[0].kwargs["stdout"] is subprocess.DEVNULL
+        assert mock_exec.call_args_list[1].args == (
+            "tmux", "capture-pane", "-t", "claude-task-42", "-p", "-S", "-50"
+        )
+
+    @patch("services.tmux.asyncio.create_subprocess_exec")
+    async def test_capture_output_async_no_session(self, mock_exec):
+        """Test that a missing session raises like the sync variant."""
+        mock_exec.return_value = self._process(None, returncode=1)
+
+        service = TmuxService()
+        with pytest.raises(SessionNotFoundError):
+            await service.capture_output_async(42)
+
+    @patch("services.tmux.asyncio.create_subprocess_exec")
+    async def test_run_tmux_async_check(self, mock_exec):
+        """Test that check=True raises on a non-zero exit."""
+        mock_exec.return_value = self._process(b"", returncode=1)
+
+        with pytest.raises(subprocess.CalledProcessError):
+            await _run_tmux_async(["capture-pane", "-t", "s", "-p"])
+
+
+class TestTmuxServiceExistsCache:
+    """Tests for TmuxService's session existence cache."""
+
+    @patch("services.tmux.session_exists")
+    @patch("services.tmux._run_tmux")
+    def test_recent_positive_check_is_reused(self, mock_run, mock_exists):
+        """Test that back-to-back calls check the session only once."""
+        mock_exists.return_value = True
+        mock_run.return_value = MagicMock(returncode=0, stdout="Hello\n>")
+
+        service = TmuxService()
+        service.get_session_info(42)
+
+        mock_exists.assert_called_once_with("claude-task-42")
+
+    @patch("services.tmux.session_exists")
+    def test_negative_check_is_not_cached(self, mock_exists):
+        """Test that a missing session is checked again on the next call."""
+        mock_exists.return_value = False
+
+        service = TmuxService()
+        assert service.session_exists(42) is False
+        assert service.session_exists(42) is False
+
+        assert mock_exists.call_count == 2
+
+    @patch("services.tmux.session_exists")
+    @patch("services.tmux._run_tmux")
+    def test_kill_invalidates_cache(self, mock_run, mock_exists):
+        """Test that killing a session drops its cached existence."""
+        mock_exists.return_value = True
+        mock_run.return_value = MagicMock(returncode=0)
+
+        service = TmuxService()
+        service.kill_task_session(42)
+        mock_exists.return_value = False
+
+        assert service.session_exists(42) is False
+
+
 class TestTmuxServiceListSessions:
     """Tests for TmuxService.list_task_sessions."""
 
     @patch("services.tmux._run_tmux")
-    def test_list_task_sessions(self, mock_run):
+    def test_list_task_sessions(self, mock_run, monkeypatch):
         """Test listing task sessions."""
+        monkeypatch.setattr("services.tmux._session_filter_supported", True)
         mock_run.return_value = MagicMock(
             returncode=0,
             stdout="claude-task-1\nclaude-task-42\nother-session\nclaude-feature\n",
@@ -424,6 +949,11 @@ class TestTmuxServiceListSessions:
         task_ids = service.list_task_sessions()
 
         assert task_ids == [1, 42]
+        mock_run.assert_called_once_with(
+            ["list-sessions", "-F", "#{session_name}",
+             "-f", "#{m:claude-task-*,#{session_name}}"],
+            check=False,
+        )
 
     @patch("services.tmux._run_tmux")
     def test_list_task_sessions_empty(self, mock_run):
@@ -435,6 +965,24 @@ class TestTmuxServiceListSessions:
 
         assert task_ids == []
 
+    @patch("services.tmux._run_tmux")
+    def test_list_task_sessions_without_filter_support(self, mock_run, monkeypatch):
+        """Test falling back to a plain listing on tmux < 3.2 (no list-sessions -f)."""
+        monkeypatch.setattr("services.tmux._session_filter_supported", True)
+        mock_run.side_effect = [
+            MagicMock(returncode=1, stdout=""),
+            MagicMock(returncode=0, stdout="claude-task-1\nother-session\n"),
+            MagicMock(returncode=0, stdout="claude-task-2\n"),
+        ]
+
+        service = TmuxService()
+        assert service.list_task_sessions() == [1]
+        assert service.list_task_sessions() == [2]
+
+        # -f is only tried once; later calls go straight to the plain listing
+        plain = call(["list-sessions", "-F", "#{session_name}"], check=False)
+        assert mock_run.call_args_list[1:] == [plain, plain]
+
     @patch("services.tmux._run_tmux")
     def test_list_task_sessions_filters_invalid(self, mock_run):
         """Test that invalid session names are filtered."""
@@ -449,6 +997,25 @@ class TestTmuxServiceListSessions:
         # Only valid integer task IDs
         assert task_ids == [1]
 
+    @patch("services.tmux._run_tmux")
+    def test_list_task_sessions_prefix_is_literal(self, mock_run):
+        """Test that regex characters in the session prefix match literally."""
+        from config import TmuxConfig, get_config, set_config
+
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout="a.b-task-7\naxb-task-8\na.b-task-9x\n",
+        )
+
+        original = get_config()
+        try:
+            set_config(replace(original, tmux=TmuxConfig(session_prefix="a.b")))
+            service = TmuxService()
+            assert service.list_task_sessions() == [7]
+        finally:
+            set_config(original)
+        assert set(service._exists_cache) == {"a.b-task-7"}
+
 
 class TestSessionInfo:
     """Tests for SessionInfo dataclass."""
@@ -575,3 +1142,137 @@ class TestTmuxServiceIntegration:
         # Cleanup
         for tid in task_ids:
             service.kill_task_session(tid)
+
+    def test_command_client_runs_chained_commands(self):
+        """Test a ";"-chained command line through a real control-mode client."""
+        client = TmuxCommandClient("test-claude-ctl")
+        try:
+            result = client.run(
+                ["display-message", "-p", "one", ";", "display-message", "-p", "two"]
+            )
+        finally:
+            client.close()
+
+        assert result.returncode == 0
+        assert result.stdout == "one\ntwo\n"
+
+
+class TestTmuxCommandClient:
+    """Tests for the persistent control-mode command client."""
+
+    def _client_with_output(self, output: str) -> TmuxCommandClient:
+        """Build a client whose tmux process replies with `output`."""
+        import io
+        client = TmuxCommandClient("claude-ctl")
+        client._proc = MagicMock()
+        client._proc.poll.return_value = None
+        client._proc.stdout = io.StringIO(output)
+        return client
+
+    def test_quote_control_arg(self):
+        """Test quoting arguments for tmux's command parser."""
+        assert _quote_control_arg('say "hi" to $USER\\') == '"say \\"hi\\" to \\$USER\\\\"'
+
+    def test_run_returns_block_output(self):
+        """Test that reply lines between the guards become stdout."""
+        client = self._client_with_output(
+            "%output %1 noise\n"
+            "%begin 1700000000 12 1\n"
+            "line one\n"
+            "%end 1700000000 11 1\n"  # Not our guard: pane text
+            "%end 1700000000 12 1\n"
+        )
+
+        result = client.run(["capture-pane", "-p", "-t", "claude-task-1"])
+
+        client._proc.stdin.write.assert_called_once_with('"capture-pane" "-p" "-t" "claude-task-1"\n')
+        assert result.returncode == 0
+        assert result.stdout == "line one\n%end 1700000000 11 1\n"
+
+    def test_run_maps_error_block_to_failure(self):
+        """Test that an %error reply becomes a non-zero return code."""
+        client = self._client_with_output(
+            "%begin 1700000000 3 1\ncan't find session: nope\n%error 1700000000 3 1\n"
+        )
+
+        result = client.run(["has-session", "-t", "nope"])
+
+        assert result.returncode == 1
+        assert result.stderr == "can't find session: nope\n"
+
+    def test_run_reads_a_block_per_chained_command(self):
+        """Test that ";" separators go out bare and every command's block is read."""
+        client = self._client_with_output(
+            "%begin 1700000000 20 1\na\n%end 1700000000 20 1\n"
+            "%begin 1700000000 21 1\nb\n%end 1700000000 21 1\n"
+        )
+
+        result = client.run(["display-message", "-p", "a", ";", "display-message", "-p", "b"])
+
+        client._proc.stdin.write.assert_called_once_with(
+            '"display-message" "-p" "a" ; "display-message" "-p" "b"\n'
+        )
+        assert result.returncode == 0
+        assert result.stdout == "a\nb\n"
+
+    def test_run_stops_chain_at_first_error(self):
+        """Test that a failing chained command fails the run (tmux skips the rest)."""
+        client = self._client_with_output(
+            "%begin 1700000000 30 1\ncan't find pane: nope\n%error 1700000000 30 1\n"
+        )
+
+        result = client.run(["capture-pane", "-t", "nope", "-p", ";", "display-message", "-p", "x"])
+
+        assert result.returncode == 1
+        assert result.stderr == "can't find pane: nope\n"
+
+    def test_run_falls_back_when_client_exits(self):
+        """Test that a dead client makes run() return None for a subprocess fallback."""
+        client = self._client_with_output("")
+
+        assert client.run(["list-sessions"]) is None
+        assert client._proc is None
+
+    def test_run_skips_multiline_args(self):
+        """Test that arguments with newlines aren't sent over the client."""
+        client = self._client_with_output("")
+
+        assert client.run(["send-keys", "-t", "s", "a\nb"]) is None
+
+    @patch("services.tmux.subprocess.run")
+    def test_run_tmux_uses_client_except_for_new_session(self, mock_subprocess):
+        """Test _run_tmux routing through the enabled client."""
+        client = MagicMock()
+        client.run.return_value = MagicMock(returncode=0)
+        with patch("services.tmux._command_client", client):
+            _run_tmux(["has-session", "-t", "s"])
+            _run_tmux(["new-session", "-d", "-s", "s"])
+
+        client.run.assert_called_once_with(["has-session", "-t", "s"])
+        mock_subprocess.assert_called_once()
+
+    @patch("services.tmux.log_subprocess_call")
+    @patch("services.tmux.subprocess.run")
+    def test_run_tmux_logs_only_failures_above_debug(self, mock_subprocess, mock_log):
+        """Test that successful calls skip logging when DEBUG is off."""
+        with patch("services.tmux.logger.isEnabledFor", return_value=False):
+            mock_subprocess.return_value = MagicMock(returncode=0)
+            _run_tmux(["has-session", "-t", "s"], check=False)
+            mock_log.assert_not_called()
+
+            mock_subprocess.return_value = MagicMock(returncode=1)
+            _run_tmux(["has-session", "-t", "s"], check=False)
+            mock_log.assert_called_once()
+
+    @patch("services.tmux.subprocess.run")
+    def test_run_tmux_discards_unused_output(self, mock_subprocess):
+        """Test that only commands whose output is read get pipes."""
+        mock_subprocess.return_value = MagicMock(returncode=0)
+
+        _run_tmux(["send-keys", "-t", "s", "x"])
+        _run_tmux(["capture-pane", "-t", "s", "-p"])
+
+        send_keys, capture = mock_subprocess.call_args_list
+        assert send_keys.kwargs["stdout"] is subprocess.DEVNULL
+        assert "capture_output" not in send_keys.kwargs
+        assert capture.kwargs["capture_output"] is True
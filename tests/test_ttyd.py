@@ -1,7 +1,28 @@
 """Tests for ttyd service."""
 
+import asyncio
+import os
+import select
+import signal
+import subprocess
+import threading
+import time
+
+from unittest.mock import patch
+
 import pytest
-from services.ttyd import TtydService, TtydAlreadyRunningError, TtydNotRunningError
+from services.ttyd import (
+    TtydService,
+    TtydError,
+    TtydAlreadyRunningError,
+    TtydNotRunningError,
+    _lock,
+    _running_processes,
+    _unreaped,
+    _open_pidfd,
+    _is_process_running,
+    _spawn,
+)
 
 
 class TestTtydService:
@@ -43,6 +64,37 @@ class TestTtydService:
         service = TtydService()
         assert service.stop_if_running(999) is False
 
+    @patch("services.ttyd._open_pidfd", return_value=None)
+    @patch("services.ttyd._spawn", return_value=4242)
+    def test_start_runs_tmux_attach_directly(self, mock_spawn, mock_pidfd):
+        """Test that ttyd execs tmux attach without a shell hop."""
+        service = TtydService(base_port=7681)
+        info = service.start(1, "claude-task-1")
+        try:
+            assert info.pid == 4242
+            mock_spawn.assert_called_once_with(
+                ["ttyd", "-W", "-p", "7682", "tmux", "attach", "-t", "claude-task-1"]
+            )
+        finally:
+            _running_processes.pop(1)
+
+    @patch("services.ttyd._spawn")
+    def test_start_rejects_port_out_of_range(self, mock_spawn):
+        """Test that a port beyond 65535 is refused before spawning ttyd."""
+        service = TtydService(base_port=65000)
+        with pytest.raises(TtydError, match="outside"):
+            service.start(1000, "claude-task-1000")
+        mock_spawn.assert_not_called()
+        assert 1000 not in _running_processes
+
+    def test_get_port_of_running_instance(self):
+        """Test that a running instance reports the port it was started on."""
+        _running_processes["port-task"] = (4242, 9000, None, "http://localhost:9000")
+        try:
+            assert TtydService().get_port("port-task") == 9000
+        finally:
+            _running_processes.pop("port-task")
+
     def test_stop_raises_when_not_running(self):
         """Test stop raises TtydNotRunningError."""
         service = TtydService()
@@ -50,6 +102,213 @@ class TestTtydService:
             service.stop(999)
 
 
+class TestTtydThreadSafety:
+    """Test TtydService use from several threads at once."""
+
+    @patch("services.ttyd._is_process_running", return_value=True)
+    @patch("services.ttyd._open_pidfd", return_value=None)
+    @patch("services.ttyd._signal_group")
+    @patch("services.ttyd.os.kill")
+    @patch("services.ttyd._spawn", return_value=4242)
+    def test_concurrent_start_list_stop(self, mock_spawn, mock_kill, mock_signal, mock_pidfd, mock_running):
+        """Test that concurrent starts, listings and stops keep tracking consistent."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        service = TtydService()
+
+        def cycle(n):
+            task_id = f"thread-{n}"
+            service.start(task_id, f"claude-task-{n}")
+            service.list_running()
+            service.stop(task_id)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(cycle, range(200)))
+
+        assert not any(str(key).startswith("thread-") for key in _running_processes)
+
+
+class TestTtydLiveness:
+    """Test liveness tracking of ttyd processes (with a stand-in child)."""
+
+    @pytest.fixture
+    def child(self):
+        """A short-lived child process standing in for ttyd."""
+        process = subprocess.Popen(["sleep", "30"])
+        yield process
+        process.kill()
+        process.wait()
+
+    def test_exited_zombie_is_not_running(self, child):
+        """Test that an exited but unreaped child counts as stopped."""
+        pidfd = _open_pidfd(child.pid)
+        if pidfd is None:
+            pytest.skip("pidfd_open not available")
+        try:
+            assert _is_process_running(child.pid, pidfd) is True
+            child.kill()
+            select.select([pidfd], [], [], 5)
+            assert _is_process_running(child.pid, pidfd) is False
+        finally:
+            os.close(pidfd)
+
+    def test_list_running_drops_exited_processes(self, child):
+        """Test that list_running reports live entries and forgets dead ones."""
+        other = subprocess.Popen(["true"])
+        other.wait()
+        _running_processes["live"] = (child.pid, 7001, _open_pidfd(child.pid), "http://localhost:7001")
+        _running_processes["dead"] = (other.pid, 7002, _open_pidfd(other.pid), "http://localhost:7002")
+        try:
+            running = TtydService().list_running()
+            assert [info.task_id for info in running] == ["live"]
+            assert running[0].url == "http://localhost:7001"
+            assert "dead" not in _running_processes
+        finally:
+            TtydService().stop_if_running("live")
+
+        assert "live" not in _running_processes
+
+    async def test_start_async_reaps_on_exit(self, child):
+        """Test that the event loop forgets (and reaps) an exited ttyd."""
+        pidfd = _open_pidfd(child.pid)
+        if pidfd is None:
+            pytest.skip("pidfd_open not available")
+        os.close(pidfd)
+
+        service = TtydService()
+        with patch("services.ttyd._spawn", return_value=child.pid):
+            await service.start_async("watched", "claude-task-1")
+        assert service.is_running("watched") is True
+
+        child.kill()
+        for _ in range(100):
+            if "watched" not in _running_processes:
+                break
+            await asyncio.sleep(0.01)
+
+        assert service.is_running("watched") is False
+        # Reaped by the callback, so no zombie is left behind
+        with pytest.raises(ChildProcessError):
+            os.waitpid(child.pid, os.WNOHANG)
+
+
+class TestCleanupAll:
+    """Test stopping every ttyd instance at once."""
+
+    def test_cleanup_all_terminates_and_reaps(self):
+        """Test that all instances get SIGTERM and none are left behind."""
+        pids = [_spawn(["sleep", "30"]) for _ in range(3)]
+        for i, pid in enumerate(pids):
+            _running_processes[f"cleanup-{i}"] = (pid, 7100 + i, _open_pidfd(pid), f"http://localhost:{7100 + i}")
+
+        assert TtydService().cleanup_all() == 3
+
+        assert not any(key.startswith("cleanup-") for key in _running_processes)
+        for pid in pids:
+            # Exited and reaped
+            with pytest.raises(ChildProcessError):
+                os.waitpid(pid, os.WNOHANG)
+
+    def test_cleanup_all_kills_processes_ignoring_sigterm(self):
+        """Test escalation to SIGKILL after STOP_TIMEOUT."""
+        pid = _spawn(["sh", "-c", "trap '' TERM; sleep 30"])
+        pidfd = _open_pidfd(pid)
+        if pidfd is None:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            pytest.skip("pidfd_open not available")
+        _running_processes["stubborn"] = (pid, 7200, pidfd, "http://localhost:7200")
+
+        service = TtydService()
+        service.STOP_TIMEOUT = 0.2
+        assert service.cleanup_all() == 1
+
+        try:
+            os.waitpid(pid, 0)  # Unless cleanup_all already reaped it
+        except ChildProcessError:
+            pass
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+
+class TestStop:
+    """Test stopping a single ttyd instance."""
+
+    def test_stop_reaps_process(self):
+        """Test that stop waits for the process to exit and reaps it."""
+        pid = _spawn(["sleep", "30"])
+        _running_processes["stop-reap"] = (pid, 7300, _open_pidfd(pid), "http://localhost:7300")
+
+        TtydService().stop("stop-reap")
+
+        assert "stop-reap" not in _running_processes
+        if hasattr(os, "pidfd_open"):
+            # Reaped through the pidfd, so not queued for waitpid (the pid may be reused)
+            assert pid not in _unreaped
+        else:
+            os.waitpid(pid, 0)
+        with pytest.raises(ChildProcessError):
+            os.waitpid(pid, os.WNOHANG)
+
+    def test_stop_kills_process_ignoring_sigterm(self):
+        """Test escalation to SIGKILL after STOP_TIMEOUT."""
+        pid = _spawn(["sh", "-c", "trap '' TERM; sleep 30"])
+        pidfd = _open_pidfd(pid)
+        if pidfd is None:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            pytest.skip("pidfd_open not available")
+        _running_processes["stop-stubborn"] = (pid, 7301, pidfd, "http://localhost:7301")
+
+        service = TtydService()
+        service.STOP_TIMEOUT = 0.2
+        service.stop("stop-stubborn")
+
+        # Killed and reaped
+        with pytest.raises(ChildProcessError):
+            os.waitpid(pid, os.WNOHANG)
+
+    def test_stop_releases_lock_while_waiting(self):
+        """Test that other callers aren't blocked while stop waits for ttyd to exit."""
+        pid = _spawn(["sh", "-c", "trap '' TERM; sleep 30"])
+        pidfd = _open_pidfd(pid)
+        if pidfd is None:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            pytest.skip("pidfd_open not available")
+        _running_processes["stop-unlocked"] = (pid, 7302, pidfd, "http://localhost:7302")
+
+        service = TtydService()
+        service.STOP_TIMEOUT = 0.5
+        stopper = threading.Thread(target=service.stop, args=("stop-unlocked",))
+        stopper.start()
+        time.sleep(0.1)
+        try:
+            assert _lock.acquire(timeout=0.2)
+            _lock.release()
+        finally:
+            stopper.join()
+        assert "stop-unlocked" not in _running_processes
+
+
+class TestSpawn:
+    """Test the detached process launcher used for ttyd."""
+
+    def test_spawn_detaches_into_new_session(self):
+        """Test that the child leads its own session."""
+        pid = _spawn(["sleep", "30"])
+        try:
+            assert os.getsid(pid) == pid
+        finally:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+    def test_spawn_missing_executable(self):
+        """Test that a missing binary surfaces as FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            _spawn(["chorus-no-such-binary"])
+
+
 @pytest.mark.integration
 class TestTtydServiceIntegration:
     """Integration tests that require ttyd to be installed."""